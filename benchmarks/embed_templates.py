@@ -0,0 +1,89 @@
+"""
+Response time of the static-embed commands with and without templates
+
+Calls the /help, /info, /version and /list-timezones handlers with a stub
+interaction whose send_message serializes the embed the way discord.py
+does (to_dict + JSON). "rebuilt" builds the embed from scratch for every
+call (previous behaviour); "template" goes through utils/embed_templates.
+
+Usage: python benchmarks/embed_templates.py [calls]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.info import BotInfo
+from modules.time_management.timer import build_timezone_overview
+from utils.embed_templates import embed_templates
+
+class StubResponse:
+    async def send_message(self, embed=None, ephemeral=False, **kwargs):
+        json.dumps({'type': 4, 'data': {'embeds': [embed.to_dict()], 'flags': 64 if ephemeral else 0}})
+
+class StubBot:
+    user = None
+    cluster = None
+
+    async def global_stats(self):
+        return {'guilds': 1200, 'users': 345678, 'shards': 4, 'clusters': 2}
+
+async def time_calls(call, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return (time.perf_counter() - started) / calls * 1e6
+
+async def run(calls: int):
+    bot = StubBot()
+    info = BotInfo(bot)
+    interaction = SimpleNamespace(response=StubResponse())
+
+    async def send(embed):
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def rebuilt_info():
+        # Same dynamic work as the handler: stats lookup plus the statistics field
+        stats = await bot.global_stats()
+        embed = info.build_info_embed()
+        embed.insert_field_at(0, name="📊 Statistics", value=f"**Servers:** {stats['guilds']}\n**Users:** {stats['users']:,}")
+        await send(embed)
+
+    cases = {
+        'help': (
+            lambda: send(info.build_help_embed()),
+            lambda: info.help_command.callback(info, interaction)
+        ),
+        'version': (
+            lambda: send(info.build_version_embed()),
+            lambda: info.version_info.callback(info, interaction)
+        ),
+        'info': (
+            rebuilt_info,
+            lambda: info.show_info.callback(info, interaction)
+        ),
+        'list-timezones': (
+            lambda: send(build_timezone_overview()),
+            # The handler also builds the browser view; time only the embed part
+            lambda: send(embed_templates.get("timezones:overview", build_timezone_overview))
+        )
+    }
+
+    print(f"calls: {calls}  (microseconds per response)")
+    print(f"{'command':24} {'rebuilt':>9} {'template':>9} {'speedup':>8}")
+    for name, (rebuilt, templated) in cases.items():
+        embed_templates.clear()
+        before = await time_calls(rebuilt, calls)
+        after = await time_calls(templated, calls)
+        print(f"{name:24} {before:>9.1f} {after:>9.1f} {before / after:>7.1f}x")
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    asyncio.run(run(calls))
+
+if __name__ == "__main__":
+    main()
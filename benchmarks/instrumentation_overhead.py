@@ -0,0 +1,56 @@
+"""
+Per-call overhead of the metrics instrumentation
+
+Times a no-op coroutine called directly, through the command wrapper
+(Metrics.timed) and through the event path (partial(Metrics.call, ...)),
+and reports the added cost per call in microseconds.
+
+Usage: python benchmarks/instrumentation_overhead.py [calls]
+"""
+import asyncio
+import os
+import sys
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics import Metrics
+
+async def noop(*args, **kwargs):
+    return None
+
+async def time_calls(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await func(1, key=2)
+    return time.perf_counter() - started
+
+async def run(calls: int):
+    metrics = Metrics()
+    timed = metrics.timed('command', 'noop', noop)
+
+    async def event_path(*args, **kwargs):
+        # What AlphaBot._run_event does for every dispatch
+        return await partial(metrics.call, 'event', 'on_noop', noop)(*args, **kwargs)
+
+    async def direct_event(*args, **kwargs):
+        return await noop(*args, **kwargs)
+
+    baseline = min([await time_calls(noop, calls) for _ in range(5)])
+    wrapped = min([await time_calls(timed, calls) for _ in range(5)])
+    event_baseline = min([await time_calls(direct_event, calls) for _ in range(5)])
+    event = min([await time_calls(event_path, calls) for _ in range(5)])
+
+    per_call = lambda seconds: seconds / calls * 1e6
+    print(f"calls: {calls}")
+    print(f"direct:          {per_call(baseline):.3f} us/call")
+    print(f"command wrapper: {per_call(wrapped):.3f} us/call (+{per_call(wrapped - baseline):.3f} us)")
+    print(f"event wrapper:   {per_call(event):.3f} us/call (+{per_call(event - event_baseline):.3f} us)")
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    asyncio.run(run(calls))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Event-loop lag under heavy logging
+
+Compares the original synchronous FileHandler setup against the queued
+pipeline from utils/logging_setup.py. A ticker coroutine measures how late
+each 1ms sleep wakes up while a burst of log calls runs on the loop.
+Disk latency (slow panel storage, fsync stalls) is simulated by delaying
+every handler flush.
+
+Usage: python benchmarks/logging_loop_lag.py [records] [disk_latency_ms]
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging_setup import LOG_FORMAT, setup_logging
+
+async def measure(records: int) -> dict:
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def burst():
+        logger = logging.getLogger('bench')
+        for i in range(records):
+            logger.info("burst record %d with some payload %s", i, "x" * 64)
+            if i % 100 == 0:
+                await asyncio.sleep(0)
+        stop.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(ticker(), burst())
+    elapsed = time.perf_counter() - started
+    lags.sort()
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'lag_p50_ms': round(statistics.median(lags) * 1000, 3),
+        'lag_p99_ms': round(lags[int(len(lags) * 0.99) - 1] * 1000, 3),
+        'lag_max_ms': round(lags[-1] * 1000, 3)
+    }
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+def simulate_disk_latency(latency: float):
+    """Delay every StreamHandler flush (FileHandler and subclasses included)"""
+    original_flush = logging.StreamHandler.flush
+
+    def slow_flush(self):
+        original_flush(self)
+        if isinstance(self, logging.FileHandler):
+            time.sleep(latency)
+
+    logging.StreamHandler.flush = slow_flush
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    disk_latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    workdir = tempfile.mkdtemp()
+    simulate_disk_latency(disk_latency_ms / 1000)
+
+    # Baseline: synchronous file handler (stream output discarded to keep the terminal quiet)
+    reset_root()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[logging.FileHandler(os.path.join(workdir, 'sync.log'))]
+    )
+    sync_result = asyncio.run(measure(records))
+
+    # Queued pipeline
+    reset_root()
+    listener = setup_logging(log_file=os.path.join(workdir, 'queued.log'), max_bytes=1024 * 1024, console=False)
+    queued_result = asyncio.run(measure(records))
+    listener.stop()
+
+    print(f"records: {records}, simulated disk latency: {disk_latency_ms}ms per write")
+    print(f"sync FileHandler : {sync_result}")
+    print(f"QueueHandler     : {queued_result}")
+
+if __name__ == "__main__":
+    main()
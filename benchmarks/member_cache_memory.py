@@ -0,0 +1,118 @@
+"""
+Memory and startup cost of member caching on a simulated large guild
+
+Builds a discord.Guild from a synthetic GUILD_CREATE payload the way the
+gateway delivers it under each intents profile:
+
+  all      - every member plus a presence (with an activity) for each
+  minimal  - only the bot's own member; presences are not sent
+  lazy     - minimal, followed by one on-demand chunk of every member
+
+Usage: python benchmarks/member_cache_memory.py [members]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+from bot import COGS, build_intents, import_cogs
+
+BOT_ID = 1
+
+def member_payload(user_id: int) -> dict:
+    return {
+        'user': {
+            'id': str(user_id),
+            'username': f'user{user_id}',
+            'discriminator': '0',
+            'global_name': f'User {user_id}',
+            'avatar': None
+        },
+        'roles': [],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0
+    }
+
+def presence_payload(user_id: int) -> dict:
+    return {
+        'user': {'id': str(user_id)},
+        'status': 'online',
+        'client_status': {'desktop': 'online'},
+        'activities': [{'name': 'Some Game', 'type': 0, 'created_at': 0}]
+    }
+
+def guild_payload(member_count: int, members: list, presences: list) -> dict:
+    return {
+        'id': '1000',
+        'name': 'Simulated Guild',
+        'owner_id': str(BOT_ID),
+        'member_count': member_count,
+        'roles': [{'id': '1000', 'name': '@everyone', 'permissions': '0', 'position': 0, 'color': 0,
+                   'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}],
+        'channels': [],
+        'emojis': [],
+        'stickers': [],
+        'features': [],
+        'members': members,
+        'presences': presences
+    }
+
+def make_state(profile: str):
+    client = discord.Client(intents=build_intents(import_cogs(list(COGS)), profile))
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=member_payload(BOT_ID)['user'])
+    return state
+
+def run(profile: str, count: int) -> dict:
+    state = make_state('all' if profile == 'all' else 'minimal')
+    user_ids = range(BOT_ID, BOT_ID + count)
+
+    if profile == 'all':
+        members = [member_payload(i) for i in user_ids]
+        presences = [presence_payload(i) for i in user_ids]
+    else:
+        members = [member_payload(BOT_ID)]
+        presences = []
+    payload = guild_payload(count, members, presences)
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    guild = discord.Guild(data=payload, state=state)
+    startup = time.perf_counter() - started
+    startup_memory = tracemalloc.get_traced_memory()[0]
+
+    chunk_time = 0.0
+    if profile == 'lazy':
+        chunk = [member_payload(i) for i in user_ids]
+        started = time.perf_counter()
+        for data in chunk:
+            guild._add_member(discord.Member(data=data, guild=guild, state=state))
+        chunk_time = time.perf_counter() - started
+        del chunk
+    final_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return {
+        'cached_members': len(guild.members),
+        'startup_s': round(startup, 3),
+        'startup_mb': round(startup_memory / 1024 / 1024, 1),
+        'on_demand_chunk_s': round(chunk_time, 3),
+        'after_chunk_mb': round(final_memory / 1024 / 1024, 1)
+    }
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"members: {count}")
+    for profile in ('all', 'minimal', 'lazy'):
+        print(f"{profile:8}: {run(profile, count)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Offline benchmark suite - AlphaBot against a local fake Discord
+
+Boots AlphaBot with all of its cogs against devtools/fake_discord.py (fake
+gateway + REST API with rate-limit headers) and replays synthetic workloads:
+
+  delete_storm  - messages created then deleted; latency until the deletion
+                  is logged to the server's message log channel
+  join_raid     - members joining; latency until the join is logged
+  clockin       - many users running /clockin; latency until the response
+  mass_dm       - /mass-dm over a role, confirmed with the button; latency
+                  until the final status update
+
+Reports throughput, p50/p99 latency and process RSS per workload and saves
+everything as JSON so runs can be compared.
+
+Usage:
+  python benchmarks/offline_suite.py [--scale N] [--only delete_storm,clockin]
+                                     [--output results.json] [--compare previous.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devtools.fake_discord import BOT_USER_ID, FakeDiscord
+
+WORKLOADS = ('delete_storm', 'join_raid', 'clockin', 'mass_dm')
+
+def rss_mb() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == 'darwin' else 1)
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def summarize(name: str, count: int, elapsed: float, latencies, rss_before: float) -> dict:
+    return {
+        'workload': name,
+        'operations': count,
+        'completed': len(latencies),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        'rss_mb': round(rss_mb(), 1),
+        'rss_delta_mb': round(rss_mb() - rss_before, 1)
+    }
+
+async def wait_for(predicate, timeout: float, interval: float = 0.01) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(interval)
+    return predicate()
+
+class Suite:
+    def __init__(self, server: FakeDiscord, bot, timeout: float):
+        self.server = server
+        self.bot = bot
+        self.timeout = timeout
+        self.guilds = list(server.guilds.values())
+
+    def members(self, guild):
+        return [user_id for user_id in guild.members if user_id != BOT_USER_ID]
+
+    async def delete_storm(self, count: int) -> dict:
+        messages = []
+        for i in range(count):
+            guild = self.guilds[i % len(self.guilds)]
+            author = self.members(guild)[i % len(self.members(guild))]
+            channel_id = int(guild.channels[0]['id'])
+            messages.append((guild, await self.server.send_message_create(guild, channel_id, author, f"message {i}")))
+        await asyncio.sleep(0.5)  # let MESSAGE_CREATE land in the message cache
+
+        rss_before = rss_mb()
+        latencies = self.server.delivery_latencies
+        latencies.clear()
+        started = time.perf_counter()
+        for guild, message in messages:
+            await self.server.send_message_delete(guild, message)
+        await wait_for(lambda: len(latencies) >= count, self.timeout)
+        return summarize('delete_storm', count, time.perf_counter() - started, list(latencies), rss_before)
+
+    async def join_raid(self, count: int) -> dict:
+        rss_before = rss_mb()
+        latencies = self.server.delivery_latencies
+        latencies.clear()
+        started = time.perf_counter()
+        for i in range(count):
+            guild = self.guilds[i % len(self.guilds)]
+            await self.server.send_member_join(guild, f"raider-{i}")
+        await wait_for(lambda: len(latencies) >= count, self.timeout)
+        return summarize('join_raid', count, time.perf_counter() - started, list(latencies), rss_before)
+
+    async def clockin(self, count: int) -> dict:
+        rss_before = rss_mb()
+        interaction_ids = []
+        started = time.perf_counter()
+        for i in range(count):
+            guild = self.guilds[i % len(self.guilds)]
+            members = self.members(guild)
+            user_id = members[(i // len(self.guilds)) % len(members)]
+            interaction_ids.append(await self.server.invoke_command(guild, int(guild.channels[0]['id']), user_id, 'clockin'))
+        records = [self.server.interactions[i] for i in interaction_ids]
+        await wait_for(lambda: all(record['responded'] for record in records), self.timeout)
+        latencies = [record['responded'] - record['dispatched'] for record in records if record['responded']]
+        return summarize('clockin', count, time.perf_counter() - started, latencies, rss_before)
+
+    async def mass_dm(self, role_size: int) -> dict:
+        guild = self.guilds[0]
+        admin_id = self.members(guild)[0]
+        role = next(role for role in guild.roles if role['name'] == 'role-1')
+
+        rss_before = rss_mb()
+        sent_before = len(self.server.sent_messages)
+        started = time.perf_counter()
+        interaction_id = await self.server.invoke_command(
+            guild, int(guild.channels[0]['id']), admin_id, 'mass-dm',
+            options=[
+                {'name': 'role', 'type': 8, 'value': role['id']},
+                {'name': 'message', 'type': 3, 'value': 'Benchmark announcement'}
+            ],
+            resolved={'roles': {role['id']: role}}
+        )
+        record = self.server.interactions[interaction_id]
+        await wait_for(lambda: record['message'] is not None, self.timeout)
+        if record['message'] is None:
+            return summarize('mass_dm', role_size, time.perf_counter() - started, [], rss_before)
+        await self.server.click_button(interaction_id, 'Confirm')
+
+        def finished():
+            sent = len(self.server.sent_messages) - sent_before
+            return sent >= role_size and record['last_response'] > self.server.last_message_at
+        await wait_for(finished, self.timeout + role_size * 1.5)
+        elapsed = time.perf_counter() - started
+        latencies = [record['last_response'] - record['dispatched']] if finished() else []
+        result = summarize('mass_dm', role_size, elapsed, latencies, rss_before)
+        result['dms_sent'] = len(self.server.sent_messages) - sent_before
+        result['throughput_per_s'] = round(result['dms_sent'] / elapsed, 1) if elapsed else 0.0
+        return result
+
+async def run_suite(args) -> dict:
+    server = FakeDiscord(
+        guilds=args.guilds,
+        members_per_guild=args.members,
+        shards=args.shards,
+        rate_limit=args.rate_limit
+    )
+    # mass-dm targets: give role-1 (and the bot-admin role to the invoking admin) to a few members
+    first_guild = next(iter(server.guilds.values()))
+    role_1 = next(role for role in first_guild.roles if role['name'] == 'role-1')
+    admin_role = next(role for role in first_guild.roles if role['name'] == 'bot-admin')
+    targets = [user_id for user_id in first_guild.members if user_id != BOT_USER_ID]
+    targets[0] and first_guild.members[targets[0]]['roles'].append(admin_role['id'])
+    for user_id in targets[:args.mass_dm_members]:
+        first_guild.members[user_id]['roles'].append(role_1['id'])
+
+    await server.start()
+    server.install()
+
+    # Import after the working directory points at the scratch data/ directory
+    from bot import AlphaBot
+    bot = AlphaBot(shard_count=args.shards)
+    rss_start = rss_mb()
+    started = time.perf_counter()
+    await bot.login('fake-token')
+    runner = asyncio.create_task(bot.connect(reconnect=False))
+    await asyncio.wait_for(bot.wait_until_ready(), timeout=120)
+    startup = time.perf_counter() - started
+
+    logs = bot.get_cog('LogsModule')
+    for guild in bot.guilds:
+        await logs.provision_guild(guild)
+    await asyncio.sleep(0.5)  # CHANNEL_CREATE events for the new log channels
+
+    suite = Suite(server, bot, args.timeout)
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'startup': {'ready_s': round(startup, 3), 'rss_mb': round(rss_mb(), 1),
+                    'rss_delta_mb': round(rss_mb() - rss_start, 1), 'identifies': server.identify_count},
+        'workloads': {}
+    }
+    sizes = {
+        'delete_storm': args.scale,
+        'join_raid': args.scale,
+        'clockin': args.scale,
+        'mass_dm': args.mass_dm_members
+    }
+    for name in args.only:
+        print(f"running {name} ({sizes[name]})...", flush=True)
+        results['workloads'][name] = await getattr(suite, name)(sizes[name])
+    results['rest'] = {'requests': sum(server.request_counts.values()), 'rate_limited': server.rate_limited_count}
+
+    await bot.close()
+    runner.cancel()
+    await server.stop()
+    return results
+
+def print_results(results: dict, previous: dict = None):
+    print(f"\nstartup: {results['startup']}")
+    header = f"{'workload':14} {'ops':>6} {'thru/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'rss MB':>8}"
+    print(header)
+    for name, row in results['workloads'].items():
+        line = (f"{name:14} {row['completed']:>6} {row['throughput_per_s']:>9} "
+                f"{row['p50_ms']:>9} {row['p99_ms']:>9} {row['rss_mb']:>8}")
+        old = (previous or {}).get('workloads', {}).get(name)
+        if old and old.get('p99_ms'):
+            change = (row['p99_ms'] - old['p99_ms']) / old['p99_ms'] * 100
+            line += f"   p99 {change:+.0f}% vs previous"
+        print(line)
+    print(f"rest: {results['rest']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline AlphaBot benchmark suite")
+    parser.add_argument('--scale', type=int, default=500, help="operations per workload")
+    parser.add_argument('--guilds', type=int, default=5)
+    parser.add_argument('--members', type=int, default=200, help="members per guild")
+    parser.add_argument('--shards', type=int, default=2)
+    parser.add_argument('--rate-limit', type=int, default=50, help="fake REST requests per second per route bucket")
+    parser.add_argument('--mass-dm-members', type=int, default=5,
+                        help="role size for the mass DM workload (the command paces itself at 1 DM/s)")
+    parser.add_argument('--only', type=lambda value: value.split(','), default=list(WORKLOADS))
+    parser.add_argument('--timeout', type=float, default=60, help="seconds to wait for a workload to drain")
+    parser.add_argument('--output', help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="previous results JSON to compare p99 latency against")
+    args = parser.parse_args()
+    unknown = set(args.only) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+
+    output = os.path.abspath(args.output or os.path.join(
+        ROOT, 'benchmarks', 'results', f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"))
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.setdefault('LOG_TO_FILE', 'false')
+    # Bot state (data/*.json, SQLite stores) goes to a scratch directory
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        results = asyncio.run(run_suite(args))
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print_results(results, previous)
+    print(f"saved {output}")
+
+if __name__ == "__main__":
+    main()
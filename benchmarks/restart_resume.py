@@ -0,0 +1,124 @@
+"""
+Restart cost: IDENTIFY vs RESUME of the saved gateway sessions
+
+Boots AlphaBot against devtools/fake_discord.py, sets up the log channels,
+shuts the bot down gracefully, has members join while it is down, then boots
+it again and reports for the second boot:
+
+  ready_s        - login to on_ready
+  identifies     - IDENTIFYs sent (each one uses the daily session budget, and
+                   every shard after the first waits 5 s before identifying)
+  resumes        - sessions resumed
+  guilds         - guilds in the cache once ready
+  missed_logged  - joins that happened while the bot was down and were still
+                   logged to the member log channel afterwards
+
+Run once with GATEWAY_RESUME off (previous behaviour) and once with it on.
+
+Usage: python benchmarks/restart_resume.py [--guilds 20] [--members 200] [--shards 2] [--missed 10]
+                                           [--chunk-at-startup]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devtools.fake_discord import FakeDiscord
+
+async def wait_for(predicate, timeout: float, interval: float = 0.01) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(interval)
+    return predicate()
+
+async def boot(shards: int):
+    from bot import AlphaBot
+    bot = AlphaBot(shard_count=shards)
+    started = time.perf_counter()
+    await bot.login('fake-token')
+    runner = asyncio.create_task(bot.connect(reconnect=False))
+    await asyncio.wait_for(bot.wait_until_ready(), timeout=120)
+    return bot, runner, time.perf_counter() - started
+
+async def shutdown(bot, runner):
+    await bot.close()
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+async def scenario(args, resume: bool) -> dict:
+    from config.config import Config
+    Config.GATEWAY_RESUME = resume
+    server = FakeDiscord(guilds=args.guilds, members_per_guild=args.members, shards=args.shards, rate_limit=1000)
+    await server.start()
+    server.install()
+
+    bot, runner, cold_ready = await boot(args.shards)
+    logs = bot.get_cog('LogsModule')
+    for guild in bot.guilds:
+        await logs.provision_guild(guild)
+    await logs.save_log_config([str(guild.id) for guild in bot.guilds])
+    await asyncio.sleep(0.5)  # CHANNEL_CREATE events for the new log channels
+    await shutdown(bot, runner)
+
+    # Members joining while the bot is down
+    guilds = list(server.guilds.values())
+    latencies = server.delivery_latencies
+    latencies.clear()
+    for i in range(args.missed):
+        await server.send_member_join(guilds[i % len(guilds)], f"missed-{i}")
+
+    identifies, resumes = server.identify_count, server.resume_count
+    bot, runner, ready = await boot(args.shards)
+    await wait_for(lambda: len(latencies) >= args.missed, 5)
+    result = {
+        'first_boot_s': round(cold_ready, 3),
+        'ready_s': round(ready, 3),
+        'identifies': server.identify_count - identifies,
+        'resumes': server.resume_count - resumes,
+        'guilds': len(bot.guilds),
+        'missed_logged': len(latencies)
+    }
+    await shutdown(bot, runner)
+    await server.stop()
+    return result
+
+async def run(args):
+    results = {}
+    for name, resume in (('identify', False), ('resume', True)):
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            results[name] = await scenario(args, resume)
+    print(f"guilds: {args.guilds}  members: {args.members}  shards: {args.shards}  "
+          f"chunk at startup: {args.chunk_at_startup}")
+    print(f"{'second boot':12} {'ready s':>8} {'identify':>9} {'resume':>7} {'guilds':>7} {'missed logged':>14}")
+    for name, row in results.items():
+        print(f"{name:12} {row['ready_s']:>8} {row['identifies']:>9} {row['resumes']:>7} {row['guilds']:>7} "
+              f"{row['missed_logged']:>8}/{args.missed}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Restart cost with and without gateway resume")
+    parser.add_argument('--guilds', type=int, default=20)
+    parser.add_argument('--members', type=int, default=200, help="members per guild")
+    parser.add_argument('--shards', type=int, default=2)
+    parser.add_argument('--missed', type=int, default=10, help="members joining while the bot is down")
+    parser.add_argument('--chunk-at-startup', action='store_true',
+                        help="Intents.all() and chunk every guild at startup (LAZY_MEMBER_CHUNKING=false)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.setdefault('LOG_TO_FILE', 'false')
+    if args.chunk_at_startup:
+        os.environ['INTENTS_PROFILE'] = 'all'
+        os.environ['LAZY_MEMBER_CHUNKING'] = 'false'
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Memory held by concurrent /clockin sessions: dicts of discord objects vs ClockSession
+
+  objects  - the previous layout: a dict per session holding the interaction's
+             Member, the channel and the timezone name
+  compact  - modules/time_management/sessions.py ClockSession (IDs, epoch
+             start time and flags in __slots__)
+
+With the default (minimal) intents members aren't cached, so the Member an
+interaction carries is referenced only by its session; it is counted as
+session memory. Sessions are spread over 100 guilds with one channel each.
+
+Usage: python benchmarks/session_memory.py [sessions]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import discord
+
+from modules.time_management.sessions import ClockSession, ClockSessions
+
+BOT_ID = 1
+GUILDS = 100
+ZONES = ('UTC', 'America/New_York', 'Europe/London', 'Asia/Tokyo', 'Australia/Sydney')
+
+def member_payload(user_id: int) -> dict:
+    # An interaction's member: user, roles and the permission fields Discord sends with it
+    return {
+        'user': {
+            'id': str(user_id),
+            'username': f'user{user_id}',
+            'discriminator': '0',
+            'global_name': f'User {user_id}',
+            'avatar': None
+        },
+        'roles': ['2000'],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0,
+        'permissions': '0'
+    }
+
+def make_guilds(state) -> list:
+    guilds = []
+    for g in range(GUILDS):
+        guild_id = 1000 + g
+        guilds.append(discord.Guild(data={
+            'id': str(guild_id),
+            'name': f'Guild {g}',
+            'owner_id': str(BOT_ID),
+            'member_count': 1,
+            'roles': [{'id': str(guild_id), 'name': '@everyone', 'permissions': '0', 'position': 0, 'color': 0,
+                       'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}],
+            'channels': [{'id': str(guild_id * 10), 'type': 0, 'name': 'general', 'position': 0,
+                          'permission_overwrites': []}],
+            'emojis': [],
+            'stickers': [],
+            'features': []
+        }, state=state))
+    return guilds
+
+def build(layout: str, count: int, guilds: list, state) -> ClockSessions:
+    sessions = ClockSessions()
+    now = time.time()
+    for i in range(count):
+        guild = guilds[i % GUILDS]
+        user_id = 10 ** 6 + i
+        zone = ZONES[i % len(ZONES)]
+        if layout == 'objects':
+            member = discord.Member(data=member_payload(user_id), guild=guild, state=state)
+            session = {
+                'start_time': now,
+                'user': member,
+                'channel': guild.text_channels[0],
+                'timezone': zone,
+                'reminded': False
+            }
+        else:
+            session = ClockSession(user_id, guild.id, guild.text_channels[0].id, now, zone)
+        sessions.add(guild.id, user_id, session)
+    return sessions
+
+def run(layout: str, count: int) -> dict:
+    client = discord.Client(intents=discord.Intents.none())
+    state = client._connection
+    guilds = make_guilds(state)
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    sessions = build(layout, count, guilds, state)
+    build_time = time.perf_counter() - started
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # One pass of the reminder loop (no session is due)
+    started = time.perf_counter()
+    due = 0
+    for guild_id in sessions.guild_ids():
+        for session in sessions.in_guild(guild_id).values():
+            start_time = session['start_time'] if layout == 'objects' else session.start_time
+            if time.time() - start_time >= 3600:
+                due += 1
+    scan_time = time.perf_counter() - started
+
+    return {
+        'sessions': len(sessions),
+        'mb': round(memory / 1024 / 1024, 1),
+        'bytes_per_session': memory // max(1, count),
+        'build_s': round(build_time, 3),
+        'reminder_scan_s': round(scan_time, 3)
+    }
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"sessions: {count}  guilds: {GUILDS}")
+    for layout in ('objects', 'compact'):
+        print(f"{layout:8}: {run(layout, count)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Persistence throughput: JSON files vs per-write SQLite commits vs utils/storage
+
+Simulates many users running /set-timezone at once against a table that
+already holds --users rows and reports writes per second plus the longest
+event-loop stall seen while the writes run:
+
+  json         - previous behaviour: rewrite data/timezones.json on the event loop per change
+  sqlite       - one connection, one commit per write, in asyncio.to_thread
+  storage      - TimezoneRepository on the shared pool (writes batched per commit)
+
+Reads (TimezoneRepository.get) are measured on the reader pool vs one connection.
+
+Usage: python benchmarks/storage_throughput.py [--users 50000] [--writes 5000] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.storage import Storage, TimezoneRepository
+
+ZONES = ['America/New_York', 'Europe/London', 'Asia/Tokyo', 'Australia/Sydney', 'UTC']
+
+class StallMonitor:
+    """Longest gap between 1 ms ticks on the event loop"""
+
+    def __init__(self):
+        self.worst = 0.0
+        self._task = None
+
+    async def _run(self):
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            self.worst = max(self.worst, now - last - 0.001)
+            last = now
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+async def run_writes(write, count: int, concurrency: int, users: int) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await write(1_000_000 + i % users, ZONES[i % len(ZONES)])
+
+    with StallMonitor() as monitor:
+        await asyncio.sleep(0.005)  # let the monitor take its first tick
+        started = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(count)])
+        elapsed = time.perf_counter() - started
+    return count / elapsed, monitor.worst * 1000
+
+async def bench(args, directory: str):
+    seed = {str(1_000_000 + i): ZONES[i % len(ZONES)] for i in range(args.users)}
+    results = {}
+
+    # JSON file rewritten per change (previous TimeManagement.save_timezone_data)
+    json_path = os.path.join(directory, 'timezones.json')
+    json_writes = min(args.writes, 500)  # too slow to run the full count at large --users
+
+    async def json_write(user_id, zone):
+        seed[str(user_id)] = zone
+        with open(json_path, 'w') as f:
+            json.dump(seed, f, indent=2)
+        await asyncio.sleep(0)  # separate commands: let the loop run between saves
+
+    results['json'] = await run_writes(json_write, json_writes, args.concurrency, args.users)
+
+    # One connection, commit per write
+    conn = sqlite3.connect(os.path.join(directory, 'naive.db'), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE user_timezones (user_id INTEGER PRIMARY KEY, timezone TEXT NOT NULL)")
+    conn.executemany("INSERT INTO user_timezones VALUES (?, ?)", [(int(k), v) for k, v in seed.items()])
+    conn.commit()
+    lock = threading.Lock()
+
+    def naive_write(user_id, zone):
+        with lock:
+            conn.execute(TimezoneRepository.UPSERT, (user_id, zone))
+            conn.commit()
+
+    def naive_read(user_id):
+        with lock:
+            return conn.execute(TimezoneRepository.SELECT_ONE, (user_id,)).fetchone()
+
+    results['sqlite'] = await run_writes(lambda u, z: asyncio.to_thread(naive_write, u, z),
+                                         args.writes, args.concurrency, args.users)
+
+    # Shared storage layer
+    storage = Storage(os.path.join(directory, 'alpha_bot.db'), pool_size=args.pool_size)
+    repository = TimezoneRepository(storage)
+    await repository.set_many((int(k), v) for k, v in seed.items())
+    results['storage'] = await run_writes(repository.set, args.writes, args.concurrency, args.users)
+
+    print(f"users: {args.users}  writes: {args.writes} (json: {json_writes})  concurrency: {args.concurrency}")
+    print(f"{'writes':10} {'ops/s':>10} {'max stall ms':>13}")
+    for name, (rate, stall) in results.items():
+        print(f"{name:10} {rate:>10.0f} {stall:>13.1f}")
+
+    reads = {
+        'sqlite': lambda u, _: asyncio.to_thread(naive_read, u),
+        'storage': lambda u, _: repository.get(u)
+    }
+    print(f"\n{'reads':10} {'ops/s':>10} {'max stall ms':>13}")
+    for name, read in reads.items():
+        rate, stall = await run_writes(read, args.writes, args.concurrency, args.users)
+        print(f"{name:10} {rate:>10.0f} {stall:>13.1f}")
+
+    await storage.close()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage layer throughput benchmark")
+    parser.add_argument('--users', type=int, default=50000, help="rows already stored")
+    parser.add_argument('--writes', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=100, help="writers in flight at once")
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(bench(args, directory))
+
+if __name__ == "__main__":
+    main()
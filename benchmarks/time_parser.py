@@ -0,0 +1,59 @@
+"""
+Time expression parsing cost: previous strptime code vs utils/time_parser
+
+"legacy" is the old /time parsing (strptime "%H:%M", then
+"%Y-%m-%d %H:%M", localized with pytz). "parser cold" clears the LRU cache
+before every call; "parser warm" is the common case of repeated inputs.
+Both produce an aware datetime in the user's timezone; pytz localize()
+(~20 us, same DST semantics as before) is a large share of either path.
+
+Usage: python benchmarks/time_parser.py [calls]
+"""
+from datetime import datetime, timezone
+import os
+import sys
+import time
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.time_parser import parse_spec, parse_time
+
+def legacy_parse(text: str, tz) -> datetime:
+    if len(text.split()) == 1:
+        time_obj = datetime.strptime(text, "%H:%M")
+        time_obj = datetime.combine(datetime.now().date(), time_obj.time())
+    else:
+        time_obj = datetime.strptime(text, "%Y-%m-%d %H:%M")
+    return tz.localize(time_obj)
+
+def per_call(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tz = pytz.timezone('America/New_York')
+    now = datetime.now(timezone.utc)
+    inputs = ['14:30', '2024-12-25 14:30', '2:30pm', '2024-12-25T14:30:00+01:00', 'in 2h', 'tomorrow 9am', 'next friday noon']
+
+    def cold(text):
+        parse_spec.cache_clear()
+        parse_time(text, tz, now)
+
+    print(f"calls: {calls}  (microseconds per parse)")
+    print(f"{'input':28} {'legacy':>8} {'cold':>8} {'warm':>8}")
+    for text in inputs:
+        try:
+            legacy_parse(text, tz)
+            legacy = f"{per_call(lambda: legacy_parse(text, tz), calls):8.2f}"
+        except ValueError:
+            legacy = f"{'-':>8}"
+        parser_cold = per_call(lambda: cold(text), calls)
+        parser_warm = per_call(lambda: parse_time(text, tz, now), calls)
+        print(f"{text:28} {legacy} {parser_cold:8.2f} {parser_warm:8.2f}")
+
+if __name__ == "__main__":
+    main()
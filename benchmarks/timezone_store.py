@@ -0,0 +1,117 @@
+"""
+Memory and load time of the in-memory user timezone table
+
+Fills a scratch database with --users timezone preferences spread over
+pytz's common zones (a few popular ones take most users), then loads it:
+
+  dict   - previous load_timezone_data: {str(user_id): zone name} built from
+           TimezoneRepository.all()
+  store  - modules/time_management/timezone_store.py TimezoneStore, bulk
+           loaded through TimezoneRepository.load
+
+and reports load time, memory held afterwards and the peak while loading,
+plus 100k lookups and a group-by-zone over every user.
+
+Usage: python benchmarks/timezone_store.py [--users 1000000]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytz
+
+from modules.time_management.timezone_store import TimezoneStore
+from utils.storage import Storage, TimezoneRepository
+
+async def populate(repo: TimezoneRepository, users: int) -> list:
+    rng = random.Random(42)
+    zones = sorted(pytz.common_timezones)
+    popular = zones[:: len(zones) // 20][:20]
+    user_ids = rng.sample(range(10 ** 17, 10 ** 18), users)
+    for start in range(0, users, 50000):
+        batch = user_ids[start:start + 50000]
+        await repo.set_many(
+            (user_id, rng.choice(popular) if rng.random() < 0.8 else rng.choice(zones)) for user_id in batch
+        )
+    return user_ids
+
+async def load_dict(repo: TimezoneRepository):
+    return {str(user_id): tz for user_id, tz in (await repo.all()).items()}
+
+async def load_store(repo: TimezoneRepository):
+    return await repo.load(TimezoneStore.from_rows)
+
+def lookups(layout: str, table, user_ids: list) -> float:
+    started = time.perf_counter()
+    if layout == 'dict':
+        for user_id in user_ids:
+            table.get(str(user_id))
+    else:
+        for user_id in user_ids:
+            table.get(user_id)
+    return time.perf_counter() - started
+
+def group_by_zone(layout: str, table) -> float:
+    started = time.perf_counter()
+    if layout == 'dict':
+        groups = {}
+        for user_id, tz in table.items():
+            groups.setdefault(tz, []).append(int(user_id))
+    else:
+        table.group_by_zone()
+    return time.perf_counter() - started
+
+async def measure(layout: str, repo: TimezoneRepository, sample: list) -> dict:
+    load = load_dict if layout == 'dict' else load_store
+    # Timed without tracemalloc, which slows allocation-heavy code down
+    gc.collect()
+    started = time.perf_counter()
+    table = await load(repo)
+    load_time = time.perf_counter() - started
+    del table
+
+    gc.collect()
+    tracemalloc.start()
+    table = await load(repo)
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'load_s': round(load_time, 3),
+        'held_mb': round(held / 1024 / 1024, 1),
+        'peak_mb': round(peak / 1024 / 1024, 1),
+        'lookup_100k_s': round(lookups(layout, table, sample), 3),
+        'group_by_zone_s': round(group_by_zone(layout, table), 3)
+    }
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as scratch:
+        storage = Storage(os.path.join(scratch, 'bench.db'))
+        repo = TimezoneRepository(storage)
+        started = time.perf_counter()
+        user_ids = await populate(repo, args.users)
+        print(f"users: {args.users}  (database filled in {time.perf_counter() - started:.1f}s)")
+        sample = random.Random(7).choices(user_ids, k=100000)
+        del user_ids
+        for layout in ('dict', 'store'):
+            print(f"{layout:6}: {await measure(layout, repo, sample)}")
+        await storage.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="User timezone table memory and load time")
+    parser.add_argument('--users', type=int, default=1000000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
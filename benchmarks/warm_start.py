@@ -0,0 +1,122 @@
+"""
+Time to first successful command after a boot, with and without the state snapshot
+
+Boots AlphaBot against devtools/fake_discord.py once so a state snapshot is
+written on shutdown, then boots it again (IDENTIFY, no gateway resume) with
+GUILD_CREATEs streaming in slowly, as they do for bots in many guilds. From
+login onwards an admin runs /add-role <member name> <role> in the guild whose
+GUILD_CREATE arrives last, every --interval seconds, until it succeeds:
+
+  first_success_s  - login to the first "Role Added" response
+  attempts         - commands sent until then (the others failed: no roles or
+                     members cached yet)
+  ready_s          - login to on_ready
+
+Usage: python benchmarks/warm_start.py [--guilds 10] [--members 500] [--guild-create-delay 0.5]
+                                       [--interval 0.1]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devtools.fake_discord import BOT_USER_ID, FakeDiscord
+
+async def boot(wait_ready: bool = True):
+    from bot import AlphaBot
+    bot = AlphaBot(shard_count=1)
+    await bot.login('fake-token')
+    runner = asyncio.create_task(bot.connect(reconnect=False))
+    if wait_ready:
+        await asyncio.wait_for(bot.wait_until_ready(), timeout=120)
+    return bot, runner
+
+async def shutdown(bot, runner):
+    await bot.close()
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+
+def response_title(record: dict) -> str:
+    embeds = (record.get('original') or {}).get('embeds') or [{}]
+    return embeds[0].get('title', '')
+
+async def scenario(args, snapshot: bool) -> dict:
+    from config.config import Config
+    Config.GATEWAY_RESUME = False
+    Config.STATE_SNAPSHOT_INTERVAL = 600 if snapshot else 0
+    server = FakeDiscord(guilds=args.guilds, members_per_guild=args.members, rate_limit=1000)
+    guild = list(server.guilds.values())[-1]  # its GUILD_CREATE arrives last
+    admin_role = next(role for role in guild.roles if role['name'] == 'bot-admin')
+    role = next(role for role in guild.roles if role['name'] == 'role-1')
+    members = [user_id for user_id in guild.members if user_id != BOT_USER_ID]
+    admin_id, target_id = members[0], members[-1]
+    guild.members[admin_id]['roles'].append(admin_role['id'])
+    target_name = guild.members[target_id]['user']['username']
+    await server.start()
+    server.install()
+
+    bot, runner = await boot()
+    await shutdown(bot, runner)
+
+    server.guild_create_delay = args.guild_create_delay
+    started = time.perf_counter()
+    bot, runner = await boot(wait_ready=False)
+    attempts, success_at = 0, None
+    deadline = started + args.guild_create_delay * args.guilds + 30
+    while success_at is None and time.perf_counter() < deadline:
+        attempts += 1
+        interaction_id = await server.invoke_command(
+            guild, int(guild.channels[0]['id']), admin_id, 'add-role',
+            options=[{'name': 'user', 'type': 3, 'value': target_name},
+                     {'name': 'role', 'type': 8, 'value': role['id']}],
+            resolved={'roles': {role['id']: role}}
+        )
+        record = server.interactions[interaction_id]
+        await asyncio.sleep(args.interval)
+        if response_title(record) == 'Role Added':
+            success_at = record['responded']
+        else:
+            # Earlier attempts may still be answered late
+            success_at = next((r['responded'] for r in server.interactions.values()
+                               if response_title(r) == 'Role Added'), None)
+    await asyncio.wait_for(bot.wait_until_ready(), timeout=120)
+    ready = time.perf_counter() - started
+    result = {
+        'first_success_s': round(success_at - started, 3) if success_at else None,
+        'attempts': attempts,
+        'ready_s': round(ready, 3)
+    }
+    await shutdown(bot, runner)
+    await server.stop()
+    return result
+
+async def run(args):
+    results = {}
+    for name, snapshot in (('no snapshot', False), ('snapshot', True)):
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            results[name] = await scenario(args, snapshot)
+    print(f"guilds: {args.guilds}  members: {args.members}  GUILD_CREATE every {args.guild_create_delay}s")
+    print(f"{'':12} {'first success s':>16} {'attempts':>9} {'ready s':>8}")
+    for name, row in results.items():
+        print(f"{name:12} {str(row['first_success_s']):>16} {row['attempts']:>9} {row['ready_s']:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first successful command after a boot")
+    parser.add_argument('--guilds', type=int, default=10)
+    parser.add_argument('--members', type=int, default=500, help="members per guild")
+    parser.add_argument('--guild-create-delay', type=float, default=0.5, help="seconds between GUILD_CREATEs")
+    parser.add_argument('--interval', type=float, default=0.1, help="seconds between command attempts")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.setdefault('LOG_TO_FILE', 'false')
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+import discord
+from discord.ext import commands, tasks
+import asyncio
+import importlib
+import logging
+from typing import Dict, Optional, List
+from config.config import Config
+from utils.logging_setup import setup_logging
+from utils.command_sync import sync_command_tree
+from utils.member_cache import member_cache
+from utils.cluster import ClusterClient
+from utils.metrics import metrics
+from utils.profiler import ControlServer, profiler
+from utils.stats import bot_stats
+from utils.storage import storage
+from utils.json_migration import migrate_legacy_databases, migrate_legacy_files
+from utils.gateway_resume import GatewayResume
+from utils.state_snapshot import state_snapshot
+from utils.startup_profile import startup_profile
+from utils.config_service import config_service
+from utils.embed_templates import embed_templates
+from discord.gateway import DiscordWebSocket
+from discord.shard import Shard
+from functools import partial
+import os
+import signal
+import sys
+import time
+import yarl
+from datetime import datetime
+
+def configure_logging(log_file: str = Config.LOG_FILE_PATH):
+    """Configure process logging (queued - file I/O and rotation happen off the event loop)"""
+    return setup_logging(
+        level=Config.LOG_LEVEL,
+        log_file=log_file if Config.LOG_TO_FILE else None,
+        json_output=Config.LOG_JSON,
+        max_bytes=Config.LOG_MAX_BYTES,
+        backup_count=Config.LOG_BACKUP_COUNT
+    )
+
+def apply_api_overrides():
+    """Point discord.py at alternative REST/gateway URLs (e.g. a local fake Discord) when configured"""
+    if Config.DISCORD_API_BASE:
+        discord.http.Route.BASE = Config.DISCORD_API_BASE
+    if Config.DISCORD_GATEWAY_URL:
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(Config.DISCORD_GATEWAY_URL)
+
+def cluster_path(path: str, cluster: Optional[dict]) -> str:
+    """Per-cluster variant of a data file path (data/bot.log -> data/bot-cluster1.log)"""
+    if not cluster:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-cluster{cluster['cluster_id']}{ext}"
+
+# Cogs by name (Config.ENABLED_COGS): extension module (with an async setup(bot)) and cog class
+COGS = {
+    'management': ('modules.discord_management.management', 'DiscordManagement'),
+    'time': ('modules.time_management.timer', 'TimeManagement'),
+    'logs': ('modules.logs.logger', 'LogsModule'),
+    'info': ('modules.core.info', 'BotInfo')
+}
+
+def import_cogs(names: List[str]) -> list:
+    """Import the enabled cog classes (modules of disabled cogs are never imported)"""
+    cogs = []
+    for name in COGS:
+        if name not in names:
+            continue
+        module_name, class_name = COGS[name]
+        try:
+            with startup_profile.phase(f"import cog {name}"):
+                cogs.append(getattr(importlib.import_module(module_name), class_name))
+        except Exception as e:
+            # Reported again (and skipped) when the cogs load; the rest still start
+            logging.error(f"Error importing cog {name}: {e}")
+    for name in set(names) - set(COGS):
+        logging.error(f"Unknown cog in ENABLED_COGS: {name}")
+    return cogs
+
+def build_intents(cogs, profile: str) -> discord.Intents:
+    """Build the gateway intents for a profile ('all' or 'minimal', derived from the cogs' REQUIRED_INTENTS)"""
+    if profile == 'all':
+        return discord.Intents.all()
+    
+    intents = discord.Intents.none()
+    intents.guilds = True
+    for cog in cogs:
+        for flag in getattr(cog, 'REQUIRED_INTENTS', ()):
+            setattr(intents, flag, True)
+    return intents
+
+class AlphaBot(commands.AutoShardedBot):
+    def __init__(self, shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None,
+                 cluster: Optional[dict] = None, profile_startup: bool = False):
+        # The classes are only needed for their REQUIRED_INTENTS; the cogs load as extensions in setup_hook
+        intents = build_intents(import_cogs(Config.ENABLED_COGS), Config.INTENTS_PROFILE)
+        super().__init__(
+            command_prefix=Config.PREFIX,
+            intents=intents,
+            description="Alpha Discord Bot - Professional Discord Management Solution",
+            chunk_guilds_at_startup=not Config.LAZY_MEMBER_CHUNKING,
+            shard_ids=shard_ids,
+            shard_count=shard_count
+        )
+        # IPC connection to the launcher when running as one cluster of several
+        self.cluster_config = cluster
+        # In-memory cog state (export_state/import_state) carried across a /reload, by cog name
+        self.cog_handover: Dict[str, object] = {}
+        # --profile-startup: print the startup breakdown and exit once ready
+        self.profile_startup = profile_startup
+        self.cluster: Optional[ClusterClient] = None
+        self.metrics_runner = None
+        self.control_server: Optional[ControlServer] = None
+        # Journal of gateway state so a restart can RESUME instead of IDENTIFY
+        self.gateway_resume: Optional[GatewayResume] = None
+        if Config.GATEWAY_RESUME:
+            self.gateway_resume = GatewayResume(cluster_path(Config.GATEWAY_SESSION_PATH, cluster),
+                                                Config.GATEWAY_RESUME_MAX_AGE, Config.GATEWAY_JOURNAL_MAX_BYTES)
+            self.gateway_resume.install(self._connection)
+    
+    async def add_cog(self, cog, **kwargs):
+        """Add a cog and time its app commands and task loops"""
+        # Not popped: if the reloaded cog fails to load, the restored old one takes the state instead
+        state = self.cog_handover.get(cog.qualified_name)
+        if state is not None and hasattr(cog, 'import_state'):
+            # Before cog_load, so background tasks start with the handed-over state
+            cog.import_state(state)
+        await super().add_cog(cog, **kwargs)
+        metrics.instrument_cog(cog)
+        bot_stats.count_commands(self.tree)
+    
+    async def remove_cog(self, name, **kwargs):
+        cog = await super().remove_cog(name, **kwargs)
+        bot_stats.count_commands(self.tree)
+        return cog
+    
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        # Every listener dispatch goes through here; time it per event type
+        await super()._run_event(partial(metrics.call, 'event', event_name, coro), event_name, *args, **kwargs)
+    
+    async def launch_shards(self):
+        if self.shard_count is None and self.gateway_resume and self.gateway_resume.shard_count:
+            # Saved sessions only resume with the shard count they were made with
+            self.shard_count = self.gateway_resume.shard_count
+        await super().launch_shards()
+    
+    async def launch_shard(self, gateway, shard_id, *, initial=False):
+        """RESUME the shard's session saved at the last shutdown, or IDENTIFY as usual"""
+        saved = self.gateway_resume.take(shard_id, self.shard_count) if self.gateway_resume else None
+        if saved is None:
+            return await super().launch_shard(gateway, shard_id, initial=initial)
+        try:
+            coro = DiscordWebSocket.from_client(
+                self, initial=initial, gateway=yarl.URL(saved['resume_url']), shard_id=shard_id,
+                session=saved['session_id'], sequence=saved['sequence'], resume=True
+            )
+            ws = await asyncio.wait_for(coro, timeout=self.shard_connect_timeout)
+        except Exception as e:
+            logging.error(f"Error resuming shard {shard_id}, identifying instead: {e}")
+            return await super().launch_shard(gateway, shard_id, initial=initial)
+        
+        # Rebuild the cache before the shard starts reading the events missed during the restart
+        replayed = self.gateway_resume.rehydrate(self._connection, shard_id, saved['entries'])
+        logging.info(f"Resuming shard {shard_id} with {replayed} journaled events replayed")
+        # As AutoShardedClient.launch_shard does once connected (private attributes: discord.py is pinned)
+        self._AutoShardedClient__shards[shard_id] = shard = Shard(ws, self, self._AutoShardedClient__queue.put_nowait)
+        shard.launch()
+        
+    async def setup_hook(self):
+        """Start the supporting services and load all cogs; a failing step is logged and the rest still run"""
+        if self.cluster_config:
+            try:
+                self.cluster = ClusterClient(
+                    self.cluster_config['cluster_id'],
+                    self.cluster_config['host'],
+                    self.cluster_config['port'],
+                    self.cluster_config['token'],
+                    self.cluster_config.get('cluster_count', 1)
+                )
+                self.cluster.register('stats', self.local_stats)
+                self.cluster.register('reload_cog', self.reload_cog)
+                await self.cluster.connect()
+            except Exception as e:
+                logging.error(f"Error connecting to the cluster hub: {e}")
+        
+        if self.gateway_resume:
+            try:
+                with startup_profile.phase("load gateway sessions"):
+                    await self.gateway_resume.load(self.user.id)
+            except Exception as e:
+                logging.error(f"Error loading saved gateway sessions: {e}")
+        if Config.STATE_SNAPSHOT_INTERVAL:
+            try:
+                # Mapped, not parsed - guilds are decoded when their shard connects
+                started = time.perf_counter()
+                with startup_profile.phase("map state snapshot"):
+                    guilds = state_snapshot.open(cluster_path(Config.STATE_SNAPSHOT_PATH, self.cluster_config))
+                if guilds:
+                    logging.info(f"Mapped state snapshot of {guilds} guilds in {(time.perf_counter() - started) * 1000:.1f} ms")
+            except Exception as e:
+                logging.error(f"Error mapping state snapshot: {e}")
+            self.save_state_snapshot.start()
+        
+        # Runtime settings (colors, timeouts, channels) are watched and swapped without a restart
+        try:
+            with startup_profile.phase("load runtime settings"):
+                config_service.subscribe(embed_templates.clear)
+                await config_service.start()
+        except Exception as e:
+            logging.error(f"Error loading runtime settings: {e}")
+        
+        # Import leftover data/*.json files and old standalone databases before the cogs load their state
+        try:
+            with startup_profile.phase("open database / import legacy files"):
+                data_dir = os.path.dirname(Config.DATABASE_PATH) or '.'
+                await migrate_legacy_files(storage, data_dir)
+                await migrate_legacy_databases(storage, data_dir)
+        except Exception as e:
+            logging.error(f"Error importing legacy files: {e}")
+        
+        # Always attempted: each cog's own failure is logged by load_cogs
+        with startup_profile.phase("load cogs"):
+            await self.load_cogs()
+        
+        if Config.LAZY_MEMBER_CHUNKING:
+            self.evict_member_cache.start()
+        
+        metrics.start_lag_sampler(Config.LOOP_LAG_SAMPLE_INTERVAL)
+        # One port per cluster so every process can be scraped
+        cluster_id = self.cluster_config['cluster_id'] if self.cluster_config else 0
+        if Config.METRICS_PORT:
+            try:
+                self.metrics_runner = await metrics.serve(Config.METRICS_HOST, Config.METRICS_PORT + cluster_id)
+            except Exception as e:
+                logging.error(f"Error starting the metrics endpoint: {e}")
+        if Config.PROFILER_CONTROL_PORT:
+            try:
+                control_server = ControlServer(profiler, Config.PROFILER_CONTROL_TOKEN,
+                                               port=Config.PROFILER_CONTROL_PORT + cluster_id)
+                await control_server.start()
+                self.control_server = control_server
+            except Exception as e:
+                logging.error(f"Error starting the profiler control server: {e}")
+        
+        try:
+            with startup_profile.phase("sync slash commands"):
+                await self.sync_commands(force=Config.FORCE_COMMAND_SYNC)
+        except Exception as e:
+            logging.error(f"Error syncing slash commands: {e}")
+    
+    async def load_cogs(self) -> int:
+        """Load the enabled cogs' extensions concurrently; a cog that fails is logged and skipped"""
+        async def load(name: str) -> bool:
+            try:
+                with startup_profile.phase(f"load cog {name}"):
+                    await self.load_extension(COGS[name][0])
+                return True
+            except Exception as e:
+                logging.error(f"Error loading cog {name}: {e}")
+                return False
+        
+        names = [name for name in COGS if name in Config.ENABLED_COGS]
+        results = await asyncio.gather(*(load(name) for name in names))
+        return sum(results)
+    
+    async def reload_cog(self, name: str) -> Optional[str]:
+        """Reload a cog's extension in place (or load it if it isn't loaded); returns an error message on failure
+        
+        State the cog exports (export_state) is handed to the new instance (import_state).
+        The other modules of the cog's package (e.g. modules/time_management/sessions.py)
+        are re-imported with it; utils/*, config and bot.py keep the code they started with.
+        If the new code fails to load, the previous modules are put back.
+        """
+        if name not in COGS:
+            return f"Unknown cog: {name}"
+        extension = COGS[name][0]
+        try:
+            if extension not in self.extensions:
+                await self.load_extension(extension)
+            else:
+                for cog in list(self.cogs.values()):
+                    if cog.__module__ == extension and hasattr(cog, 'export_state'):
+                        self.cog_handover[cog.qualified_name] = cog.export_state()
+                # Drop the package's helper modules so the new extension imports them afresh
+                package = extension.rpartition('.')[0] + '.'
+                helpers = {module: sys.modules.pop(module) for module in list(sys.modules)
+                           if module.startswith(package) and module != extension}
+                try:
+                    await self.reload_extension(extension)
+                except Exception:
+                    sys.modules.update(helpers)
+                    raise
+        except Exception as e:
+            logging.error(f"Error reloading cog {name}: {e}")
+            return str(e)
+        finally:
+            self.cog_handover.clear()
+        await self.sync_commands()
+        logging.info(f"Reloaded cog {name}")
+        return None
+    
+    async def sync_commands(self, force: bool = False):
+        """Sync slash commands (skipped when the command schema is unchanged)"""
+        # Commands are global, so only the first cluster needs to sync them
+        if self.cluster_config and self.cluster_config['cluster_id'] != 0:
+            return
+        synced_scopes = await sync_command_tree(
+            self.tree,
+            self.application_id,
+            Config.COMMAND_SYNC_CACHE_PATH,
+            guild_ids=Config.DEV_GUILD_IDS,
+            force=force
+        )
+        print(f"Slash commands synced for {synced_scopes} scope(s)" if synced_scopes else "Slash commands up to date")
+
+    async def local_stats(self) -> dict:
+        """Statistics for the shards running in this process"""
+        return {
+            'guilds': bot_stats.guild_count,
+            'users': bot_stats.user_count,
+            'shards': sorted(self.shards.keys()),
+            'latency': self.latency
+        }
+    
+    async def global_stats(self) -> dict:
+        """Statistics aggregated across every cluster (or just this process when not clustered)"""
+        if not self.cluster:
+            results = [await self.local_stats()]
+        else:
+            try:
+                # Short timeout - /info waits for this before answering
+                results = [r for r in (await self.cluster.request('stats', timeout=2.0)).values() if r]
+            except Exception as e:
+                logging.error(f"Error aggregating cluster stats: {e}")
+                results = [await self.local_stats()]
+        return {
+            'guilds': sum(r['guilds'] for r in results),
+            'users': sum(r['users'] for r in results),
+            'shards': sum(len(r['shards']) for r in results),
+            'clusters': len(results)
+        }
+    
+    async def close(self):
+        metrics.stop_lag_sampler()
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        if self.control_server:
+            await self.control_server.stop()
+        if self.cluster:
+            await self.cluster.close()
+        await config_service.stop()
+        if Config.STATE_SNAPSHOT_INTERVAL and self.user and not self.is_closed():
+            self.save_state_snapshot.cancel()
+            try:
+                await state_snapshot.save(self.guilds)
+            except Exception as e:
+                logging.error(f"Error saving state snapshot: {e}")
+        if self.gateway_resume and self.user and not self.is_closed():
+            try:
+                saved = await self.gateway_resume.save(self._AutoShardedClient__shards, self.user.id, self.shard_count)
+                if saved:
+                    logging.info(f"Saved {saved} gateway session(s) for resume")
+            except Exception as e:
+                logging.error(f"Error saving gateway sessions: {e}")
+        await super().close()
+        # After the cogs are unloaded, so their last writes are flushed
+        await storage.close()
+        state_snapshot.close()
+    
+    @tasks.loop(seconds=Config.STATE_SNAPSHOT_INTERVAL or 600)
+    async def save_state_snapshot(self):
+        """Snapshot channels, roles and member names for the next warm start"""
+        try:
+            started = time.perf_counter()
+            saved = await state_snapshot.save(self.guilds)
+            logging.info(f"Saved state snapshot of {saved} guilds in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logging.error(f"Error saving state snapshot: {e}")
+    
+    @save_state_snapshot.before_loop
+    async def before_save_state_snapshot(self):
+        await self.wait_until_ready()
+    
+    async def on_shard_connect(self, shard_id: int):
+        """Serve guilds still waiting for their GUILD_CREATE from the snapshot"""
+        hydrated = state_snapshot.hydrate_shard(self, shard_id)
+        if hydrated:
+            logging.info(f"Restored {hydrated} guilds of shard {shard_id} from the state snapshot")
+    
+    async def on_guild_available(self, guild: discord.Guild):
+        state_snapshot.reconcile(guild)
+    
+    async def on_guild_join(self, guild: discord.Guild):
+        state_snapshot.reconcile(guild)
+    
+    @tasks.loop(minutes=5)
+    async def evict_member_cache(self):
+        """Drop member lists of large guilds that have not needed them recently"""
+        member_cache.evict_idle(self.guilds)
+    
+    async def on_ready(self):
+        """Called when bot is ready"""
+        print(f'{self.user} has connected to Discord!')
+        print(f'Bot is in {len(self.guilds)} guilds')
+        print(f'Intents profile: {Config.INTENTS_PROFILE} (value {self.intents.value})')
+        startup_profile.ready()
+        if self.profile_startup:
+            await self.close()
+            return
+        
+        # Set bot status
+        await self.change_presence(
+            activity=discord.Activity(
+                type=discord.ActivityType.watching,
+                name="over the server | Slash Commands Only"
+            )
+        )
+        
+        # Create data directories if they don't exist
+        os.makedirs('data/logs', exist_ok=True)
+        os.makedirs('data/timers', exist_ok=True)
+        os.makedirs('data/users', exist_ok=True)
+
+    async def on_command_error(self, ctx, error):
+        """Global error handler"""
+        if isinstance(error, commands.CommandNotFound):
+            return
+        elif isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ You don't have permission to use this command.")
+        elif isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send(f"❌ Missing required argument: {error.param}")
+        else:
+            logging.error(f"Unhandled error: {error}")
+            await ctx.send("❌ An unexpected error occurred. Please try again later.")
+
+def run_bot(shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None,
+            cluster: Optional[dict] = None, profile_startup: bool = False) -> int:
+    """Run a bot process for the given shards (all shards when not specified); returns the exit status"""
+    log_listener = configure_logging(cluster_path(Config.LOG_FILE_PATH, cluster))
+    
+    apply_api_overrides()
+    with startup_profile.phase("construct bot"):
+        bot = AlphaBot(shard_ids=shard_ids, shard_count=shard_count, cluster=cluster,
+                       profile_startup=profile_startup)
+    
+    async def runner():
+        # SIGTERM (the launcher stopping a cluster, or a process manager) closes the bot like Ctrl+C,
+        # so sessions, snapshots and pending writes are saved
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows
+        async with bot:
+            start = asyncio.create_task(bot.start(Config.TOKEN))
+            stop = asyncio.create_task(stopping.wait())
+            await asyncio.wait({start, stop}, return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+            if not start.done():
+                print("\n👋 Bot shutting down...")
+                await bot.close()
+            await start
+    
+    try:
+        # Logging is set up above; discord.py's own (blocking) handler is never installed
+        asyncio.run(runner())
+    except discord.LoginFailure:
+        # Not a crash: retrying with the same token can't succeed
+        print("❌ Invalid bot token provided!")
+    except KeyboardInterrupt:
+        print("\n👋 Bot shutting down...")
+    except Exception as e:
+        logging.error(f"Fatal error: {e}")
+        return 1
+    finally:
+        log_listener.stop()
+    return 0
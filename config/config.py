@@ -13,6 +13,56 @@ class Config:
     # Bot Settings
     PREFIX = os.getenv('BOT_PREFIX', '!')
     
+    # Cogs to load as extensions, comma-separated (management, time, logs, info); disabled cogs are never imported
+    ENABLED_COGS = [name.strip() for name in os.getenv('ENABLED_COGS', 'management,time,logs,info').split(',') if name.strip()]
+    
+    # Metrics
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))  # local Prometheus endpoint; 0 = disabled
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    LOOP_LAG_SAMPLE_INTERVAL = 0.5  # seconds
+    
+    # Profiling
+    PROFILE_OUTPUT_DIR = 'data/profiles'
+    PROFILE_MAX_SECONDS = 120
+    PROFILER_CONTROL_PORT = int(os.getenv('PROFILER_CONTROL_PORT', '0'))  # loopback control socket; 0 = disabled
+    PROFILER_CONTROL_TOKEN = os.getenv('PROFILER_CONTROL_TOKEN', '')  # required by the control socket
+    
+    # Sharding / Clusters
+    SHARD_COUNT = int(os.getenv('SHARD_COUNT', '0'))  # 0 = use Discord's recommendation
+    CLUSTER_COUNT = int(os.getenv('CLUSTER_COUNT', '1'))  # worker processes; 1 = single process
+    
+    # Gateway session resume across restarts (utils/gateway_resume.py)
+    GATEWAY_RESUME = os.getenv('GATEWAY_RESUME', 'true').lower() == 'true'
+    GATEWAY_SESSION_PATH = 'data/gateway_session.jsonl'
+    GATEWAY_RESUME_MAX_AGE = int(os.getenv('GATEWAY_RESUME_MAX_AGE', '120'))  # seconds; older sessions IDENTIFY
+    GATEWAY_JOURNAL_MAX_BYTES = int(os.getenv('GATEWAY_JOURNAL_MAX_BYTES', str(64 * 1024 * 1024)))
+    
+    # Warm-start snapshot of guild channels, roles and member names (utils/state_snapshot.py)
+    STATE_SNAPSHOT_PATH = 'data/state_snapshot.bin'
+    STATE_SNAPSHOT_INTERVAL = int(os.getenv('STATE_SNAPSHOT_INTERVAL', '600'))  # seconds between saves; 0 = disabled
+    
+    # Alternative REST/gateway URLs, e.g. a local fake Discord for testing (devtools/fake_discord.py)
+    DISCORD_API_BASE = os.getenv('DISCORD_API_BASE', '')
+    DISCORD_GATEWAY_URL = os.getenv('DISCORD_GATEWAY_URL', '')
+    
+    # Slash command sync
+    # Guild IDs to sync to instead of globally (dev builds), comma-separated
+    DEV_GUILD_IDS = [int(guild_id) for guild_id in os.getenv('DEV_GUILD_IDS', '').split(',') if guild_id.strip()]
+    FORCE_COMMAND_SYNC = os.getenv('FORCE_COMMAND_SYNC', 'false').lower() == 'true'
+    
+    # Gateway Intents
+    # 'minimal' enables only what the loaded cogs need; 'all' restores discord.Intents.all()
+    INTENTS_PROFILE = os.getenv('INTENTS_PROFILE', 'minimal').lower()
+    # Request member lists per guild on first use instead of chunking every guild at startup
+    LAZY_MEMBER_CHUNKING = os.getenv('LAZY_MEMBER_CHUNKING', 'true').lower() == 'true'
+    MEMBER_CACHE_IDLE_TTL = 30 * 60  # seconds before an unused guild member list is evicted
+    MEMBER_CACHE_EVICT_MIN_MEMBERS = 1000  # smaller guilds are never evicted
+    
+    # Runtime settings file, reloaded without a restart when it changes (utils/config_service.py).
+    # Overrides the announcement channel, clock-in timeout, bulk limits, colors and emojis below
+    RUNTIME_CONFIG_PATH = os.getenv('RUNTIME_CONFIG_PATH', 'config/runtime.json')
+    RUNTIME_CONFIG_POLL_INTERVAL = 2  # seconds between modification-time checks
+    
     # Channel IDs (Set these for your server)
     ANNOUNCEMENT_CHANNEL_ID = int(os.getenv('ANNOUNCEMENT_CHANNEL_ID', '0'))
     
@@ -48,7 +98,34 @@ class Config:
     
     # Database file paths
     DATABASE_PATH = 'data/alpha_bot.db'
+    DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', '4'))  # reader connections (plus one writer)
     LOGS_PATH = 'data/logs/'
+    COMMAND_SYNC_CACHE_PATH = 'data/command_sync.json'
+    
+    # Process Logging Settings
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_TO_FILE = os.getenv('LOG_TO_FILE', 'true').lower() == 'true'
+    LOG_JSON = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+    LOG_FILE_PATH = 'data/bot.log'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    
+    # Log Outbox Settings (retry of log events that failed to send)
+    LOG_OUTBOX_DRAIN_INTERVAL = 15  # seconds between drain passes
+    LOG_OUTBOX_BASE_DELAY = 5  # first retry delay in seconds, doubled per attempt
+    LOG_OUTBOX_MAX_DELAY = 60 * 60  # cap on retry delay
+    LOG_OUTBOX_MAX_AGE = 7 * 24 * 60 * 60  # undelivered events older than this are dropped
+    
+    # Number of guilds provisioned at once by /setup-logs-all
+    LOG_SETUP_CONCURRENCY = 5
+    
+    # Announcement Settings
+    ANNOUNCEMENT_CONCURRENCY = 5  # channels posted to at once during fan-out
+    
+    # Bulk Role Settings
+    BULK_ROLE_CONCURRENCY = 5  # member edits in flight at once
+    BULK_ROLE_MAX_TARGETS = 1000  # members per bulk operation
+    BULK_ROLE_PROGRESS_INTERVAL = 3  # seconds between progress updates
     
     @classmethod
     def validate_config(cls):
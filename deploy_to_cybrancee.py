@@ -14,6 +14,7 @@ class CybranceeDeployer:
         self.project_root = os.path.dirname(os.path.abspath(__file__))
         self.required_files = [
             'main.py',
+            'bot.py',
             'requirements.txt', 
             'Procfile',
             'runtime.txt',
@@ -96,14 +97,14 @@ class CybranceeDeployer:
         """Apply Cybrancee-specific optimizations"""
         print("🔧 Applying Cybrancee optimizations...")
         
-        # Ensure data directories are created in main.py
-        main_py_path = os.path.join(self.project_root, 'main.py')
+        # Ensure data directories are created in bot.py
+        bot_py_path = os.path.join(self.project_root, 'bot.py')
         
-        with open(main_py_path, 'r', encoding='utf-8') as f:
+        with open(bot_py_path, 'r', encoding='utf-8') as f:
             content = f.read()
             
         if 'os.makedirs' not in content:
-            print("⚠️  Consider adding directory creation in main.py")
+            print("⚠️  Consider adding directory creation in bot.py")
             
         print("✅ Cybrancee optimizations applied")
         return True
@@ -0,0 +1 @@
+# Devtools module
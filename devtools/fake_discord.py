@@ -0,0 +1,699 @@
+"""
+Local stand-in for the Discord gateway and REST API
+
+Serves just enough of the HTTP API and the gateway protocol for AlphaBot to
+log in, shard, receive GUILD_CREATE for synthetic guilds, request member
+chunks, resume sessions and send messages - all without a network
+connection. REST routes apply per-route buckets and return the usual
+X-RateLimit-* headers and 429 responses.
+
+Standalone:  python -m devtools.fake_discord --port 8765 --guilds 20 --shards 4
+Then run the bot with DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 and any BOT_TOKEN.
+"""
+from aiohttp import web, WSMsgType
+from typing import Optional, Dict, List
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import re
+import time
+
+DISCORD_EPOCH = 1420070400000
+BOT_USER_ID = 100000000000000001
+APPLICATION_ID = 100000000000000002
+
+def make_snowflake(offset: int, timestamp_ms: Optional[int] = None) -> int:
+    """Build a snowflake with a fixed timestamp so guild -> shard placement is deterministic"""
+    timestamp_ms = timestamp_ms or 1700000000000
+    return ((timestamp_ms - DISCORD_EPOCH) << 22) + offset
+
+def user_payload(user_id: int, name: str, bot: bool = False) -> dict:
+    return {
+        'id': str(user_id),
+        'username': name,
+        'global_name': name,
+        'discriminator': '0',
+        'avatar': None,
+        'bot': bot,
+        'flags': 0
+    }
+
+def member_payload(user_id: int, name: str, roles: List[int] = (), bot: bool = False) -> dict:
+    return {
+        'user': user_payload(user_id, name, bot),
+        'nick': None,
+        'roles': [str(role_id) for role_id in roles],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'deaf': False,
+        'mute': False,
+        'flags': 0
+    }
+
+class FakeGuild:
+    """Synthetic guild state owned by the fake server"""
+
+    def __init__(self, index: int, member_count: int, channel_count: int = 3, role_count: int = 3):
+        # Distinct timestamps spread guilds across shards ((id >> 22) % shard_count)
+        self.id = make_snowflake(0, 1700000000000 + index)
+        self.name = f"Fake Guild {index + 1}"
+        self.roles = [
+            {'id': str(self.id), 'name': '@everyone', 'permissions': '0', 'position': 0, 'color': 0,
+             'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}
+        ]
+        for r in range(role_count):
+            self.roles.append({
+                'id': str(self.id + 1000 + r), 'name': f'role-{r}', 'permissions': '0', 'position': r + 1,
+                'color': 0, 'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0
+            })
+        self.channels = [
+            {'id': str(self.id + 2000 + c), 'name': f'channel-{c}', 'type': 0, 'position': c,
+             'permission_overwrites': [], 'parent_id': None, 'nsfw': False}
+            for c in range(channel_count)
+        ]
+        # Admin role gives the bot full permissions
+        self.roles.append({
+            'id': str(self.id + 999), 'name': 'bot-admin', 'permissions': str(8), 'position': role_count + 1,
+            'color': 0, 'hoist': False, 'managed': True, 'mentionable': False, 'flags': 0
+        })
+        self.members = {
+            BOT_USER_ID: member_payload(BOT_USER_ID, 'AlphaBot', roles=[self.id + 999], bot=True)
+        }
+        for m in range(member_count - 1):
+            user_id = self.id + 100000 + m
+            self.members[user_id] = member_payload(user_id, f'member-{index + 1}-{m}', roles=[self.id + 1000])
+
+    def create_payload(self, include_members: bool) -> dict:
+        members = list(self.members.values()) if include_members else [self.members[BOT_USER_ID]]
+        return {
+            'id': str(self.id),
+            'name': self.name,
+            'owner_id': str(BOT_USER_ID),
+            'member_count': len(self.members),
+            'large': len(self.members) > 250,
+            'unavailable': False,
+            'joined_at': '2024-01-01T00:00:00+00:00',
+            'roles': self.roles,
+            'channels': self.channels,
+            'members': members,
+            'presences': [],
+            'voice_states': [],
+            'threads': [],
+            'stage_instances': [],
+            'guild_scheduled_events': [],
+            'emojis': [],
+            'stickers': [],
+            'features': [],
+            'premium_tier': 0,
+            'preferred_locale': 'en-US',
+            'nsfw_level': 0,
+            'mfa_level': 0,
+            'verification_level': 0,
+            'explicit_content_filter': 0,
+            'default_message_notifications': 0,
+            'system_channel_flags': 0
+        }
+
+class GatewaySession:
+    """One identified shard connection, kept after disconnect so it can be resumed"""
+
+    def __init__(self, session_id: str, shard_id: int, shard_count: int):
+        self.session_id = session_id
+        self.shard_id = shard_id
+        self.shard_count = shard_count
+        self.sequence = 0
+        self.ws: Optional[web.WebSocketResponse] = None
+        self.backlog: List[dict] = []  # dispatched payloads, for replay on RESUME
+
+class FakeDiscord:
+    """aiohttp application implementing the fake REST API and gateway"""
+
+    def __init__(self, guilds: int = 1, members_per_guild: int = 10, shards: int = 1,
+                 rate_limit: int = 5, rate_window: float = 1.0, host: str = '127.0.0.1', port: int = 0,
+                 guild_create_delay: float = 0.0):
+        self.guilds: Dict[int, FakeGuild] = {}
+        for index in range(guilds):
+            guild = FakeGuild(index, members_per_guild)
+            self.guilds[guild.id] = guild
+        self.shards = shards
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.host = host
+        self.port = port
+        self.guild_create_delay = guild_create_delay  # seconds between GUILD_CREATEs after READY, as for large bots
+        self.sessions: Dict[str, GatewaySession] = {}
+        self.identify_count = 0
+        self.resume_count = 0
+        self.request_counts: Dict[str, int] = {}
+        self.rate_limited_count = 0
+        self.sent_messages: List[dict] = []
+        self.last_message_at = 0.0
+        self.interactions: Dict[int, dict] = {}  # interaction id: timings and response messages
+        self.delivery_latencies: List[float] = []  # dispatch -> bot message containing a tracked ID
+        self._tracked: Dict[str, float] = {}  # ID string: dispatch time (perf_counter)
+        self._buckets: Dict[str, list] = {}  # route key: [window_start, used]
+        self._ids = itertools.count(make_snowflake(0, int(time.time() * 1000)))
+        self._session_ids = itertools.count(1)
+        self._runner = None
+        self._tasks = set()
+        self.app = self._build_app()
+
+    # LIFECYCLE
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_base(self) -> str:
+        return f"{self.base_url}/api/v10"
+
+    async def start(self):
+        """Start serving; the bound port is available as self.port afterwards"""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for session in self.sessions.values():
+            if session.ws is not None and not session.ws.closed:
+                await session.ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    @property
+    def gateway_url(self) -> str:
+        return f"ws://{self.host}:{self.port}/gateway"
+
+    def install(self):
+        """Point discord.py's REST client and default gateway at this server"""
+        import discord.gateway
+        import discord.http
+        import yarl
+        discord.http.Route.BASE = self.api_base
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(self.gateway_url)
+
+    @staticmethod
+    def shard_for(guild_id: int, shard_count: int) -> int:
+        return (guild_id >> 22) % shard_count
+
+    # GATEWAY
+    async def dispatch(self, event: str, data: dict, guild_id: Optional[int] = None):
+        """Send a dispatch event to the shard owning guild_id (or every session)"""
+        for session in list(self.sessions.values()):
+            if guild_id is not None and self.shard_for(guild_id, session.shard_count) != session.shard_id:
+                continue
+            await self._send_dispatch(session, event, data)
+
+    # EVENT INJECTION
+    def track(self, object_id: int):
+        """Record the latency until the bot next sends a message mentioning object_id"""
+        self._tracked[str(object_id)] = time.perf_counter()
+
+    async def send_message_create(self, guild: FakeGuild, channel_id: int, author_id: int, content: str) -> dict:
+        message = {
+            'id': str(next(self._ids)),
+            'channel_id': str(channel_id),
+            'guild_id': str(guild.id),
+            'author': guild.members[author_id]['user'],
+            'member': {key: value for key, value in guild.members[author_id].items() if key != 'user'},
+            'content': content,
+            'timestamp': '2024-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+            'flags': 0,
+            'components': []
+        }
+        await self.dispatch('MESSAGE_CREATE', message, guild_id=guild.id)
+        return message
+
+    async def send_message_delete(self, guild: FakeGuild, message: dict):
+        self.track(int(message['id']))
+        await self.dispatch('MESSAGE_DELETE', {
+            'id': message['id'], 'channel_id': message['channel_id'], 'guild_id': str(guild.id)
+        }, guild_id=guild.id)
+
+    async def send_member_join(self, guild: FakeGuild, name: str) -> int:
+        user_id = next(self._ids)
+        guild.members[user_id] = member_payload(user_id, name)
+        self.track(user_id)
+        await self.dispatch('GUILD_MEMBER_ADD', {**guild.members[user_id], 'guild_id': str(guild.id)}, guild_id=guild.id)
+        return user_id
+
+    async def invoke_command(self, guild: FakeGuild, channel_id: int, user_id: int, name: str,
+                             options: List[dict] = (), resolved: Optional[dict] = None) -> int:
+        """Dispatch a slash command interaction; returns the interaction ID"""
+        return await self._dispatch_interaction(guild, channel_id, user_id, 2, {
+            'id': str(next(self._ids)),
+            'name': name,
+            'type': 1,
+            'options': list(options),
+            'resolved': resolved or {}
+        })
+
+    async def click_button(self, interaction_id: int, label: str) -> int:
+        """Press a button on the message an earlier interaction responded with"""
+        record = self.interactions[interaction_id]
+        message = record['message']
+        for row in message.get('components', []):
+            for component in row.get('components', []):
+                if component.get('label') == label:
+                    return await self._dispatch_interaction(
+                        record['guild'], record['channel_id'], record['user_id'], 3,
+                        {'custom_id': component['custom_id'], 'component_type': 2}, message=message
+                    )
+        raise KeyError(f"No button labelled {label!r} on interaction {interaction_id}")
+
+    async def _dispatch_interaction(self, guild: FakeGuild, channel_id: int, user_id: int, interaction_type: int,
+                                    data: dict, message: Optional[dict] = None) -> int:
+        interaction_id = next(self._ids)
+        channel = next(c for c in guild.channels if int(c['id']) == channel_id)
+        payload = {
+            'id': str(interaction_id),
+            'application_id': str(APPLICATION_ID),
+            'type': interaction_type,
+            'token': f"token-{interaction_id}",
+            'version': 1,
+            'guild_id': str(guild.id),
+            'channel_id': str(channel_id),
+            'channel': {**channel, 'guild_id': str(guild.id)},
+            'member': {**guild.members[user_id], 'permissions': '8'},
+            'data': data,
+            'app_permissions': '8',
+            'locale': 'en-US',
+            'guild_locale': 'en-US',
+            'entitlements': [],
+            'authorizing_integration_owners': {},
+            'context': 0,
+            'attachment_size_limit': 8 * 1024 * 1024
+        }
+        if message is not None:
+            payload['message'] = message
+        self.interactions[interaction_id] = {
+            'guild': guild,
+            'channel_id': channel_id,
+            'user_id': user_id,
+            'dispatched': time.perf_counter(),
+            'responded': None,  # first callback (ack latency)
+            'last_response': None,  # latest callback, followup or edit
+            'message': None
+        }
+        await self.dispatch('INTERACTION_CREATE', payload, guild_id=guild.id)
+        return interaction_id
+
+    async def _send_dispatch(self, session: GatewaySession, event: str, data: dict):
+        session.sequence += 1
+        payload = {'op': 0, 't': event, 's': session.sequence, 'd': data}
+        session.backlog.append(payload)
+        if session.ws is not None and not session.ws.closed:
+            await session.ws.send_str(json.dumps(payload))
+
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        await ws.send_str(json.dumps({'op': 10, 'd': {'heartbeat_interval': 41250}}))
+
+        session = None
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            op = payload.get('op')
+            data = payload.get('d')
+
+            if op == 1:
+                await ws.send_str(json.dumps({'op': 11}))
+            elif op == 2:
+                session = await self._identify(ws, data)
+            elif op == 6:
+                session = await self._resume(ws, data)
+            elif op == 8:
+                await self._request_members(session, data)
+
+        if session is not None:
+            session.ws = None
+            # Like Discord: closing with 1000/1001 ends the session, other codes keep it resumable
+            if ws.close_code in (1000, 1001):
+                self.sessions.pop(session.session_id, None)
+        return ws
+
+    async def _identify(self, ws: web.WebSocketResponse, data: dict) -> GatewaySession:
+        self.identify_count += 1
+        shard_id, shard_count = data.get('shard') or [0, 1]
+        session = GatewaySession(f"fake-session-{next(self._session_ids)}", shard_id, shard_count)
+        session.ws = ws
+        self.sessions[session.session_id] = session
+
+        owned = [guild for guild in self.guilds.values() if self.shard_for(guild.id, shard_count) == shard_id]
+        await self._send_dispatch(session, 'READY', {
+            'v': 10,
+            'user': user_payload(BOT_USER_ID, 'AlphaBot', bot=True),
+            'guilds': [{'id': str(guild.id), 'unavailable': True} for guild in owned],
+            'session_id': session.session_id,
+            'resume_gateway_url': f"ws://{self.host}:{self.port}/gateway",
+            'shard': [shard_id, shard_count],
+            'application': {'id': str(APPLICATION_ID), 'flags': 0}
+        })
+        if self.guild_create_delay:
+            # Keep handling this connection (heartbeats, member requests) while the guilds stream in
+            task = asyncio.create_task(self._send_guilds(session, owned))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            await self._send_guilds(session, owned)
+        return session
+
+    async def _send_guilds(self, session: GatewaySession, guilds: List[FakeGuild]):
+        # Members beyond the bot arrive via GUILD_MEMBERS_CHUNK, as for large guilds
+        for guild in guilds:
+            if self.guild_create_delay:
+                await asyncio.sleep(self.guild_create_delay)
+            await self._send_dispatch(session, 'GUILD_CREATE', guild.create_payload(include_members=False))
+
+    async def _resume(self, ws: web.WebSocketResponse, data: dict) -> Optional[GatewaySession]:
+        session = self.sessions.get(data.get('session_id'))
+        if session is None:
+            # op 9 INVALID_SESSION, not resumable
+            await ws.send_str(json.dumps({'op': 9, 'd': False}))
+            return None
+
+        self.resume_count += 1
+        session.ws = ws
+        last_seen = data.get('seq') or 0
+        for payload in session.backlog:
+            if payload['s'] > last_seen:
+                await ws.send_str(json.dumps(payload))
+        await self._send_dispatch(session, 'RESUMED', {})
+        return session
+
+    async def _request_members(self, session: Optional[GatewaySession], data: dict):
+        if session is None:
+            return
+        guild = self.guilds.get(int(data['guild_id']))
+        if guild is None:
+            return
+        if data.get('user_ids'):
+            wanted = {int(user_id) for user_id in data['user_ids']}
+            members = [guild.members[user_id] for user_id in wanted if user_id in guild.members]
+        else:
+            members = list(guild.members.values())
+
+        chunks = [members[i:i + 1000] for i in range(0, len(members), 1000)] or [[]]
+        for index, chunk in enumerate(chunks):
+            await self._send_dispatch(session, 'GUILD_MEMBERS_CHUNK', {
+                'guild_id': str(guild.id),
+                'members': chunk,
+                'chunk_index': index,
+                'chunk_count': len(chunks),
+                'nonce': data.get('nonce')
+            })
+
+    # REST
+    def _rate_limit(self, request: web.Request, key: str) -> Optional[web.Response]:
+        """Per-route bucket; returns a 429 response when the bucket is exhausted"""
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(key, [now, 0])
+        if now - bucket[0] >= self.rate_window:
+            bucket[0], bucket[1] = now, 0
+        bucket[1] += 1
+        reset_after = max(self.rate_window - (now - bucket[0]), 0.001)
+        request['ratelimit_headers'] = {
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': str(max(self.rate_limit - bucket[1], 0)),
+            'X-RateLimit-Reset': f"{time.time() + reset_after:.3f}",
+            'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            'X-RateLimit-Bucket': key
+        }
+        if bucket[1] > self.rate_limit:
+            self.rate_limited_count += 1
+            request['ratelimit_headers']['Retry-After'] = f"{reset_after:.3f}"
+            return self._json(
+                request,
+                {'message': 'You are being rate limited.', 'retry_after': reset_after, 'global': False},
+                status=429
+            )
+        return None
+
+    def _json(self, request: web.Request, data, status: int = 200) -> web.Response:
+        # discord.py only decodes JSON when the content type is exactly 'application/json' (no charset)
+        headers = {'Content-Type': 'application/json', **request.get('ratelimit_headers', {})}
+        return web.Response(body=json.dumps(data).encode('utf-8'), status=status, headers=headers)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        resource = request.match_info.route.resource
+        route_key = f"{request.method} {resource.canonical if resource else request.path}"
+        self.request_counts[route_key] = self.request_counts.get(route_key, 0) + 1
+        if request.path.startswith('/api/') and request.method != 'GET':
+            # Interaction callbacks/webhooks are limited per token, like webhooks on Discord
+            major_id = (request.match_info.get('channel_id') or request.match_info.get('guild_id')
+                        or request.match_info.get('token') or '')
+            limited = self._rate_limit(request, f"{route_key}:{major_id}")
+            if limited is not None:
+                return limited
+        return await handler(request)
+
+    def _build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        api = '/api/v10'
+        app.router.add_get('/gateway', self._gateway)
+        app.router.add_get(api + '/users/@me', self._get_me)
+        app.router.add_get(api + '/oauth2/applications/@me', self._get_application)
+        app.router.add_get(api + '/gateway/bot', self._get_gateway_bot)
+        app.router.add_get(api + '/gateway', self._get_gateway_bot)
+        app.router.add_put(api + '/applications/{application_id}/commands', self._put_commands)
+        app.router.add_put(api + '/applications/{application_id}/guilds/{guild_id}/commands', self._put_commands)
+        app.router.add_post(api + '/channels/{channel_id}/messages', self._post_message)
+        app.router.add_patch(api + '/channels/{channel_id}/messages/{message_id}', self._post_message)
+        app.router.add_post(api + '/users/@me/channels', self._create_dm)
+        app.router.add_patch(api + '/guilds/{guild_id}/members/{user_id}', self._edit_member)
+        app.router.add_put(api + '/guilds/{guild_id}/members/{user_id}/roles/{role_id}', self._no_content)
+        app.router.add_delete(api + '/guilds/{guild_id}/members/{user_id}/roles/{role_id}', self._no_content)
+        app.router.add_post(api + '/guilds/{guild_id}/channels', self._create_channel)
+        app.router.add_post(api + '/interactions/{interaction_id}/{token}/callback', self._interaction_callback)
+        app.router.add_post(api + '/webhooks/{application_id}/{token}', self._webhook_message)
+        app.router.add_patch(api + '/webhooks/{application_id}/{token}/messages/{message_id}', self._webhook_message)
+        app.router.add_get(api + '/webhooks/{application_id}/{token}/messages/{message_id}', self._webhook_message)
+        app.router.add_route('*', api + '/{tail:.*}', self._fallback)
+        return app
+
+    async def _get_me(self, request):
+        return self._json(request, user_payload(BOT_USER_ID, 'AlphaBot', bot=True))
+
+    async def _get_application(self, request):
+        return self._json(request, {
+            'id': str(APPLICATION_ID),
+            'name': 'AlphaBot',
+            'icon': None,
+            'description': '',
+            'bot_public': True,
+            'bot_require_code_grant': False,
+            'verify_key': '0' * 64,
+            'owner': user_payload(BOT_USER_ID + 10, 'owner'),
+            'flags': 0,
+            'interactions_endpoint_url': None
+        })
+
+    async def _get_gateway_bot(self, request):
+        return self._json(request, {
+            'url': self.gateway_url,
+            'shards': self.shards,
+            'session_start_limit': {'total': 1000, 'remaining': 1000 - self.identify_count,
+                                    'reset_after': 86400000, 'max_concurrency': 1}
+        })
+
+    async def _put_commands(self, request):
+        commands = await request.json()
+        for command in commands:
+            command.setdefault('id', str(next(self._ids)))
+            command.setdefault('application_id', str(APPLICATION_ID))
+            command.setdefault('version', str(next(self._ids)))
+            command.setdefault('default_member_permissions', None)
+            command.setdefault('type', 1)
+        return self._json(request, commands)
+
+    async def _post_message(self, request):
+        body = await request.json() if request.can_read_body else {}
+        message = {
+            'id': request.match_info.get('message_id') or str(next(self._ids)),
+            'channel_id': request.match_info['channel_id'],
+            'author': user_payload(BOT_USER_ID, 'AlphaBot', bot=True),
+            'content': body.get('content') or '',
+            'timestamp': '2024-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': body.get('embeds') or [],
+            'pinned': False,
+            'type': 0,
+            'flags': 0,
+            'components': []
+        }
+        self.sent_messages.append(message)
+        self.last_message_at = time.perf_counter()
+        self._check_tracked(body)
+        return self._json(request, message)
+
+    async def _create_dm(self, request):
+        body = await request.json()
+        return self._json(request, {
+            'id': str(next(self._ids)),
+            'type': 1,
+            'recipients': [user_payload(int(body['recipient_id']), f"user-{body['recipient_id']}")]
+        })
+
+    async def _edit_member(self, request):
+        body = await request.json()
+        guild = self.guilds.get(int(request.match_info['guild_id']))
+        member = guild.members.get(int(request.match_info['user_id'])) if guild else None
+        if member is None:
+            return self._json(request, {'message': 'Unknown Member', 'code': 10007}, status=404)
+        if 'roles' in body:
+            member['roles'] = [str(role_id) for role_id in body['roles']]
+        if 'nick' in body:
+            member['nick'] = body['nick']
+        return self._json(request, {**member, 'guild_id': str(guild.id)})
+
+    async def _create_channel(self, request):
+        body = await request.json()
+        guild = self.guilds.get(int(request.match_info['guild_id']))
+        channel = {
+            'id': str(next(self._ids)),
+            'guild_id': request.match_info['guild_id'],
+            'name': body.get('name', 'channel'),
+            'type': body.get('type', 0),
+            'position': len(guild.channels) if guild else 0,
+            'permission_overwrites': body.get('permission_overwrites', []),
+            'parent_id': body.get('parent_id'),
+            'topic': body.get('topic'),
+            'nsfw': False
+        }
+        if guild:
+            guild.channels.append(channel)
+            await self.dispatch('CHANNEL_CREATE', channel, guild_id=guild.id)
+        return self._json(request, channel, status=201)
+
+    def _check_tracked(self, body: dict):
+        if not self._tracked:
+            return
+        now = time.perf_counter()
+        for found in re.findall(r'\d{15,21}', json.dumps(body)):
+            dispatched = self._tracked.pop(found, None)
+            if dispatched is not None:
+                self.delivery_latencies.append(now - dispatched)
+
+    def _message_from_body(self, body: dict, channel_id) -> dict:
+        return {
+            'id': str(next(self._ids)),
+            'channel_id': str(channel_id),
+            'author': user_payload(BOT_USER_ID, 'AlphaBot', bot=True),
+            'content': body.get('content') or '',
+            'timestamp': '2024-01-01T00:00:00+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': body.get('embeds') or [],
+            'components': body.get('components') or [],
+            'pinned': False,
+            'type': 20,
+            'flags': body.get('flags') or 0,
+            'application_id': str(APPLICATION_ID)
+        }
+
+    def _record_response(self, interaction_id: int, message: Optional[dict] = None):
+        record = self.interactions.get(interaction_id)
+        if record is None:
+            return
+        now = time.perf_counter()
+        record['responded'] = record['responded'] or now
+        record['last_response'] = now
+        if message is not None and message.get('components'):
+            record['message'] = message
+
+    async def _interaction_callback(self, request):
+        interaction_id = int(request.match_info['interaction_id'])
+        try:
+            body = await request.json()
+        except (ValueError, UnicodeDecodeError):
+            body = {}  # multipart (file uploads)
+        record = self.interactions.get(interaction_id)
+        channel_id = record['channel_id'] if record else 0
+        message = self._message_from_body(body.get('data') or {}, channel_id)
+        self._record_response(interaction_id, message)
+        if record is not None:
+            record['original'] = message
+        return self._json(request, {
+            'interaction': {
+                'id': str(interaction_id),
+                'type': 2,
+                'response_message_id': message['id'],
+                'response_message_loading': body.get('type') == 5,
+                'response_message_ephemeral': bool((body.get('data') or {}).get('flags', 0) & 64)
+            },
+            'resource': {'type': body.get('type', 4), 'message': message}
+        })
+
+    async def _webhook_message(self, request):
+        """Interaction followups and edits of the original response"""
+        token = request.match_info['token']
+        interaction_id = int(token[len('token-'):]) if token.startswith('token-') else 0
+        try:
+            body = await request.json() if request.can_read_body else {}
+        except (ValueError, UnicodeDecodeError):
+            body = {}
+        record = self.interactions.get(interaction_id)
+        message = self._message_from_body(body, record['channel_id'] if record else 0)
+        if request.match_info.get('message_id') == '@original' and record and record.get('original'):
+            message['id'] = record['original']['id']
+        self._record_response(interaction_id, message)
+        return self._json(request, message)
+
+    async def _no_content(self, request):
+        return web.Response(status=204, headers=request.get('ratelimit_headers', {}))
+
+    async def _fallback(self, request):
+        logging.debug(f"Fake Discord: unhandled {request.method} {request.path}")
+        return self._json(request, {})
+
+async def _serve(args):
+    server = FakeDiscord(guilds=args.guilds, members_per_guild=args.members, shards=args.shards,
+                         rate_limit=args.rate_limit, port=args.port, guild_create_delay=args.guild_create_delay)
+    await server.start()
+    print(f"Fake Discord listening on {server.base_url}")
+    print(f"Run the bot with DISCORD_API_BASE={server.api_base} DISCORD_GATEWAY_URL={server.gateway_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Discord gateway and REST API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--guilds', type=int, default=5)
+    parser.add_argument('--members', type=int, default=50, help="members per guild")
+    parser.add_argument('--shards', type=int, default=1, help="recommended shard count reported by /gateway/bot")
+    parser.add_argument('--rate-limit', type=int, default=5, help="requests per second per route bucket")
+    parser.add_argument('--guild-create-delay', type=float, default=0.0, help="seconds between GUILD_CREATEs after READY")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
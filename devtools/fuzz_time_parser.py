@@ -0,0 +1,176 @@
+"""
+Fuzz-style correctness checks for utils/time_parser.py
+
+1. Random inputs built from time-like fragments are fed to both the parser
+   and the previous /time and /announce parsing code (strptime based, kept
+   below verbatim). Whatever the old code accepted must parse to the same
+   wall-clock time / timestamp; nothing may raise anything but ValueError.
+2. Generated expressions in the new formats (12h, relative, day words,
+   weekdays, ISO 8601 with offsets) are checked against values computed
+   independently with datetime arithmetic.
+
+Usage: python -m devtools.fuzz_time_parser [--iterations 100000] [--seed 1]
+"""
+from datetime import date, datetime, timedelta, timezone
+import argparse
+import random
+import re
+import sys
+import pytz
+
+from modules.discord_management.scheduler import parse_schedule_time
+from utils.time_parser import RELATIVE_UNITS, WEEKDAYS, parse_spec, parse_time
+
+ZONES = [pytz.utc, pytz.timezone('America/New_York'), pytz.timezone('Asia/Tokyo'),
+         pytz.timezone('Asia/Kolkata'), pytz.timezone('Pacific/Chatham'), pytz.timezone('Europe/London')]
+FRAGMENTS = ['0', '1', '2', '9', '12', '23', '24', '59', '60', '2024', '-', ':', ' ', '  ', 't', 'z', '+', '.',
+             'am', 'pm', 'in', 'h', 'm', 'd', 'tomorrow', 'today', 'friday', 'next', 'at', 'noon', 'x', '\t']
+
+# PREVIOUS BEHAVIOUR
+def legacy_get_time(text: str, today: date) -> datetime:
+    """Naive datetime the old /time handler produced (today = the date it combined with)"""
+    if len(text.split()) == 1:
+        time_obj = datetime.strptime(text, "%H:%M")
+        return datetime.combine(today, time_obj.time())
+    return datetime.strptime(text, "%Y-%m-%d %H:%M")
+
+LEGACY_RELATIVE = re.compile(r'^in\s+(\d+)\s*(s|m|h|d)$', re.IGNORECASE)
+
+def legacy_schedule_time(text: str, now: float):
+    text = text.strip()
+    relative = LEGACY_RELATIVE.match(text)
+    if relative:
+        return now + int(relative.group(1)) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[relative.group(2).lower()]
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+# CHECKS
+class Fuzzer:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.failures = []
+        self.compared = 0
+
+    def fail(self, message: str):
+        if len(self.failures) < 50:
+            self.failures.append(message)
+
+    def random_now(self) -> datetime:
+        return datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=self.rng.randrange(10 * 365 * 86400))
+
+    def random_text(self) -> str:
+        if self.rng.random() < 0.5:
+            # Mostly well-formed legacy inputs with random digits
+            return self.rng.choice([
+                f"{self.rng.randrange(30)}:{self.rng.randrange(70):0{self.rng.choice([1, 2])}d}",
+                f"{self.rng.randrange(1990, 2040)}-{self.rng.randrange(15)}-{self.rng.randrange(35)} "
+                f"{self.rng.randrange(26)}:{self.rng.randrange(62):02d}",
+                f"in {self.rng.randrange(1000)}{self.rng.choice('smhdSMHD')}",
+                f"in {self.rng.randrange(1000)} {self.rng.choice('smhd')}"
+            ])
+        return ''.join(self.rng.choice(FRAGMENTS) for _ in range(self.rng.randrange(1, 8)))
+
+    def check_against_legacy(self, text: str):
+        now = self.random_now()
+        tz = self.rng.choice(ZONES)
+        try:
+            parsed = parse_time(text, tz, now)
+        except ValueError:
+            parsed = None
+        except Exception as e:
+            self.fail(f"{text!r}: raised {type(e).__name__}: {e}")
+            return
+
+        # /time: the old code used the server date; compare using the user's date
+        try:
+            expected = legacy_get_time(text, now.astimezone(tz).date())
+        except ValueError:
+            expected = None
+        if expected is not None:
+            self.compared += 1
+            if parsed is None or parsed.replace(tzinfo=None) != expected:
+                self.fail(f"/time {text!r} in {tz}: legacy {expected}, parser {parsed}")
+
+        # /announce send_at
+        legacy = legacy_schedule_time(text, now.timestamp())
+        if legacy is not None:
+            self.compared += 1
+            new = parse_schedule_time(text, now.timestamp())
+            if new is None or abs(new - legacy) > 1e-6:
+                self.fail(f"send_at {text!r}: legacy {legacy}, parser {new}")
+
+    def check_new_formats(self):
+        now = self.random_now()
+        tz = self.rng.choice(ZONES)
+        local_now = now.astimezone(tz)
+        today = local_now.date()
+        hour, minute = self.rng.randrange(24), self.rng.randrange(60)
+        twelve = f"{hour % 12 or 12}:{minute:02d}{self.rng.choice(['', ' '])}{'pm' if hour >= 12 else 'am'}"
+        cases = []
+
+        # 12-hour clock on today's date
+        cases.append((twelve, lambda r: r.date() == today and (r.hour, r.minute) == (hour, minute)
+                      or self.dst_gap(r, today, hour, minute)))
+        # Relative offsets
+        amount, unit = self.rng.randrange(500), self.rng.choice(list(RELATIVE_UNITS))
+        cases.append((f"in {amount}{self.rng.choice(['', ' '])}{unit}",
+                      lambda r: r == now + timedelta(seconds=amount * RELATIVE_UNITS[unit])))
+        # Day words
+        offset, word = self.rng.choice([(0, 'today'), (1, 'tomorrow'), (1, 'tmrw'), (-1, 'yesterday')])
+        cases.append((f"{word} {twelve}", lambda r: r.date() == today + timedelta(days=offset)
+                      or self.dst_gap(r, today + timedelta(days=offset), hour, minute)))
+        cases.append((f"{twelve} {word}", lambda r: r.date() == today + timedelta(days=offset)
+                      or self.dst_gap(r, today + timedelta(days=offset), hour, minute)))
+        # Weekdays: always in the future, within a week (next: 1-7 days ahead)
+        name = self.rng.choice(list(WEEKDAYS))
+        prefix = self.rng.choice(['', 'next '])
+        cases.append((f"{prefix}{name} {hour:02d}:{minute:02d}",
+                      lambda r: r.weekday() == WEEKDAYS[name] and timedelta(0) < r - local_now <= timedelta(days=7, hours=2)
+                      or self.dst_gap(r, r.date(), hour, minute)))
+        # ISO 8601 with an explicit offset is absolute, regardless of the user's timezone
+        instant = now + timedelta(minutes=self.rng.randrange(-10000, 10000))
+        offset_minutes = self.rng.randrange(-12 * 60, 14 * 60 + 1, 15)
+        shown = instant.astimezone(timezone(timedelta(minutes=offset_minutes))).replace(second=0, microsecond=0)
+        text = shown.isoformat().replace('+00:00', self.rng.choice(['Z', '+00:00']))
+        cases.append((text, lambda r: r == shown))
+
+        for text, check in cases:
+            try:
+                result = parse_time(text, tz, now)
+            except Exception as e:
+                self.fail(f"{text!r} in {tz}: raised {type(e).__name__}: {e}")
+                continue
+            if not check(result):
+                self.fail(f"{text!r} in {tz} at {now}: got {result}")
+            if parse_time(text.upper(), tz, now) != result:
+                self.fail(f"{text!r}: case sensitive")
+
+    @staticmethod
+    def dst_gap(result: datetime, day: date, hour: int, minute: int) -> bool:
+        """Wall-clock times inside a DST transition may shift by up to an hour"""
+        wanted = datetime.combine(day, datetime.min.time()).replace(hour=hour, minute=minute)
+        return abs(result.replace(tzinfo=None) - wanted) <= timedelta(hours=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz utils/time_parser.py against the previous parsing code")
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    fuzzer = Fuzzer(args.seed)
+    for _ in range(args.iterations):
+        fuzzer.check_against_legacy(fuzzer.random_text())
+        if fuzzer.rng.random() < 0.2:
+            fuzzer.check_new_formats()
+
+    info = parse_spec.cache_info()
+    print(f"{args.iterations} inputs, {fuzzer.compared} compared with the previous parser, "
+          f"cache {info.hits} hits / {info.misses} misses")
+    for failure in fuzzer.failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if fuzzer.failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,95 +1,40 @@
-import discord
-from discord.ext import commands
-import asyncio
-import logging
+# Entry point: kept light so --help and the token check don't wait for
+# discord.py and the cogs to import (the bot itself lives in bot.py)
+from utils.startup_profile import startup_profile
+import argparse
 from config.config import Config
-from modules.discord_management.management import DiscordManagement
-from modules.time_management.timer import TimeManagement
-from modules.logs.logger import LogsModule
-from modules.core.info import BotInfo
-import os
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data/bot.log'),
-        logging.StreamHandler()
-    ]
-)
-
-class AlphaBot(commands.Bot):
-    def __init__(self):
-        intents = discord.Intents.all()  # Enable all intents for comprehensive functionality
-        super().__init__(
-            command_prefix=Config.PREFIX,
-            intents=intents,
-            description="Alpha Discord Bot - Professional Discord Management Solution"
-        )
-        
-    async def setup_hook(self):
-        """Load all cogs when bot starts"""
-        try:
-            await self.add_cog(DiscordManagement(self))
-            await self.add_cog(TimeManagement(self))
-            await self.add_cog(LogsModule(self))
-            await self.add_cog(BotInfo(self))
-            
-            # Sync slash commands
-            synced = await self.tree.sync()
-            print(f"Synced {len(synced)} slash commands")
-            
-        except Exception as e:
-            logging.error(f"Error loading cogs: {e}")
-
-    async def on_ready(self):
-        """Called when bot is ready"""
-        print(f'{self.user} has connected to Discord!')
-        print(f'Bot is in {len(self.guilds)} guilds')
-        
-        # Set bot status
-        await self.change_presence(
-            activity=discord.Activity(
-                type=discord.ActivityType.watching,
-                name="over the server | Slash Commands Only"
-            )
-        )
-        
-        # Create data directories if they don't exist
-        os.makedirs('data/logs', exist_ok=True)
-        os.makedirs('data/timers', exist_ok=True)
-        os.makedirs('data/users', exist_ok=True)
-
-    async def on_command_error(self, ctx, error):
-        """Global error handler"""
-        if isinstance(error, commands.CommandNotFound):
-            return
-        elif isinstance(error, commands.MissingPermissions):
-            await ctx.send("❌ You don't have permission to use this command.")
-        elif isinstance(error, commands.MissingRequiredArgument):
-            await ctx.send(f"❌ Missing required argument: {error.param}")
-        else:
-            logging.error(f"Unhandled error: {error}")
-            await ctx.send("❌ An unexpected error occurred. Please try again later.")
 
 def main():
     """Main function to run the bot"""
+    parser = argparse.ArgumentParser(description="Alpha Discord Bot")
+    parser.add_argument('--clusters', type=int, default=Config.CLUSTER_COUNT,
+                        help="number of worker processes to spread shards across (1 = single process)")
+    parser.add_argument('--shards', type=int, default=Config.SHARD_COUNT or None,
+                        help="total shard count (default: Discord's recommendation)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print an import and initialization time breakdown once ready, then exit")
+    args = parser.parse_args()
+    
     if not Config.TOKEN:
         print("❌ Bot token not found! Please set your bot token in config/config.py")
         return
     
-    bot = AlphaBot()
+    if args.clusters > 1:
+        from bot import apply_api_overrides, configure_logging
+        from utils.cluster import launch_clusters
+        apply_api_overrides()
+        launcher_listener = configure_logging()
+        try:
+            launch_clusters(Config.TOKEN, args.shards, args.clusters)
+        finally:
+            launcher_listener.stop()
+        return
     
-    try:
-        bot.run(Config.TOKEN)
-    except discord.LoginFailure:
-        print("❌ Invalid bot token provided!")
-    except KeyboardInterrupt:
-        print("\n👋 Bot shutting down...")
-    except Exception as e:
-        logging.error(f"Fatal error: {e}")
+    if args.profile_startup:
+        startup_profile.enable_import_timing()
+    with startup_profile.phase("import bot"):
+        from bot import run_bot
+    run_bot(shard_count=args.shards, profile_startup=args.profile_startup)
 
 if __name__ == "__main__":
     main()
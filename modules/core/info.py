@@ -1,36 +1,90 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from utils.user_utils import EmbedBuilder
-from config.config import Config
+from utils.config_service import config_service
+from utils.metrics import metrics
+from utils.profiler import ProfilerBusy, profiler
+from utils.stats import bot_stats
+from utils.embed_templates import embed_templates
 from version import __version__, get_version_info
-from datetime import datetime
+import logging
+import os
 
 class BotInfo(commands.Cog):
     """Core information and help commands for the bot"""
     
+    REQUIRED_INTENTS = ('guilds',)
+    
     def __init__(self, bot):
         self.bot = bot
+    
+    async def cog_load(self):
+        """Start sampling heartbeat latency"""
+        self.sample_latency.start()
+    
+    async def cog_unload(self):
+        self.sample_latency.cancel()
+    
+    @tasks.loop(seconds=30)
+    async def sample_latency(self):
+        """Record each shard's heartbeat latency for percentile reporting"""
+        for _, latency in self.bot.latencies:
+            bot_stats.record_latency(latency)
+    
+    # STATS MAINTENANCE
+    @commands.Cog.listener()
+    async def on_ready(self):
+        bot_stats.refresh(self.bot.guilds)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        bot_stats.guild_joined(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        bot_stats.guild_left(guild)
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        bot_stats.member_joined()
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        bot_stats.member_left()
+
+    def template_key(self):
+        """Templates depend on the version and the bot's avatar (used in footers)"""
+        return (__version__, self.bot.user.display_avatar.url if self.bot.user else None)
 
     @app_commands.command(name="help", description="Show bot help and command information")
     async def help_command(self, interaction: discord.Interaction):
         """Display comprehensive help information"""
         
+        embed = embed_templates.get('help', self.build_help_embed, self.template_key())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    def build_help_embed(self) -> discord.Embed:
+        """Build the static help embed"""
+        
         embed = discord.Embed(
             title="🤖 Alpha Discord Bot - Help & Commands",
             description=f"**Version:** {__version__} | **Professional Discord Management Solution**",
-            color=Config.COLORS['primary']
+            color=config_service.current.colors['primary']
         )
         
         # Discord Management Commands
         embed.add_field(
             name="🎛️ Discord Management",
             value=(
-                "`/announce <message> [channel]` - Send professional announcements\n"
+                "`/announce <message> [channel] [extra_channels] [send_at]` - Send or schedule announcements\n"
+                "`/announce-scheduled` / `/announce-cancel <job_id>` - Manage scheduled announcements\n"
                 "`/dm <user> <message>` - Direct message a user via bot\n"
                 "`/mass-dm <role> <message>` - Message all users with a role\n"
                 "`/add-role <user> <role>` - Add role to user (by display name)\n"
-                "`/remove-role <user> <role>` - Remove role from user"
+                "`/remove-role <user> <role>` - Remove role from user\n"
+                "`/bulk-add-role <roles> [users] [source_role] [csv_file]` - Add roles to many users\n"
+                "`/bulk-remove-role <roles> [users] [source_role] [csv_file]` - Remove roles from many users"
             ),
             inline=False
         )
@@ -41,10 +95,11 @@ class BotInfo(commands.Cog):
             value=(
                 "`/set-timezone <timezone>` - Set your personal timezone\n"
                 "`/time [timezone] [time]` - Get current time or convert times\n"
-                "`/list-timezones` - Show common timezone options\n"
+                "`/list-timezones` - Browse timezones by region\n"
                 "`/clockin` - Start a work session\n"
                 "`/clockout` - End your work session\n"
-                "`/status` - Check your current clock status"
+                "`/status` - Check your current clock status\n"
+                "`/on-shift` - List members clocked in on this server (admin)"
             ),
             inline=False
         )
@@ -54,6 +109,7 @@ class BotInfo(commands.Cog):
             name="📋 Server Logging",
             value=(
                 "`/setup-logs` - Automatically set up all logging channels\n"
+                "`/setup-logs-all` - Set up logging in every server (owner only)\n"
                 "`/log-status` - Check current logging configuration"
             ),
             inline=False
@@ -65,7 +121,10 @@ class BotInfo(commands.Cog):
             value=(
                 "`/help` - Show this help message\n"
                 "`/info` - Show detailed bot information\n"
-                "`/version` - Show version and changelog"
+                "`/version` - Show version and changelog\n"
+                "`/metrics [kind]` - Show latency metrics (owner only)\n"
+                "`/profile [mode] [seconds]` - Profile the running bot (owner only)\n"
+                "`/reload <cog>` - Reload a module's package without restarting; utils/config need a restart (owner only)"
             ),
             inline=False
         )
@@ -87,36 +146,49 @@ class BotInfo(commands.Cog):
             icon_url=self.bot.user.display_avatar.url if self.bot.user else None
         )
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return embed
 
     @app_commands.command(name="info", description="Show detailed bot information and statistics")
     async def show_info(self, interaction: discord.Interaction):
         """Display detailed bot information"""
         
-        version_info = get_version_info()
-        
-        embed = discord.Embed(
-            title="🤖 Alpha Discord Bot - Information",
-            description=version_info["description"],
-            color=Config.COLORS['info']
-        )
+        # Cluster totals come over IPC (up to 2 s): acknowledge first so the 3 second window can't pass
+        deferred = self.bot.cluster is not None
+        if deferred:
+            await interaction.response.defer(ephemeral=True, thinking=True)
         
-        # Bot Statistics
-        total_commands = len([cmd for cmd in self.bot.tree.walk_commands()])
-        total_guilds = len(self.bot.guilds)
-        total_users = sum(guild.member_count or 0 for guild in self.bot.guilds)
+        # Bot Statistics (aggregated across every shard and cluster), patched into the static template
+        stats = await self.bot.global_stats()
         
-        embed.add_field(
+        embed = embed_templates.get('info', self.build_info_embed, self.template_key()).with_field(
+            0,
             name="📊 Statistics",
             value=(
-                f"**Servers:** {total_guilds}\n"
-                f"**Users:** {total_users:,}\n"
-                f"**Commands:** {total_commands}\n"
-                f"**Uptime:** <t:{int(datetime.now().timestamp())}:R>"
+                f"**Servers:** {stats['guilds']}\n"
+                f"**Users:** {stats['users']:,}\n"
+                f"**Shards:** {stats['shards']} ({stats['clusters']} cluster(s))\n"
+                f"**Commands:** {bot_stats.command_count}\n"
+                f"**Uptime:** {bot_stats.uptime_text()} (since <t:{int(bot_stats.started_at.timestamp())}:R>)"
             ),
             inline=True
         )
         
+        if deferred:
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    def build_info_embed(self) -> discord.Embed:
+        """Build the static part of the info embed (statistics are added per request)"""
+        
+        version_info = get_version_info()
+        
+        embed = discord.Embed(
+            title="🤖 Alpha Discord Bot - Information",
+            description=version_info["description"],
+            color=config_service.current.colors['info']
+        )
+        
         # Version Information
         embed.add_field(
             name="🏷️ Version Info",
@@ -167,18 +239,24 @@ class BotInfo(commands.Cog):
             icon_url=self.bot.user.display_avatar.url if self.bot.user else None
         )
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return embed
 
     @app_commands.command(name="version", description="Show version information and recent changes")
     async def version_info(self, interaction: discord.Interaction):
         """Display version and changelog information"""
         
+        embed = embed_templates.get('version', self.build_version_embed, self.template_key())
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    def build_version_embed(self) -> discord.Embed:
+        """Build the static version embed"""
+        
         version_info = get_version_info()
         
         embed = discord.Embed(
             title=f"🏷️ Alpha Discord Bot v{version_info['version']}",
             description=f"**{version_info['description']}**\n\nReleased: **{version_info['release_date']}**",
-            color=Config.COLORS['success']
+            color=config_service.current.colors['success']
         )
         
         # Current Version Features
@@ -232,7 +310,7 @@ class BotInfo(commands.Cog):
             icon_url=self.bot.user.display_avatar.url if self.bot.user else None
         )
         
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return embed
 
     @app_commands.command(name="ping", description="Check bot latency and response time")
     async def ping(self, interaction: discord.Interaction):
@@ -250,14 +328,181 @@ class BotInfo(commands.Cog):
         embed.add_field(
             name="📊 Performance",
             value=(
-                f"**Guilds:** {len(self.bot.guilds)}\n"
-                f"**Commands:** {len([cmd for cmd in self.bot.tree.walk_commands()])}\n"
+                f"**Guilds:** {bot_stats.guild_count}\n"
+                f"**Shard:** {interaction.guild.shard_id if interaction.guild else 0}\n"
+                f"**Commands:** {bot_stats.command_count}\n"
+                f"**Uptime:** {bot_stats.uptime_text()}\n"
                 f"**Ready:** {'Yes' if self.bot.is_ready() else 'No'}"
             ),
             inline=True
         )
         
+        percentiles = bot_stats.latency_percentiles()
+        embed.add_field(
+            name="📶 Latency (recent)",
+            value=(
+                f"**p50:** {percentiles['p50']:.0f}ms\n"
+                f"**p95:** {percentiles['p95']:.0f}ms\n"
+                f"**p99:** {percentiles['p99']:.0f}ms"
+            ),
+            inline=True
+        )
+        
+        # Log outbox backlog (undelivered log events awaiting retry)
+        logs_cog = self.bot.get_cog('LogsModule')
+        if logs_cog:
+            outbox_stats = await logs_cog.outbox.stats()
+            embed.add_field(
+                name="📮 Log Outbox",
+                value=(
+                    f"**Pending:** {outbox_stats['size']}\n"
+                    f"**Oldest:** {int(outbox_stats['oldest_age'] // 60)}m"
+                ),
+                inline=True
+            )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="metrics", description="Show command, event and event-loop latency metrics (owner only)")
+    @app_commands.describe(kind="Only show commands, events or tasks")
+    @app_commands.choices(kind=[
+        app_commands.Choice(name="Commands", value="command"),
+        app_commands.Choice(name="Events", value="event"),
+        app_commands.Choice(name="Tasks", value="task")
+    ])
+    async def show_metrics(self, interaction: discord.Interaction, kind: str = None):
+        """Display the busiest handlers with latency percentiles"""
+        
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "Only the bot owner can view metrics."),
+                ephemeral=True
+            )
+            return
+        
+        embed = EmbedBuilder.info_embed("📈 Metrics", "Busiest handlers since startup (latency in ms)")
+        
+        rows = metrics.summary(kind=kind, limit=15)
+        if rows:
+            lines = [
+                f"`{row['kind'][:1]}` **{row['name']}** - {row['count']} calls, {row['errors']} errors, "
+                f"p50 {row['p50_ms']:.1f} / p99 {row['p99_ms']:.1f} / mean {row['mean_ms']:.2f}"
+                for row in rows
+            ]
+            embed.add_field(name="⏱️ Handlers", value="\n".join(lines)[:1024], inline=False)
+        else:
+            embed.add_field(name="⏱️ Handlers", value="No calls recorded yet", inline=False)
+        
+        lag = metrics.loop_lag
+        embed.add_field(
+            name="🔁 Event Loop Lag",
+            value=(
+                f"**p50:** {lag.percentile(50) * 1000:.1f}ms\n"
+                f"**p99:** {lag.percentile(99) * 1000:.1f}ms\n"
+                f"**Samples:** {lag.count}"
+            ),
+            inline=True
+        )
+        
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="profile", description="Profile the running bot for a while (owner only)")
+    @app_commands.describe(
+        mode="Sampling (flamegraph stacks), cProfile or memory allocations",
+        seconds="How long to profile (max 120)"
+    )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="CPU sampling (flamegraph)", value="sample"),
+        app_commands.Choice(name="cProfile", value="cprofile"),
+        app_commands.Choice(name="Memory (tracemalloc)", value="memory")
+    ])
+    async def profile(self, interaction: discord.Interaction, mode: str = "sample",
+                      seconds: app_commands.Range[int, 1, 120] = 30):
+        """Run a time-bounded profiling session and attach the result"""
+        
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "Only the bot owner can profile the bot."),
+                ephemeral=True
+            )
+            return
+        
+        if profiler.running:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.warning_embed("Profiler Busy", "A profiling session is already running."),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        try:
+            path, summary = await profiler.run(mode, seconds)
+        except ProfilerBusy:
+            await interaction.followup.send(
+                embed=EmbedBuilder.warning_embed("Profiler Busy", "A profiling session is already running."),
+                ephemeral=True
+            )
+            return
+        except Exception as e:
+            logging.error(f"Error running profiler: {e}")
+            await interaction.followup.send(
+                embed=EmbedBuilder.error_embed("Profiling Failed", "An error occurred while profiling."),
+                ephemeral=True
+            )
+            return
+        
+        embed = EmbedBuilder.success_embed("Profiling Complete", f"**Mode:** {mode}\n**Duration:** {seconds}s\n**Saved to:** `{path}`")
+        embed.add_field(name="🔥 Top", value=f"```\n{summary[:990]}\n```", inline=False)
+        
+        # Attach the output if it fits Discord's upload limit
+        files = []
+        if os.path.getsize(path) < 8 * 1024 * 1024:
+            files.append(discord.File(path))
+        
+        await interaction.followup.send(embed=embed, files=files, ephemeral=True)
+
+    @app_commands.command(name="reload", description="Reload a module's package without restarting; utils/ and config need a restart (owner only)")
+    @app_commands.describe(cog="Module to reload (management, time, logs or info)")
+    async def reload_cog(self, interaction: discord.Interaction, cog: str):
+        """Hot-reload one cog's extension in every cluster, keeping its in-memory state"""
+        
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "Only the bot owner can reload modules."),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        if self.bot.cluster:
+            try:
+                # {cluster_id: error message or None}; clusters that didn't answer within the timeout are missing
+                errors = await self.bot.cluster.request('reload_cog', timeout=30.0, name=cog)
+            except Exception as e:
+                logging.error(f"Error reloading {cog} across clusters: {e}")
+                errors = {str(self.bot.cluster.cluster_id): await self.bot.reload_cog(cog)}
+        else:
+            errors = {'0': await self.bot.reload_cog(cog)}
+        
+        failed = {cluster_id: error for cluster_id, error in errors.items() if error}
+        if self.bot.cluster:
+            # A cluster that didn't reply in time may or may not have reloaded
+            for cluster_id in range(self.bot.cluster.cluster_count):
+                if str(cluster_id) not in errors:
+                    failed[str(cluster_id)] = "no reply - unknown whether it reloaded"
+        if failed:
+            lines = "\n".join(f"**Cluster {cluster_id}:** {error[:200]}" for cluster_id, error in sorted(failed.items()))
+            embed = EmbedBuilder.error_embed("Reload Failed", f"`{cog}` kept its previous code where it failed.\n{lines}")
+        else:
+            embed = EmbedBuilder.success_embed("Module Reloaded", f"`{cog}` reloaded in {len(errors)} process(es).")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @reload_cog.autocomplete('cog')
+    async def reload_cog_autocomplete(self, interaction: discord.Interaction, current: str):
+        from bot import COGS
+        return [app_commands.Choice(name=name, value=name) for name in COGS if current.lower() in name][:25]
+
 async def setup(bot):
     await bot.add_cog(BotInfo(bot))
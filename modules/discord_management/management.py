@@ -1,27 +1,60 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from typing import Optional, Union
-from utils.user_utils import UserLookup, EmbedBuilder, PermissionChecker, sanitize_input
+from typing import Optional, Union, List, Tuple
+from utils.user_utils import UserLookup, MemberIndex, EmbedBuilder, PermissionChecker, sanitize_input
 from config.config import Config
+from utils.config_service import config_service
+from utils.member_cache import member_cache
+from utils.storage import announcement_repository
+from modules.discord_management.scheduler import AnnouncementScheduler, parse_schedule_time
 import asyncio
+import csv
+import io
 import logging
+import re
+import time
+
+# First-column headers recognised (and skipped) in bulk role CSV uploads
+CSV_HEADER_NAMES = {'user', 'users', 'id', 'user_id', 'username', 'member', 'name', 'display_name'}
 
 class DiscordManagement(commands.Cog):
     """Discord Management Module - Handle announcements, messaging, and role management"""
     
+    # Member lookups and role membership need the members intent (chunked lazily)
+    REQUIRED_INTENTS = ('guilds', 'members')
+    
     def __init__(self, bot):
         self.bot = bot
+        self.scheduler = AnnouncementScheduler(
+            bot,
+            announcement_repository,
+            concurrency=Config.ANNOUNCEMENT_CONCURRENCY
+        )
+    
+    async def cog_load(self):
+        """Called when the cog is loaded - start the announcement dispatcher"""
+        self.scheduler.start()
+        logging.info("DiscordManagement cog loaded and announcement dispatcher started")
+    
+    async def cog_unload(self):
+        """Called when the cog is unloaded - stop the announcement dispatcher"""
+        self.scheduler.stop()
+        logging.info("DiscordManagement cog unloaded and announcement dispatcher stopped")
     
     # ANNOUNCEMENT COMMANDS
     @app_commands.command(name="announce", description="Send an announcement to the announcement channel")
     @app_commands.describe(
         message="The announcement message to send",
-        channel="The channel to send the announcement (optional, uses configured channel by default)"
+        channel="The channel to send the announcement (optional, uses configured channel by default)",
+        extra_channels="Additional channel IDs or mentions, comma-separated (may be in other servers you administer)",
+        send_at="Schedule for later: 'in 30m', 'tomorrow 9am', 'YYYY-MM-DD HH:MM' (UTC)"
     )
     async def announce(self, interaction: discord.Interaction, message: str, 
-                      channel: Optional[discord.TextChannel] = None):
-        """Send a professional announcement"""
+                      channel: Optional[discord.TextChannel] = None,
+                      extra_channels: Optional[str] = None,
+                      send_at: Optional[str] = None):
+        """Send a professional announcement to one or more channels, now or on a schedule"""
         
         # Check permissions
         if not PermissionChecker.has_admin_perms(interaction.user):
@@ -34,56 +67,185 @@ class DiscordManagement(commands.Cog):
         # Determine target channel
         target_channel = channel
         if not target_channel:
-            if Config.ANNOUNCEMENT_CHANNEL_ID:
-                target_channel = self.bot.get_channel(Config.ANNOUNCEMENT_CHANNEL_ID)
-            else:
+            announcement_channel_id = config_service.guild(interaction.guild_id).announcement_channel_id
+            if announcement_channel_id:
+                target_channel = self.bot.get_channel(announcement_channel_id)
+            elif not extra_channels:
                 await interaction.response.send_message(
-                    embed=EmbedBuilder.error_embed("No Channel Set", "Please specify a channel or set ANNOUNCEMENT_CHANNEL_ID in config."),
+                    embed=EmbedBuilder.error_embed("No Channel Set", "Please specify a channel, or set `announcement_channel_id` (for every server or under `guilds` for this one) in config/runtime.json."),
                     ephemeral=True
                 )
                 return
         
-        if not target_channel:
+        if not target_channel and not extra_channels:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error_embed("Channel Not Found", "The specified announcement channel could not be found."),
                 ephemeral=True
             )
             return
         
-        # Sanitize and prepare message
-        clean_message = sanitize_input(message)
+        # Resolve every target channel once
+        targets = [target_channel] if target_channel else []
+        if extra_channels:
+            extra, problems = self.resolve_announcement_channels(interaction.user, extra_channels)
+            if problems:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error_embed("Invalid Channels", "\n".join(problems)),
+                    ephemeral=True
+                )
+                return
+            for extra_channel in extra:
+                if extra_channel not in targets:
+                    targets.append(extra_channel)
+        
+        scheduled_time = None
+        if send_at:
+            scheduled_time = parse_schedule_time(send_at)
+            if scheduled_time is None:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error_embed(
+                        "Invalid Schedule",
+                        "Use `in 30m`, `in 2h`, `tomorrow 9am`, `friday 17:00` or `YYYY-MM-DD HH:MM` (UTC)."
+                    ),
+                    ephemeral=True
+                )
+                return
         
-        # Create announcement embed
-        embed = discord.Embed(
-            title="📢 Announcement",
-            description=clean_message,
-            color=Config.COLORS['primary']
-        )
-        embed.set_author(name=interaction.user.display_name, icon_url=interaction.user.display_avatar.url)
-        embed.set_footer(text=f"Posted by {interaction.user.display_name}")
+        # Build the announcement embed once; it is reused for every target
+        embed = self.build_announcement_embed(sanitize_input(message), interaction.user)
         
-        try:
-            # Send announcement
-            await target_channel.send(embed=embed)
-            
-            # Confirm to user
-            confirm_embed = EmbedBuilder.success_embed(
-                "Announcement Sent",
-                f"Your announcement has been posted to {target_channel.mention}"
+        if scheduled_time is not None and scheduled_time > time.time():
+            job_id = await self.scheduler.schedule(
+                interaction.guild.id, interaction.user.id, embed, targets, scheduled_time
             )
-            await interaction.response.send_message(embed=confirm_embed, ephemeral=True)
-            
-        except discord.Forbidden:
             await interaction.response.send_message(
-                embed=EmbedBuilder.error_embed("Permission Error", "I don't have permission to send messages in that channel."),
+                embed=EmbedBuilder.success_embed(
+                    "Announcement Scheduled",
+                    f"**Job:** #{job_id}\n"
+                    f"**When:** <t:{int(scheduled_time)}:F> (<t:{int(scheduled_time)}:R>)\n"
+                    f"**Channels:** {', '.join(target.mention for target in targets)}"
+                ),
                 ephemeral=True
             )
-        except Exception as e:
-            logging.error(f"Error sending announcement: {e}")
+            return
+        
+        if len(targets) == 1:
+            try:
+                # Send announcement
+                await targets[0].send(embed=embed)
+                
+                # Confirm to user
+                confirm_embed = EmbedBuilder.success_embed(
+                    "Announcement Sent",
+                    f"Your announcement has been posted to {targets[0].mention}"
+                )
+                await interaction.response.send_message(embed=confirm_embed, ephemeral=True)
+                
+            except discord.Forbidden:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error_embed("Permission Error", "I don't have permission to send messages in that channel."),
+                    ephemeral=True
+                )
+            except Exception as e:
+                logging.error(f"Error sending announcement: {e}")
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error_embed("Error", "Failed to send announcement. Please try again."),
+                    ephemeral=True
+                )
+            return
+        
+        # Multi-channel fan-out
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        results = await self.scheduler.fan_out(embed, targets)
+        lines = [
+            f"{'✅' if results[target.id] is None else '❌'} {target.mention}"
+            + (f" - {results[target.id]}" if results[target.id] else "")
+            for target in targets
+        ]
+        sent = sum(1 for error in results.values() if error is None)
+        result_embed = (EmbedBuilder.success_embed if sent == len(targets) else EmbedBuilder.warning_embed)(
+            "Announcement Sent",
+            f"Posted to **{sent}/{len(targets)}** channels\n\n" + "\n".join(lines)
+        )
+        await interaction.followup.send(embed=result_embed, ephemeral=True)
+    
+    @app_commands.command(name="announce-scheduled", description="List scheduled announcements for this server")
+    async def announce_scheduled(self, interaction: discord.Interaction):
+        """List pending scheduled announcements"""
+        
+        if not PermissionChecker.has_admin_perms(interaction.user):
             await interaction.response.send_message(
-                embed=EmbedBuilder.error_embed("Error", "Failed to send announcement. Please try again."),
+                embed=EmbedBuilder.error_embed("Access Denied", "You need administrator permissions to use this command."),
                 ephemeral=True
             )
+            return
+        
+        jobs = await self.scheduler.store.pending(interaction.guild.id)
+        if not jobs:
+            embed = EmbedBuilder.info_embed("📅 Scheduled Announcements", "No announcements are scheduled.")
+        else:
+            lines = []
+            for job in jobs[:20]:
+                preview = (job['payload'].get('description') or '')[:60]
+                lines.append(
+                    f"**#{job['job_id']}** <t:{int(job['send_at'])}:R> → {len(job['targets'])} channel(s)\n{preview}"
+                )
+            embed = EmbedBuilder.info_embed("📅 Scheduled Announcements", "\n\n".join(lines))
+            if len(jobs) > 20:
+                embed.set_footer(text=f"... and {len(jobs) - 20} more")
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="announce-cancel", description="Cancel a scheduled announcement")
+    @app_commands.describe(job_id="The job number shown when the announcement was scheduled")
+    async def announce_cancel(self, interaction: discord.Interaction, job_id: int):
+        """Cancel a pending scheduled announcement"""
+        
+        if not PermissionChecker.has_admin_perms(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "You need administrator permissions to use this command."),
+                ephemeral=True
+            )
+            return
+        
+        if await self.scheduler.store.cancel(job_id, interaction.guild.id):
+            embed = EmbedBuilder.success_embed("Announcement Cancelled", f"Scheduled announcement #{job_id} was cancelled.")
+        else:
+            embed = EmbedBuilder.error_embed("Not Found", f"No pending announcement #{job_id} in this server.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @staticmethod
+    def build_announcement_embed(message: str, author: discord.Member) -> discord.Embed:
+        """Create the announcement embed shared by every target channel"""
+        embed = discord.Embed(
+            title="📢 Announcement",
+            description=message,
+            color=config_service.current.colors['primary']
+        )
+        embed.set_author(name=author.display_name, icon_url=author.display_avatar.url)
+        embed.set_footer(text=f"Posted by {author.display_name}")
+        return embed
+    
+    def resolve_announcement_channels(self, user: discord.abc.User, text: str) -> Tuple[List[discord.TextChannel], List[str]]:
+        """Resolve comma-separated channel IDs/mentions the user is allowed to announce in"""
+        channels = []
+        problems = []
+        for token in text.split(','):
+            token = token.strip()
+            if not token:
+                continue
+            match = re.match(r'^(?:<#)?(\d+)>?$', token)
+            channel = self.bot.get_channel(int(match.group(1))) if match else None
+            if not isinstance(channel, discord.TextChannel):
+                problems.append(f"`{token}` is not a text channel I can see")
+                continue
+            member = channel.guild.get_member(user.id)
+            if not member or not PermissionChecker.has_admin_perms(member):
+                problems.append(f"You are not an administrator in the server of {channel.mention}")
+                continue
+            if channel not in channels:
+                channels.append(channel)
+        return channels, problems
     
     # DIRECT MESSAGING COMMANDS
     @app_commands.command(name="dm", description="Send a direct message to a user through the bot")
@@ -102,10 +264,13 @@ class DiscordManagement(commands.Cog):
             )
             return
         
+        # Looking members up can chunk the guild, which may outlast the 3 second response window
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         # Find the target user
         target_member = await UserLookup.find_member(interaction.guild, user)
         if not target_member:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("User Not Found", f"Could not find a user matching '{user}'."),
                 ephemeral=True
             )
@@ -117,7 +282,7 @@ class DiscordManagement(commands.Cog):
         embed = discord.Embed(
             title="📨 Message from Server Staff",
             description=clean_message,
-            color=Config.COLORS['info']
+            color=config_service.current.colors['info']
         )
         embed.add_field(name="Server", value=interaction.guild.name, inline=True)
         embed.add_field(name="Sent by", value=interaction.user.display_name, inline=True)
@@ -132,16 +297,16 @@ class DiscordManagement(commands.Cog):
                 "Message Sent",
                 f"Your message has been sent to {target_member.display_name}"
             )
-            await interaction.response.send_message(embed=confirm_embed, ephemeral=True)
+            await interaction.followup.send(embed=confirm_embed, ephemeral=True)
             
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Cannot Send DM", f"{target_member.display_name} has DMs disabled or blocked the bot."),
                 ephemeral=True
             )
         except Exception as e:
             logging.error(f"Error sending DM: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Error", "Failed to send message. Please try again."),
                 ephemeral=True
             )
@@ -163,10 +328,14 @@ class DiscordManagement(commands.Cog):
             )
             return
         
+        # Chunking the guild for the role's members can take a while
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         # Get all members with the role
+        await member_cache.ensure_chunked(interaction.guild)
         members = role.members
         if not members:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.warning_embed("No Members", f"No members found with the role {role.name}."),
                 ephemeral=True
             )
@@ -180,7 +349,7 @@ class DiscordManagement(commands.Cog):
         
         # Create confirmation view
         view = ConfirmationView()
-        await interaction.response.send_message(embed=confirm_embed, view=view, ephemeral=True)
+        await interaction.edit_original_response(embed=confirm_embed, view=view)
         
         # Wait for confirmation
         await view.wait()
@@ -193,7 +362,7 @@ class DiscordManagement(commands.Cog):
         embed = discord.Embed(
             title=f"📨 Message to {role.name} Members",
             description=clean_message,
-            color=Config.COLORS['info']
+            color=config_service.current.colors['info']
         )
         embed.add_field(name="Server", value=interaction.guild.name, inline=True)
         embed.add_field(name="Sent by", value=interaction.user.display_name, inline=True)
@@ -241,10 +410,13 @@ class DiscordManagement(commands.Cog):
             )
             return
         
+        # The lookup may have to chunk the guild first
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         # Find the target user
         target_member = await UserLookup.find_member(interaction.guild, user)
         if not target_member:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("User Not Found", f"Could not find a user matching '{user}'."),
                 ephemeral=True
             )
@@ -252,7 +424,7 @@ class DiscordManagement(commands.Cog):
         
         # Check if user can modify this member
         if not PermissionChecker.can_modify_member(interaction.user, target_member):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Permission Error", "You cannot modify this user's roles."),
                 ephemeral=True
             )
@@ -260,7 +432,7 @@ class DiscordManagement(commands.Cog):
         
         # Check if role can be assigned
         if role >= interaction.user.top_role and not PermissionChecker.has_admin_perms(interaction.user):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Role Too High", "You cannot assign roles higher than or equal to your highest role."),
                 ephemeral=True
             )
@@ -268,7 +440,7 @@ class DiscordManagement(commands.Cog):
         
         # Check if user already has the role
         if role in target_member.roles:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.warning_embed("Already Has Role", f"{target_member.display_name} already has the role {role.name}."),
                 ephemeral=True
             )
@@ -283,16 +455,16 @@ class DiscordManagement(commands.Cog):
                 "Role Added",
                 f"Successfully added **{role.name}** to {target_member.display_name}"
             )
-            await interaction.response.send_message(embed=success_embed, ephemeral=True)
+            await interaction.followup.send(embed=success_embed, ephemeral=True)
             
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Permission Error", "I don't have permission to manage this role."),
                 ephemeral=True
             )
         except Exception as e:
             logging.error(f"Error adding role: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Error", "Failed to add role. Please try again."),
                 ephemeral=True
             )
@@ -313,10 +485,13 @@ class DiscordManagement(commands.Cog):
             )
             return
         
+        # The lookup may have to chunk the guild first
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         # Find the target user
         target_member = await UserLookup.find_member(interaction.guild, user)
         if not target_member:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("User Not Found", f"Could not find a user matching '{user}'."),
                 ephemeral=True
             )
@@ -324,7 +499,7 @@ class DiscordManagement(commands.Cog):
         
         # Check if user can modify this member
         if not PermissionChecker.can_modify_member(interaction.user, target_member):
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Permission Error", "You cannot modify this user's roles."),
                 ephemeral=True
             )
@@ -332,7 +507,7 @@ class DiscordManagement(commands.Cog):
         
         # Check if user has the role
         if role not in target_member.roles:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.warning_embed("Doesn't Have Role", f"{target_member.display_name} doesn't have the role {role.name}."),
                 ephemeral=True
             )
@@ -347,20 +522,256 @@ class DiscordManagement(commands.Cog):
                 "Role Removed",
                 f"Successfully removed **{role.name}** from {target_member.display_name}"
             )
-            await interaction.response.send_message(embed=success_embed, ephemeral=True)
+            await interaction.followup.send(embed=success_embed, ephemeral=True)
             
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Permission Error", "I don't have permission to manage this role."),
                 ephemeral=True
             )
         except Exception as e:
             logging.error(f"Error removing role: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Error", "Failed to remove role. Please try again."),
                 ephemeral=True
             )
 
+    # BULK ROLE MANAGEMENT COMMANDS
+    @app_commands.command(name="bulk-add-role", description="Add one or more roles to many users at once")
+    @app_commands.describe(
+        roles="Roles to add (comma-separated names, IDs or mentions)",
+        users="Users to update (comma or newline separated display names, usernames, IDs or mentions)",
+        source_role="Update every member who has this role",
+        csv_file="CSV file whose first column lists users to update"
+    )
+    async def bulk_add_role(self, interaction: discord.Interaction, roles: str,
+                            users: Optional[str] = None,
+                            source_role: Optional[discord.Role] = None,
+                            csv_file: Optional[discord.Attachment] = None):
+        """Add roles to many users in a single operation"""
+        await self.run_bulk_role_operation(interaction, 'add', roles, users, source_role, csv_file)
+    
+    @app_commands.command(name="bulk-remove-role", description="Remove one or more roles from many users at once")
+    @app_commands.describe(
+        roles="Roles to remove (comma-separated names, IDs or mentions)",
+        users="Users to update (comma or newline separated display names, usernames, IDs or mentions)",
+        source_role="Update every member who has this role",
+        csv_file="CSV file whose first column lists users to update"
+    )
+    async def bulk_remove_role(self, interaction: discord.Interaction, roles: str,
+                               users: Optional[str] = None,
+                               source_role: Optional[discord.Role] = None,
+                               csv_file: Optional[discord.Attachment] = None):
+        """Remove roles from many users in a single operation"""
+        await self.run_bulk_role_operation(interaction, 'remove', roles, users, source_role, csv_file)
+    
+    @staticmethod
+    def parse_roles(guild: discord.Guild, text: str) -> Tuple[List[discord.Role], List[str]]:
+        """Parse a comma-separated list of role names, IDs or mentions"""
+        roles_by_name = {role.name.lower(): role for role in guild.roles}
+        found = []
+        unknown = []
+        for token in text.split(','):
+            token = token.strip()
+            if not token:
+                continue
+            mention_match = re.match(r'<@&(\d+)>$', token)
+            role = None
+            if mention_match or token.isdigit():
+                role = guild.get_role(int(mention_match.group(1) if mention_match else token))
+            if role is None:
+                role = roles_by_name.get(token.lower())
+            if role is None:
+                unknown.append(token)
+            elif role not in found:
+                found.append(role)
+        return found, unknown
+    
+    @staticmethod
+    async def collect_identifiers(users: Optional[str], csv_file: Optional[discord.Attachment]) -> List[str]:
+        """Gather user identifiers from the text argument and an uploaded CSV"""
+        identifiers = []
+        if users:
+            identifiers.extend(part.strip() for part in re.split(r'[,\n]', users))
+        
+        if csv_file:
+            content = (await csv_file.read()).decode('utf-8-sig', errors='replace')
+            rows = list(csv.reader(io.StringIO(content)))
+            if rows and rows[0] and rows[0][0].strip().lower() in CSV_HEADER_NAMES:
+                rows = rows[1:]
+            identifiers.extend(row[0].strip() for row in rows if row)
+        
+        # Drop blanks and duplicates while keeping order
+        return list(dict.fromkeys(identifier for identifier in identifiers if identifier))
+    
+    async def run_bulk_role_operation(self, interaction: discord.Interaction, mode: str, roles_text: str,
+                                      users: Optional[str], source_role: Optional[discord.Role],
+                                      csv_file: Optional[discord.Attachment]):
+        """Resolve targets once, then apply role changes through a rate-limited worker pool"""
+        
+        # Check permissions
+        if not PermissionChecker.has_manage_roles_perms(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "You need manage roles permissions to use this command."),
+                ephemeral=True
+            )
+            return
+        
+        guild = interaction.guild
+        roles, unknown_roles = self.parse_roles(guild, roles_text)
+        if not roles or unknown_roles:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed(
+                    "Unknown Roles",
+                    f"Could not find: {', '.join(unknown_roles)}" if unknown_roles else "Please specify at least one role."
+                ),
+                ephemeral=True
+            )
+            return
+        
+        if not PermissionChecker.has_admin_perms(interaction.user):
+            too_high = [role.name for role in roles if role >= interaction.user.top_role]
+            if too_high:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error_embed("Role Too High", f"You cannot manage: {', '.join(too_high)}"),
+                    ephemeral=True
+                )
+                return
+        
+        if not users and not source_role and not csv_file:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("No Targets", "Provide users, a source role or a CSV file."),
+                ephemeral=True
+            )
+            return
+        
+        # Resolving and confirming can take a while for large cohorts
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        identifiers = await self.collect_identifiers(users, csv_file)
+        await member_cache.ensure_chunked(guild)
+        resolved, unresolved = await MemberIndex(guild).resolve_many(identifiers)
+        
+        # One entry per member, regardless of how many identifiers matched them
+        targets = {member.id: member for member in resolved.values()}
+        if source_role:
+            for member in source_role.members:
+                targets.setdefault(member.id, member)
+        
+        max_targets = config_service.guild(interaction.guild_id).bulk_role_max_targets
+        if len(targets) > max_targets:
+            await interaction.followup.send(
+                embed=EmbedBuilder.error_embed(
+                    "Too Many Users",
+                    f"{len(targets)} users matched; the limit is {max_targets} per operation."
+                ),
+                ephemeral=True
+            )
+            return
+        
+        # Work out the change per member so each member is edited at most once
+        plan = []
+        skipped = 0
+        for member in targets.values():
+            if not PermissionChecker.can_modify_member(interaction.user, member):
+                skipped += 1
+                continue
+            if mode == 'add':
+                changes = [role for role in roles if role not in member.roles]
+            else:
+                changes = [role for role in roles if role in member.roles]
+            if changes:
+                plan.append((member, changes))
+            else:
+                skipped += 1
+        
+        role_names = ", ".join(f"**{role.name}**" for role in roles)
+        action = "add" if mode == 'add' else "remove"
+        if not plan:
+            await interaction.followup.send(
+                embed=EmbedBuilder.warning_embed(
+                    "Nothing To Do",
+                    f"No members need {role_names} {'added' if mode == 'add' else 'removed'}.\n"
+                    f"**Skipped:** {skipped}\n**Unresolved:** {len(unresolved)}"
+                ),
+                ephemeral=True
+            )
+            return
+        
+        # Confirm action
+        confirm_embed = EmbedBuilder.warning_embed(
+            "Bulk Role Confirmation",
+            f"You are about to {action} {role_names} for **{len(plan)}** members.\n"
+            f"**Skipped:** {skipped} (no change needed or not permitted)\n"
+            f"**Unresolved:** {len(unresolved)}\n\nAre you sure?"
+        )
+        view = ConfirmationView()
+        message = await interaction.followup.send(embed=confirm_embed, view=view, ephemeral=True, wait=True)
+        await view.wait()
+        if not view.confirmed:
+            return
+        
+        reason = f"Bulk {action} by {interaction.user} via Alpha Bot"
+        progress = {'done': 0, 'failed': 0}
+        semaphore = asyncio.Semaphore(config_service.current.bulk_role_concurrency)
+        
+        async def apply(member: discord.Member, changes: List[discord.Role]):
+            async with semaphore:
+                for attempt in range(3):
+                    try:
+                        # atomic=False sends a single member edit with the full role list
+                        if mode == 'add':
+                            await member.add_roles(*changes, reason=reason, atomic=False)
+                        else:
+                            await member.remove_roles(*changes, reason=reason, atomic=False)
+                        progress['done'] += 1
+                        return
+                    except discord.HTTPException as e:
+                        if e.status == 429 and attempt < 2:
+                            await asyncio.sleep(getattr(e, 'retry_after', None) or 2 ** attempt)
+                            continue
+                        if e.status >= 500 and attempt < 2:
+                            await asyncio.sleep(2 ** attempt)
+                            continue
+                        logging.error(f"Error updating roles for {member}: {e}")
+                        break
+                    except Exception as e:
+                        logging.error(f"Error updating roles for {member}: {e}")
+                        break
+                progress['failed'] += 1
+        
+        async def report_progress():
+            while True:
+                await asyncio.sleep(Config.BULK_ROLE_PROGRESS_INTERVAL)
+                await message.edit(
+                    embed=EmbedBuilder.info_embed(
+                        "Updating Roles",
+                        f"**Progress:** {progress['done'] + progress['failed']}/{len(plan)}\n"
+                        f"**Failed:** {progress['failed']}"
+                    ),
+                    view=None
+                )
+        
+        await message.edit(embed=EmbedBuilder.info_embed("Updating Roles", "Starting bulk role operation..."), view=None)
+        reporter = asyncio.create_task(report_progress())
+        try:
+            await asyncio.gather(*[apply(member, changes) for member, changes in plan])
+        finally:
+            reporter.cancel()
+        
+        # Final result
+        description = (
+            f"**Updated:** {progress['done']}\n"
+            f"**Failed:** {progress['failed']}\n"
+            f"**Skipped:** {skipped}\n"
+            f"**Unresolved:** {len(unresolved)}"
+        )
+        if unresolved:
+            description += "\n\n**Could not find:** " + ", ".join(f"`{i}`" for i in unresolved[:20])
+            if len(unresolved) > 20:
+                description += f" ... and {len(unresolved) - 20} more"
+        await message.edit(embed=EmbedBuilder.success_embed("Bulk Role Operation Complete", description))
+
 class ConfirmationView(discord.ui.View):
     """Confirmation view for dangerous actions"""
     
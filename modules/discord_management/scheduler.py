@@ -0,0 +1,112 @@
+import discord
+from typing import Optional, List, Dict
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+import pytz
+from utils.time_parser import parse_time
+from utils.storage import AnnouncementRepository
+
+def parse_schedule_time(text: str, now: Optional[float] = None) -> Optional[float]:
+    """Parse a time expression ("in 2h", "tomorrow 9am", "YYYY-MM-DD HH:MM", ...) in UTC into an epoch timestamp"""
+    now = time.time() if now is None else now
+    try:
+        return parse_time(text, pytz.utc, datetime.fromtimestamp(now, timezone.utc)).timestamp()
+    except ValueError:
+        return None
+
+class AnnouncementScheduler:
+    """Deadline-driven dispatcher that fans scheduled announcements out to their target channels"""
+
+    def __init__(self, bot, store: AnnouncementRepository, concurrency: int = 5):
+        self.bot = bot
+        self.store = store
+        self.concurrency = concurrency
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        """Start the dispatcher task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stop the dispatcher task"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def schedule(self, guild_id: int, author_id: int, embed: discord.Embed,
+                       targets: List[discord.abc.GuildChannel], send_at: float) -> int:
+        """Persist a job and wake the dispatcher in case it is now the earliest deadline
+
+        Targets are stored per guild, so each part is sent by the cluster hosting that guild.
+        """
+        by_guild: Dict[int, List[int]] = {}
+        for channel in targets:
+            by_guild.setdefault(channel.guild.id, []).append(channel.id)
+        job_id = await self.store.add(guild_id, author_id, embed.to_dict(), by_guild, send_at)
+        self._wakeup.set()
+        return job_id
+
+    async def fan_out(self, embed: discord.Embed, channels: List[discord.abc.Messageable]) -> Dict[int, Optional[str]]:
+        """Send one pre-built embed to every channel concurrently; returns {channel_id: error or None}"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(channel):
+            async with semaphore:
+                try:
+                    await channel.send(embed=embed)
+                    return None
+                except discord.Forbidden:
+                    return "missing permissions"
+                except Exception as e:
+                    logging.error(f"Error sending announcement to {channel}: {e}")
+                    return str(e) or type(e).__name__
+
+        results = await asyncio.gather(*[send(channel) for channel in channels])
+        return {channel.id: error for channel, error in zip(channels, results)}
+
+    async def _dispatch(self, job: dict):
+        """Send a single due job and record the outcome"""
+        if not await self.store.claim(job['id']):
+            return
+        embed = discord.Embed.from_dict(job['payload'])
+        channels = []
+        result = {}
+        for channel_id in job['targets']:
+            channel = self.bot.get_channel(channel_id)
+            if channel:
+                channels.append(channel)
+            else:
+                result[str(channel_id)] = "channel not found"
+
+        for channel_id, error in (await self.fan_out(embed, channels)).items():
+            result[str(channel_id)] = error
+
+        status = 'sent' if any(error is None for error in result.values()) else 'failed'
+        await self.store.finish(job['id'], status, result)
+        logging.info(f"Scheduled announcement {job['job_id']} {status} in guild {job['target_guild_id']}: {result}")
+
+    async def _run(self):
+        """Sleep until the next deadline (or a new job arrives), then dispatch everything due"""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                self._wakeup.clear()
+                now = time.time()
+                for job in await self.store.due(now, self.bot.shard_ids, self.bot.shard_count):
+                    await self._dispatch(job)
+
+                deadline = await self.store.next_deadline(self.bot.shard_ids, self.bot.shard_count)
+                timeout = None if deadline is None else max(deadline - time.time(), 0)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error in announcement dispatcher: {e}")
+                await asyncio.sleep(5)
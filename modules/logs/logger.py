@@ -1,74 +1,91 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import asyncio
-import json
-import os
 from datetime import datetime
 from utils.user_utils import EmbedBuilder, PermissionChecker
+from utils.storage import log_channel_repository, log_outbox_repository
 from config.config import Config
+from utils.config_service import config_service
 import logging
 
+# Logging category and channel names created by /setup-logs
+LOG_CATEGORY_NAME = "📋 Server Logs"
+LOG_CHANNEL_NAMES = {
+    'message_logs': '💬-message-logs',
+    'member_logs': '👤-member-logs',
+    'voice_logs': '🔊-voice-logs',
+    'moderation_logs': '🔨-moderation-logs',
+    'server_logs': '⚙️-server-logs'
+}
+
 class LogsModule(commands.Cog):
     """Comprehensive Logging Module - Log all server activities with professional UI"""
     
+    # Gateway intents the listeners below depend on
+    REQUIRED_INTENTS = ('guilds', 'members', 'guild_messages', 'message_content', 'voice_states', 'moderation')
+    
     def __init__(self, bot):
         self.bot = bot
         self.log_channels = {}  # guild_id: {log_type: channel_id}
-        self.load_log_config()
+        self._provision_locks = {}  # guild_id: asyncio.Lock
+        self.outbox = log_outbox_repository
+    
+    async def cog_load(self):
+        """Called when the cog is loaded - load the configuration and start the outbox drainer"""
+        await self.load_log_config()
+        self.drain_outbox.change_interval(seconds=Config.LOG_OUTBOX_DRAIN_INTERVAL)
+        self.drain_outbox.start()
+        logging.info("LogsModule cog loaded and outbox drainer started")
     
-    def load_log_config(self):
-        """Load logging configuration from file"""
+    async def cog_unload(self):
+        """Called when the cog is unloaded - stop the outbox drainer"""
+        self.drain_outbox.cancel()
+        logging.info("LogsModule cog unloaded and outbox drainer stopped")
+    
+    async def load_log_config(self):
+        """Load logging configuration from the database"""
         try:
-            if os.path.exists('data/log_config.json'):
-                with open('data/log_config.json', 'r') as f:
-                    self.log_channels = json.load(f)
+            stored = await log_channel_repository.all()
+            self.log_channels = {str(guild_id): channels for guild_id, channels in stored.items()}
         except Exception as e:
             logging.error(f"Error loading log config: {e}")
             self.log_channels = {}
     
-    def save_log_config(self):
-        """Save logging configuration to file"""
+    async def save_log_config(self, guild_ids: List[str]):
+        """Save the logging configuration of the given guilds"""
+        # Copied here on the event loop: other provisioning tasks keep changing log_channels
+        # while the write is queued for the storage thread
+        snapshot = {int(guild_id): dict(self.log_channels.get(guild_id, {})) for guild_id in guild_ids}
         try:
-            os.makedirs('data', exist_ok=True)
-            with open('data/log_config.json', 'w') as f:
-                json.dump(self.log_channels, f, indent=2)
+            await log_channel_repository.set_guilds(snapshot)
         except Exception as e:
             logging.error(f"Error saving log config: {e}")
     
     # SETUP COMMANDS
-    @app_commands.command(name="setup-logs", description="Automatically set up all logging channels")
-    async def setup_logs(self, interaction: discord.Interaction):
-        """Set up all logging channels automatically"""
+    async def provision_guild(self, guild: discord.Guild) -> Tuple[discord.CategoryChannel, List[str]]:
+        """Create or reuse the logging category and channels for a guild
         
-        # Check permissions
-        if not PermissionChecker.has_admin_perms(interaction.user):
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error_embed("Access Denied", "You need administrator permissions to set up logging."),
-                ephemeral=True
-            )
-            return
-        
-        guild = interaction.guild
+        Safe to run repeatedly and for many guilds at once: existing channels are
+        resolved from a single name map and only missing ones are created, concurrently.
+        """
         guild_id = str(guild.id)
+        lock = self._provision_locks.setdefault(guild_id, asyncio.Lock())
         
-        # Initialize guild config
-        if guild_id not in self.log_channels:
-            self.log_channels[guild_id] = {}
-        
-        try:
+        async with lock:
+            guild_config = self.log_channels.setdefault(guild_id, {})
+            
             # Create or find logging category
             log_category = None
             for category in guild.categories:
-                if category.name.lower() == "📋 server logs":
+                if category.name.lower() == LOG_CATEGORY_NAME.lower():
                     log_category = category
                     break
             
             if not log_category:
-                # Create new category
                 log_category = await guild.create_category(
-                    name="📋 Server Logs",
+                    name=LOG_CATEGORY_NAME,
                     overwrites={
                         guild.default_role: discord.PermissionOverwrite(
                             read_messages=False,
@@ -82,44 +99,78 @@ class LogsModule(commands.Cog):
                     }
                 )
             
-            # Define channels to create
-            log_channels_to_create = {
-                'message_logs': '💬-message-logs',
-                'member_logs': '👤-member-logs',
-                'voice_logs': '🔊-voice-logs',
-                'moderation_logs': '🔨-moderation-logs',
-                'server_logs': '⚙️-server-logs'
-            }
-            
-            created_channels = []
+            # Resolve existing channels in one pass
+            channels_by_id = {channel.id: channel for channel in guild.text_channels}
+            channels_by_name = {}
+            for channel in guild.text_channels:
+                channels_by_name.setdefault(channel.name, channel)
             
-            # Create channels
-            for log_type, channel_name in log_channels_to_create.items():
-                # Check if channel already exists
-                existing_channel = discord.utils.get(guild.text_channels, name=channel_name)
-                
+            results = []
+            missing = []
+            for log_type, channel_name in LOG_CHANNEL_NAMES.items():
+                existing_channel = channels_by_id.get(guild_config.get(log_type)) or channels_by_name.get(channel_name)
                 if existing_channel:
-                    # Use existing channel
-                    self.log_channels[guild_id][log_type] = existing_channel.id
-                    created_channels.append(f"✅ {channel_name} (existing)")
+                    guild_config[log_type] = existing_channel.id
+                    results.append(f"✅ {existing_channel.name} (existing)")
                 else:
-                    # Create new channel
-                    channel = await guild.create_text_channel(
+                    missing.append((log_type, channel_name))
+            
+            # Create missing channels concurrently
+            created = await asyncio.gather(
+                *[
+                    guild.create_text_channel(
                         name=channel_name,
                         category=log_category,
                         topic=f"Automated logging for {log_type.replace('_', ' ').title()}"
                     )
-                    self.log_channels[guild_id][log_type] = channel.id
-                    created_channels.append(f"✅ {channel_name} (created)")
+                    for log_type, channel_name in missing
+                ],
+                return_exceptions=True
+            )
+            
+            errors = []
+            for (log_type, channel_name), channel in zip(missing, created):
+                if isinstance(channel, BaseException):
+                    errors.append(channel)
+                    results.append(f"❌ {channel_name} (failed)")
+                else:
+                    guild_config[log_type] = channel.id
+                    results.append(f"✅ {channel_name} (created)")
+            
+            if errors and len(errors) == len(missing):
+                # Nothing could be created - surface the failure (usually Forbidden)
+                raise errors[0]
+            for error in errors:
+                logging.error(f"Error creating log channel in {guild}: {error}")
+            
+            return log_category, results
+    
+    @app_commands.command(name="setup-logs", description="Automatically set up all logging channels")
+    async def setup_logs(self, interaction: discord.Interaction):
+        """Set up all logging channels automatically"""
+        
+        # Check permissions
+        if not PermissionChecker.has_admin_perms(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "You need administrator permissions to set up logging."),
+                ephemeral=True
+            )
+            return
+        
+        # Acknowledge within the interaction deadline; channel creation may take longer
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        try:
+            log_category, results = await self.provision_guild(interaction.guild)
             
             # Save configuration
-            self.save_log_config()
+            await self.save_log_config([str(interaction.guild.id)])
             
             # Success response
             embed = EmbedBuilder.success_embed(
                 "🎉 Logging Setup Complete",
                 f"**Category:** {log_category.mention}\n\n" +
-                "\n".join(created_channels) +
+                "\n".join(results) +
                 "\n\n**Features Enabled:**\n" +
                 "• Message logging (edit, delete, bulk delete)\n" +
                 "• Member logging (join, leave, nickname changes)\n" +
@@ -129,20 +180,64 @@ class LogsModule(commands.Cog):
                 "All server activity will now be logged automatically!"
             )
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Permission Error", "I don't have permission to create channels or categories."),
                 ephemeral=True
             )
         except Exception as e:
             logging.error(f"Error setting up logs: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error_embed("Setup Error", "An error occurred while setting up logging. Please try again."),
                 ephemeral=True
             )
     
+    @app_commands.command(name="setup-logs-all", description="Set up logging channels in every server the bot is in (owner only)")
+    async def setup_logs_all(self, interaction: discord.Interaction):
+        """Provision logging for every guild concurrently"""
+        
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "Only the bot owner can set up logging for every server."),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        guilds = list(self.bot.guilds)
+        semaphore = asyncio.Semaphore(config_service.current.log_setup_concurrency)
+        
+        async def provision(guild):
+            async with semaphore:
+                await self.provision_guild(guild)
+        
+        outcomes = await asyncio.gather(*[provision(guild) for guild in guilds], return_exceptions=True)
+        await self.save_log_config([str(guild.id) for guild in guilds])
+        
+        failed = []
+        for guild, outcome in zip(guilds, outcomes):
+            if isinstance(outcome, BaseException):
+                logging.error(f"Error setting up logs in {guild}: {outcome}")
+                failed.append(guild.name)
+        
+        description = (
+            f"**Servers:** {len(guilds)}\n"
+            f"**Succeeded:** {len(guilds) - len(failed)}\n"
+            f"**Failed:** {len(failed)}"
+        )
+        if failed:
+            description += "\n\n**Failed servers:**\n" + "\n".join(f"• {name}" for name in failed[:15])
+            if len(failed) > 15:
+                description += f"\n... and {len(failed) - 15} more"
+        
+        embed = (EmbedBuilder.warning_embed if failed else EmbedBuilder.success_embed)(
+            "📋 Bulk Logging Setup", description
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="log-status", description="Check logging configuration status")
     async def log_status(self, interaction: discord.Interaction):
         """Check current logging configuration"""
@@ -174,23 +269,84 @@ class LogsModule(commands.Cog):
                 inline=False
             )
         
+        # Undelivered log events waiting for retry
+        outbox_stats = await self.outbox.stats()
+        if outbox_stats['size']:
+            oldest_minutes = int(outbox_stats['oldest_age'] // 60)
+            outbox_value = (
+                f"**Pending:** {outbox_stats['size']}\n"
+                f"**Oldest:** {oldest_minutes}m ago"
+            )
+        else:
+            outbox_value = "No undelivered log events"
+        embed.add_field(name="📮 Outbox", value=outbox_value, inline=False)
+        
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     # UTILITY METHODS
     async def log_to_channel(self, guild: discord.Guild, log_type: str, embed: discord.Embed):
-        """Log an embed to the appropriate channel"""
+        """Log an embed to the appropriate channel, spooling it to the outbox on failure"""
+        guild_id = str(guild.id)
+        if guild_id not in self.log_channels or log_type not in self.log_channels[guild_id]:
+            return
+        
+        channel_id = self.log_channels[guild_id][log_type]
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return
+        
         try:
-            guild_id = str(guild.id)
-            if guild_id not in self.log_channels or log_type not in self.log_channels[guild_id]:
-                return
-            
-            channel_id = self.log_channels[guild_id][log_type]
-            channel = self.bot.get_channel(channel_id)
+            await channel.send(embed=embed)
+        except (discord.Forbidden, discord.NotFound) as e:
+            # Permanent failures - retrying will not help
+            logging.error(f"Error logging to channel: {e}")
+        except Exception as e:
+            logging.error(f"Error logging to channel, spooling to outbox: {e}")
+            try:
+                await self.outbox.enqueue(guild.id, log_type, embed.to_dict())
+            except Exception as spool_error:
+                logging.error(f"Error spooling log event to outbox: {spool_error}")
+    
+    @tasks.loop(seconds=15)
+    async def drain_outbox(self):
+        """Retry undelivered log events with exponential backoff"""
+        try:
+            expired = await self.outbox.expire()
+            if expired:
+                logging.warning(f"Dropped {expired} expired log events from outbox")
             
-            if channel:
-                await channel.send(embed=embed)
+            delivered = []
+            try:
+                for entry in await self.outbox.due(shard_ids=self.bot.shard_ids, shard_count=self.bot.shard_count):
+                    channel_id = self.log_channels.get(str(entry['guild_id']), {}).get(entry['log_type'])
+                    channel = self.bot.get_channel(channel_id) if channel_id else None
+                    
+                    if not channel_id:
+                        # Logging was disabled for this type since the event was spooled
+                        delivered.append(entry['event_id'])
+                        continue
+                    if not channel:
+                        await self.outbox.retry_later(entry['event_id'], entry['attempts'] + 1)
+                        continue
+                    
+                    try:
+                        await channel.send(embed=discord.Embed.from_dict(entry['payload']))
+                        delivered.append(entry['event_id'])
+                    except (discord.Forbidden, discord.NotFound) as e:
+                        logging.error(f"Dropping undeliverable log event {entry['event_id']}: {e}")
+                        delivered.append(entry['event_id'])
+                    except Exception as e:
+                        logging.warning(f"Retry of log event {entry['event_id']} failed: {e}")
+                        await self.outbox.retry_later(entry['event_id'], entry['attempts'] + 1)
+            finally:
+                # Whatever went wrong later, events already posted must not be posted again
+                await self.outbox.ack(delivered)
         except Exception as e:
-            logging.error(f"Error logging to channel: {e}")
+            logging.error(f"Error draining log outbox: {e}")
+    
+    @drain_outbox.before_loop
+    async def before_drain_outbox(self):
+        await self.bot.wait_until_ready()
     
     def create_log_embed(self, title: str, description: str, color: int, user: discord.Member = None) -> discord.Embed:
         """Create a standardized log embed"""
@@ -222,7 +378,7 @@ class LogsModule(commands.Cog):
             f"**Channel:** {message.channel.mention}\n"
             f"**Content:** {message.content[:1000] if message.content else '*No content*'}\n"
             f"**Message ID:** {message.id}",
-            Config.COLORS['error'],
+            config_service.current.colors['error'],
             message.author
         )
         
@@ -243,7 +399,7 @@ class LogsModule(commands.Cog):
             f"**Channel:** {before.channel.mention}\n"
             f"**Message ID:** {before.id}\n"
             f"**[Jump to Message]({after.jump_url})**",
-            Config.COLORS['warning'],
+            config_service.current.colors['warning'],
             before.author
         )
         
@@ -272,7 +428,7 @@ class LogsModule(commands.Cog):
         embed = discord.Embed(
             title="🗑️ Bulk Message Delete",
             description=f"**{len(messages)}** messages were deleted from {channel.mention}",
-            color=Config.COLORS['error'],
+            color=config_service.current.colors['error'],
             timestamp=datetime.utcnow()
         )
         
@@ -298,8 +454,8 @@ class LogsModule(commands.Cog):
         embed = self.create_log_embed(
             "📥 Member Joined",
             f"**Account Created:** <t:{int(member.created_at.timestamp())}:R>\n"
-            f"**Member #{len(member.guild.members)}**",
-            Config.COLORS['success'],
+            f"**Member #{member.guild.member_count}**",
+            config_service.current.colors['success'],
             member
         )
         
@@ -312,7 +468,7 @@ class LogsModule(commands.Cog):
             "📤 Member Left",
             f"**Joined Server:** <t:{int(member.joined_at.timestamp())}:R>\n"
             f"**Roles:** {', '.join([role.name for role in member.roles[1:]]) or 'None'}",
-            Config.COLORS['error'],
+            config_service.current.colors['error'],
             member
         )
         
@@ -329,7 +485,7 @@ class LogsModule(commands.Cog):
                 "🏷️ Nickname Changed",
                 f"**Before:** {before.nick or before.name}\n"
                 f"**After:** {after.nick or after.name}",
-                Config.COLORS['info'],
+                config_service.current.colors['info'],
                 after
             )
         
@@ -348,7 +504,7 @@ class LogsModule(commands.Cog):
                 embed = self.create_log_embed(
                     "🎭 Roles Updated",
                     "\n".join(description_parts),
-                    Config.COLORS['info'],
+                    config_service.current.colors['info'],
                     after
                 )
         
@@ -370,7 +526,7 @@ class LogsModule(commands.Cog):
                 "🔊 Voice Join",
                 f"**Channel:** {after.channel.name}\n"
                 f"**Category:** {after.channel.category.name if after.channel.category else 'None'}",
-                Config.COLORS['success'],
+                config_service.current.colors['success'],
                 member
             )
         
@@ -380,7 +536,7 @@ class LogsModule(commands.Cog):
                 "🔇 Voice Leave",
                 f"**Channel:** {before.channel.name}\n"
                 f"**Category:** {before.channel.category.name if before.channel.category else 'None'}",
-                Config.COLORS['error'],
+                config_service.current.colors['error'],
                 member
             )
         
@@ -390,7 +546,7 @@ class LogsModule(commands.Cog):
                 "🔄 Voice Move",
                 f"**From:** {before.channel.name}\n"
                 f"**To:** {after.channel.name}",
-                Config.COLORS['info'],
+                config_service.current.colors['info'],
                 member
             )
         
@@ -412,7 +568,7 @@ class LogsModule(commands.Cog):
             title="🔨 Member Banned",
             description=f"**User:** {user.mention}\n"
                        f"**Reason:** {reason}",
-            color=Config.COLORS['error'],
+            color=config_service.current.colors['error'],
             timestamp=datetime.utcnow()
         )
         embed.set_author(name=f"{user.display_name} ({user.name}#{user.discriminator})", 
@@ -427,7 +583,7 @@ class LogsModule(commands.Cog):
         embed = discord.Embed(
             title="🔓 Member Unbanned",
             description=f"**User:** {user.mention}",
-            color=Config.COLORS['success'],
+            color=config_service.current.colors['success'],
             timestamp=datetime.utcnow()
         )
         embed.set_author(name=f"{user.display_name} ({user.name}#{user.discriminator})", 
@@ -445,7 +601,7 @@ class LogsModule(commands.Cog):
             description=f"**Channel:** {channel.mention}\n"
                        f"**Type:** {str(channel.type).title()}\n"
                        f"**Category:** {channel.category.name if channel.category else 'None'}",
-            color=Config.COLORS['success'],
+            color=config_service.current.colors['success'],
             timestamp=datetime.utcnow()
         )
         embed.add_field(name="Channel ID", value=channel.id, inline=True)
@@ -460,7 +616,7 @@ class LogsModule(commands.Cog):
             description=f"**Channel:** #{channel.name}\n"
                        f"**Type:** {str(channel.type).title()}\n"
                        f"**Category:** {channel.category.name if channel.category else 'None'}",
-            color=Config.COLORS['error'],
+            color=config_service.current.colors['error'],
             timestamp=datetime.utcnow()
         )
         embed.add_field(name="Channel ID", value=channel.id, inline=True)
@@ -476,7 +632,7 @@ class LogsModule(commands.Cog):
                        f"**Color:** {str(role.color)}\n"
                        f"**Hoisted:** {'Yes' if role.hoist else 'No'}\n"
                        f"**Mentionable:** {'Yes' if role.mentionable else 'No'}",
-            color=Config.COLORS['success'],
+            color=config_service.current.colors['success'],
             timestamp=datetime.utcnow()
         )
         embed.add_field(name="Role ID", value=role.id, inline=True)
@@ -491,7 +647,7 @@ class LogsModule(commands.Cog):
             description=f"**Role:** {role.name}\n"
                        f"**Color:** {str(role.color)}\n"
                        f"**Members:** {len(role.members)}",
-            color=Config.COLORS['error'],
+            color=config_service.current.colors['error'],
             timestamp=datetime.utcnow()
         )
         embed.add_field(name="Role ID", value=role.id, inline=True)
@@ -0,0 +1,75 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import sys
+
+class ClockSession:
+    """One clock-in session: IDs, an epoch start time and flags only
+
+    Holding no discord objects keeps a session small and doesn't keep stale
+    members, channels or messages alive; channel() resolves the channel when a
+    reminder is sent.
+    """
+
+    __slots__ = ('user_id', 'guild_id', 'channel_id', 'start_time', 'timezone', 'reminded', 'reminder_message_id')
+
+    def __init__(self, user_id: int, guild_id: int, channel_id: int, start_time: float, timezone: str):
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.start_time = start_time
+        self.timezone = sys.intern(timezone)  # one string per zone, shared by every session in it
+        self.reminded = False
+        self.reminder_message_id: Optional[int] = None
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.user_id}>"
+
+    def channel(self, bot):
+        """The channel clocked in from (a partial channel if it isn't cached - sending works either way)"""
+        return bot.get_channel(self.channel_id) or bot.get_partial_messageable(
+            self.channel_id, guild_id=self.guild_id or None
+        )
+
+class ClockSessions:
+    """Active clock-in sessions keyed by (guild_id, user_id), with a per-guild index
+
+    The index is updated on every add/remove, so listing or processing one guild's
+    sessions touches only that guild's entries. Guild ID 0 holds sessions started
+    outside a guild (DMs).
+    """
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[int, int], ClockSession] = {}
+        self._by_guild: Dict[int, Dict[int, ClockSession]] = {}  # guild_id: {user_id: session}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._sessions
+
+    def get(self, guild_id: int, user_id: int) -> Optional[ClockSession]:
+        return self._sessions.get((guild_id, user_id))
+
+    def add(self, guild_id: int, user_id: int, session: ClockSession):
+        self._sessions[(guild_id, user_id)] = session
+        self._by_guild.setdefault(guild_id, {})[user_id] = session
+
+    def remove(self, guild_id: int, user_id: int) -> Optional[ClockSession]:
+        session = self._sessions.pop((guild_id, user_id), None)
+        if session is not None:
+            members = self._by_guild[guild_id]
+            del members[user_id]
+            if not members:
+                del self._by_guild[guild_id]
+        return session
+
+    def in_guild(self, guild_id: int) -> Dict[int, ClockSession]:
+        """{user_id: session} for one guild (a live view - copy before awaiting while iterating)"""
+        return self._by_guild.get(guild_id, {})
+
+    def guild_ids(self) -> List[int]:
+        return list(self._by_guild)
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], ClockSession]]:
+        return iter(list(self._sessions.items()))
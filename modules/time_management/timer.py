@@ -1,29 +1,287 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
 import asyncio
-import json
-import os
 from datetime import datetime, timezone
 import pytz
-from utils.user_utils import EmbedBuilder
-from config.config import Config
+from utils.user_utils import EmbedBuilder, PermissionChecker
+from utils.embed_templates import embed_templates
+from utils.time_parser import parse_time
+from utils.storage import timezone_repository
+from modules.time_management.sessions import ClockSession, ClockSessions
+from modules.time_management.timezone_store import TimezoneStore
+from utils.config_service import config_service
 import logging
-from difflib import get_close_matches
+
+# Timezones offered by /list-timezones, by region ("Zone/Name - Description")
+TIMEZONE_REGIONS = {
+    "north_america": {
+        "title": "🇺🇸 North America",
+        "zones": [
+            "America/New_York - Eastern Time (US & Canada)",
+            "America/Chicago - Central Time (US & Canada)",
+            "America/Denver - Mountain Time (US & Canada)", 
+            "America/Phoenix - Arizona (No DST)",
+            "America/Los_Angeles - Pacific Time (US & Canada)",
+            "America/Anchorage - Alaska Time",
+            "Pacific/Honolulu - Hawaii Time",
+            "America/Toronto - Eastern Canada",
+            "America/Vancouver - Pacific Canada",
+            "America/Montreal - Eastern Canada",
+            "America/Winnipeg - Central Canada",
+            "America/Edmonton - Mountain Canada",
+            "America/Halifax - Atlantic Canada",
+            "America/St_Johns - Newfoundland"
+        ]
+    },
+    "south_america": {
+        "title": "🇲🇽 Central & South America",
+        "zones": [
+            "America/Mexico_City - Mexico Central",
+            "America/Tijuana - Mexico Pacific",
+            "America/Cancun - Mexico Eastern",
+            "America/Guatemala - Guatemala",
+            "America/Costa_Rica - Costa Rica",
+            "America/Panama - Panama",
+            "America/Bogota - Colombia",
+            "America/Caracas - Venezuela",
+            "America/Lima - Peru",
+            "America/La_Paz - Bolivia",
+            "America/Santiago - Chile",
+            "America/Argentina/Buenos_Aires - Argentina",
+            "America/Sao_Paulo - Brazil (São Paulo)",
+            "America/Brasilia - Brazil (Brasília)",
+            "America/Manaus - Brazil (Amazonas)"
+        ]
+    },
+    "europe": {
+        "title": "🇬🇧 Europe & UK",
+        "zones": [
+            "Europe/London - United Kingdom (GMT/BST)",
+            "Europe/Dublin - Ireland",
+            "Europe/Paris - France (CET)",
+            "Europe/Berlin - Germany (CET)",
+            "Europe/Amsterdam - Netherlands (CET)",
+            "Europe/Brussels - Belgium (CET)",
+            "Europe/Madrid - Spain (CET)",
+            "Europe/Rome - Italy (CET)",
+            "Europe/Vienna - Austria (CET)",
+            "Europe/Zurich - Switzerland (CET)",
+            "Europe/Stockholm - Sweden (CET)",
+            "Europe/Oslo - Norway (CET)",
+            "Europe/Copenhagen - Denmark (CET)",
+            "Europe/Warsaw - Poland (CET)",
+            "Europe/Prague - Czech Republic (CET)",
+            "Europe/Budapest - Hungary (CET)",
+            "Europe/Athens - Greece (EET)",
+            "Europe/Helsinki - Finland (EET)",
+            "Europe/Moscow - Russia (MSK)",
+            "Europe/Kiev - Ukraine (EET)",
+            "Europe/Istanbul - Turkey (TRT)"
+        ]
+    },
+    "asia_pacific": {
+        "title": "🇯🇵 Asia & Pacific",
+        "zones": [
+            "Asia/Tokyo - Japan (JST)",
+            "Asia/Seoul - South Korea (KST)",
+            "Asia/Shanghai - China (CST)",
+            "Asia/Hong_Kong - Hong Kong",
+            "Asia/Taipei - Taiwan",
+            "Asia/Singapore - Singapore",
+            "Asia/Manila - Philippines",
+            "Asia/Jakarta - Indonesia (Western)",
+            "Asia/Bangkok - Thailand",
+            "Asia/Ho_Chi_Minh - Vietnam",
+            "Asia/Kuala_Lumpur - Malaysia",
+            "Asia/Kolkata - India (IST)",
+            "Asia/Karachi - Pakistan",
+            "Asia/Dhaka - Bangladesh",
+            "Asia/Kathmandu - Nepal",
+            "Asia/Colombo - Sri Lanka",
+            "Asia/Almaty - Kazakhstan",
+            "Asia/Tashkent - Uzbekistan"
+        ]
+    },
+    "africa_middle_east": {
+        "title": "🌍 Africa & Middle East",
+        "zones": [
+            "Africa/Cairo - Egypt",
+            "Africa/Lagos - Nigeria (West Africa)",
+            "Africa/Johannesburg - South Africa",
+            "Africa/Nairobi - Kenya (East Africa)",
+            "Africa/Casablanca - Morocco",
+            "Africa/Tunis - Tunisia",
+            "Africa/Algiers - Algeria",
+            "Asia/Dubai - UAE",
+            "Asia/Riyadh - Saudi Arabia",
+            "Asia/Qatar - Qatar",
+            "Asia/Kuwait - Kuwait",
+            "Asia/Baghdad - Iraq",
+            "Asia/Tehran - Iran",
+            "Asia/Jerusalem - Israel",
+            "Asia/Beirut - Lebanon",
+            "Asia/Damascus - Syria"
+        ]
+    },
+    "oceania": {
+        "title": "🌊 Oceania & Islands",
+        "zones": [
+            "Australia/Sydney - Australia Eastern",
+            "Australia/Melbourne - Australia Eastern",
+            "Australia/Brisbane - Australia Eastern (No DST)",
+            "Australia/Adelaide - Australia Central",
+            "Australia/Perth - Australia Western",
+            "Australia/Darwin - Australia Central (No DST)",
+            "Pacific/Auckland - New Zealand",
+            "Pacific/Fiji - Fiji",
+            "Pacific/Guam - Guam",
+            "Pacific/Tahiti - French Polynesia",
+            "Pacific/Marquesas - Marquesas Islands",
+            "Pacific/Galapagos - Galapagos Islands",
+            "Pacific/Easter - Easter Island"
+        ]
+    },
+    "utc": {
+        "title": "⏰ UTC & Standard Times", 
+        "zones": [
+            "UTC - Coordinated Universal Time",
+            "GMT - Greenwich Mean Time", 
+            "EST - Eastern Standard Time",
+            "CST - Central Standard Time",
+            "MST - Mountain Standard Time",
+            "PST - Pacific Standard Time",
+            "CET - Central European Time",
+            "EET - Eastern European Time",
+            "JST - Japan Standard Time",
+            "IST - India Standard Time",
+            "AEST - Australian Eastern Standard Time"
+        ]
+    }
+}
+
+# Every pytz zone, for the A-Z pages of the /list-timezones browser
+ALL_ZONES_REGION = "all_zones"
+ALL_ZONES_TITLE = "🗺️ All Zones (A-Z)"
+TIMEZONE_PAGE_SIZE = 15
+
+def build_zone_index() -> Dict[str, List[Tuple[str, str]]]:
+    """Sorted (zone, description) list per region"""
+    index = {}
+    for region_key, region_data in TIMEZONE_REGIONS.items():
+        entries = (zone.split(" - ", 1) for zone in region_data['zones'])
+        index[region_key] = sorted((name.strip(), desc.strip()) for name, desc in entries)
+    index[ALL_ZONES_REGION] = [(name, "") for name in sorted(pytz.common_timezones)]
+    return index
+
+_zone_index: Optional[Dict[str, List[Tuple[str, str]]]] = None
+_tz_cache: Dict[str, Optional[pytz.BaseTzInfo]] = {}
+
+def zone_index() -> Dict[str, List[Tuple[str, str]]]:
+    """The zone index, built on first use (loading pytz's zone list costs ~10 ms at startup)"""
+    global _zone_index
+    if _zone_index is None:
+        _zone_index = build_zone_index()
+    return _zone_index
+
+def region_title(region: str) -> str:
+    return ALL_ZONES_TITLE if region == ALL_ZONES_REGION else TIMEZONE_REGIONS[region]['title']
+
+def page_count(region: str) -> int:
+    return max(1, -(-len(zone_index()[region]) // TIMEZONE_PAGE_SIZE))
+
+def current_offsets(zones: List[str]) -> List[Optional[datetime]]:
+    """Local time in each zone, converted from a single UTC timestamp (None for unknown names)"""
+    now = datetime.now(timezone.utc)
+    result = []
+    for name in zones:
+        if name not in _tz_cache:
+            try:
+                _tz_cache[name] = pytz.timezone(name)
+            except pytz.UnknownTimeZoneError:
+                _tz_cache[name] = None
+        tz = _tz_cache[name]
+        result.append(now.astimezone(tz) if tz else None)
+    return result
+
+def format_duration(seconds: int) -> str:
+    """'30 minutes', '1 hour', '45 seconds'"""
+    for unit, size in (("hour", 3600), ("minute", 60)):
+        if seconds >= size and seconds % size == 0:
+            count = seconds // size
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+    return f"{seconds} second{'s' if seconds != 1 else ''}"
+
+def format_offset(local: datetime) -> str:
+    minutes = int(local.utcoffset().total_seconds() // 60)
+    sign = '+' if minutes >= 0 else '-'
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"UTC{sign}{hours:02d}:{minutes:02d}"
+
+def render_timezone_page(region: str, page: int) -> discord.Embed:
+    """Embed for one page of a region; only this page's zones are resolved"""
+    pages = page_count(region)
+    page = max(0, min(page, pages - 1))
+    entries = zone_index()[region][page * TIMEZONE_PAGE_SIZE:(page + 1) * TIMEZONE_PAGE_SIZE]
+    local_times = current_offsets([name for name, _ in entries])
+
+    lines = []
+    for (name, desc), local in zip(entries, local_times):
+        now_text = f"{format_offset(local)}, {local.strftime('%H:%M')}" if local else "abbreviation"
+        lines.append(f"`{name}` ({now_text})" + (f" - {desc}" if desc else ""))
+
+    embed = discord.Embed(
+        title=f"{region_title(region)} Timezones",
+        description="Copy the timezone name into `/set-timezone`\n\n" + "\n".join(lines),
+        color=config_service.current.colors['info']
+    )
+    embed.set_footer(text=f"Page {page + 1}/{pages} • {len(zone_index()[region])} timezones • times are live")
+    return embed
+
+def build_timezone_overview() -> discord.Embed:
+    """Build the static overview of all regions (browser landing page)"""
+    
+    embed = discord.Embed(
+        title="🌍 All Timezone Regions",
+        description="Pick a region from the menu below, then page through it with the buttons.",
+        color=config_service.current.colors['info']
+    )
+    
+    for region_key in zone_index():
+        embed.add_field(
+            name=region_title(region_key),
+            value=f"{len(zone_index()[region_key])} timezones available",
+            inline=True
+        )
+    
+    embed.add_field(
+        name="💡 How to Use",
+        value="1. Find your timezone in the list\n"
+              "2. Copy the zone name (e.g., `America/New_York`)\n"
+              "3. Use `/set-timezone America/New_York`\n"
+              "4. Then use `/mytimezone` to see your time!",
+        inline=False
+    )
+    
+    embed.set_footer(text="Each zone shows its current UTC offset and local time")
+    return embed
 
 class TimeManagement(commands.Cog):
     """Time Management Module - Handle timers, timezone conversion, and clock in/out system"""
     
+    # Clock-out reminders wait for reactions
+    REQUIRED_INTENTS = ('guilds', 'guild_messages', 'guild_reactions')
+    
     def __init__(self, bot):
         self.bot = bot
-        self.active_sessions = {}  # user_id: session_data
-        self.timezone_db = {}  # user_id: timezone_string
-        self.load_timezone_data()
+        self.active_sessions = ClockSessions()  # (guild_id, user_id): ClockSession
+        self.timezone_db = TimezoneStore()  # user_id: timezone name (loaded in cog_load)
         # Don't start the task here - it will be started when the cog is loaded
     
     async def cog_load(self):
-        """Called when the cog is loaded - start the background task"""
+        """Called when the cog is loaded - load timezones and start the background task"""
+        await self.load_timezone_data()
         self.check_clockin_timeout.start()
         logging.info("TimeManagement cog loaded and clock timeout task started")
     
@@ -32,24 +290,21 @@ class TimeManagement(commands.Cog):
         self.check_clockin_timeout.cancel()
         logging.info("TimeManagement cog unloaded and clock timeout task stopped")
     
-    def load_timezone_data(self):
-        """Load timezone preferences from file"""
-        try:
-            if os.path.exists('data/timezones.json'):
-                with open('data/timezones.json', 'r') as f:
-                    self.timezone_db = json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading timezone data: {e}")
-            self.timezone_db = {}
+    def export_state(self) -> dict:
+        """In-memory state handed to the new instance when the cog is reloaded"""
+        # The same dict, so reminder tasks still running from the old instance stay in sync
+        return {'active_sessions': self.active_sessions}
+    
+    def import_state(self, state: dict):
+        self.active_sessions = state['active_sessions']
     
-    def save_timezone_data(self):
-        """Save timezone preferences to file"""
+    async def load_timezone_data(self):
+        """Load timezone preferences from the database"""
         try:
-            os.makedirs('data', exist_ok=True)
-            with open('data/timezones.json', 'w') as f:
-                json.dump(self.timezone_db, f, indent=2)
+            self.timezone_db = await timezone_repository.load(TimezoneStore.from_rows)
         except Exception as e:
-            logging.error(f"Error saving timezone data: {e}")
+            logging.error(f"Error loading timezone data: {e}")
+            self.timezone_db = TimezoneStore()
     
     def get_all_timezone_names(self):
         """Get all timezone names for fuzzy matching"""
@@ -187,6 +442,7 @@ class TimeManagement(commands.Cog):
             return partial_matches[:limit]
         
         # Fuzzy matching as fallback
+        from difflib import get_close_matches
         matches = get_close_matches(user_input, all_timezones, n=limit, cutoff=0.4)
         return matches
     
@@ -201,8 +457,8 @@ class TimeManagement(commands.Cog):
             tz = pytz.timezone(timezone)
             
             # Save timezone
-            self.timezone_db[str(interaction.user.id)] = timezone
-            self.save_timezone_data()
+            self.timezone_db.set(interaction.user.id, timezone)
+            await timezone_repository.set(interaction.user.id, timezone)
             
             # Show current time in their timezone
             current_time = datetime.now(tz).strftime("%I:%M:%S %p %Z on %A, %B %d, %Y")
@@ -240,8 +496,8 @@ class TimeManagement(commands.Cog):
                     tz = pytz.timezone(matched_tz)
                     
                     # Save timezone
-                    self.timezone_db[str(interaction.user.id)] = matched_tz
-                    self.save_timezone_data()
+                    self.timezone_db.set(interaction.user.id, matched_tz)
+                    await timezone_repository.set(interaction.user.id, matched_tz)
                     
                     # Show current time
                     current_time = datetime.now(tz).strftime("%I:%M:%S %p %Z on %A, %B %d, %Y")
@@ -261,7 +517,7 @@ class TimeManagement(commands.Cog):
             embed = discord.Embed(
                 title="🤔 Multiple Timezone Matches Found",
                 description=f"Found {len(matches)} possible matches for '{timezone}'. Please choose one:",
-                color=Config.COLORS['warning']
+                color=config_service.current.colors['warning']
             )
             
             match_list = []
@@ -291,14 +547,14 @@ class TimeManagement(commands.Cog):
     @app_commands.command(name="time", description="Get current time in your timezone or convert between timezones")
     @app_commands.describe(
         target_timezone="Timezone to show time for (optional, uses your saved timezone)",
-        time_to_convert="Time to convert (format: HH:MM or YYYY-MM-DD HH:MM)"
+        time_to_convert="Time to convert, e.g. 14:30, 2:30pm, 2024-12-25 14:30, in 2h, tomorrow 9am"
     )
     async def get_time(self, interaction: discord.Interaction, 
                       target_timezone: Optional[str] = None,
                       time_to_convert: Optional[str] = None):
         """Get current time or convert time between timezones"""
         
-        user_tz_name = self.timezone_db.get(str(interaction.user.id))
+        user_tz_name = self.timezone_db.get(interaction.user.id)
         
         # If no timezone specified, use user's saved timezone or UTC
         if not target_timezone:
@@ -320,20 +576,9 @@ class TimeManagement(commands.Cog):
             if time_to_convert:
                 # Convert specific time
                 try:
-                    # Parse time string
-                    if len(time_to_convert.split()) == 1:  # Just time (HH:MM)
-                        time_obj = datetime.strptime(time_to_convert, "%H:%M")
-                        today = datetime.now().date()
-                        time_obj = datetime.combine(today, time_obj.time())
-                    else:  # Date and time
-                        time_obj = datetime.strptime(time_to_convert, "%Y-%m-%d %H:%M")
-                    
-                    # Assume input is in user's timezone if they have one set
-                    if user_tz_name:
-                        user_tz = pytz.timezone(user_tz_name)
-                        localized_time = user_tz.localize(time_obj)
-                    else:
-                        localized_time = pytz.utc.localize(time_obj)
+                    # Times without a date use today's date in the user's timezone (UTC if unset)
+                    user_tz = pytz.timezone(user_tz_name) if user_tz_name else pytz.utc
+                    localized_time = parse_time(time_to_convert, user_tz)
                     
                     # Convert to target timezone
                     converted_time = localized_time.astimezone(target_tz)
@@ -349,7 +594,8 @@ class TimeManagement(commands.Cog):
                     await interaction.response.send_message(
                         embed=EmbedBuilder.error_embed(
                             "Invalid Time Format",
-                            "Please use format: `HH:MM` or `YYYY-MM-DD HH:MM`\nExample: `14:30` or `2024-12-25 14:30`"
+                            "Try `14:30`, `2:30pm`, `2024-12-25 14:30`, `2024-12-25T14:30Z`, "
+                            "`in 2h`, `tomorrow 9am` or `next friday noon`"
                         ),
                         ephemeral=True
                     )
@@ -360,7 +606,7 @@ class TimeManagement(commands.Cog):
                 
                 embed = discord.Embed(
                     title="🕐 Current Time",
-                    color=Config.COLORS['info']
+                    color=config_service.current.colors['info']
                 )
                 embed.add_field(
                     name="Time",
@@ -403,7 +649,7 @@ class TimeManagement(commands.Cog):
     async def my_timezone(self, interaction: discord.Interaction):
         """Show user's current timezone and local time"""
         
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
         user_tz_name = self.timezone_db.get(user_id)
         
         if not user_tz_name:
@@ -413,7 +659,7 @@ class TimeManagement(commands.Cog):
             embed = discord.Embed(
                 title="⏰ Your Timezone Info",
                 description="You haven't set your timezone yet!",
-                color=Config.COLORS['warning']
+                color=config_service.current.colors['warning']
             )
             
             embed.add_field(
@@ -453,7 +699,7 @@ class TimeManagement(commands.Cog):
                 
                 embed = discord.Embed(
                     title="🌍 Your Current Time",
-                    color=Config.COLORS['success']
+                    color=config_service.current.colors['success']
                 )
                 
                 # Main time display - large and prominent
@@ -497,7 +743,7 @@ class TimeManagement(commands.Cog):
                 embed = discord.Embed(
                     title="❌ Timezone Error",
                     description=f"Your saved timezone '{user_tz_name}' is no longer valid.",
-                    color=Config.COLORS['error']
+                    color=config_service.current.colors['error']
                 )
                 embed.add_field(
                     name="What to do",
@@ -506,13 +752,13 @@ class TimeManagement(commands.Cog):
                     inline=False
                 )
                 # Remove invalid timezone from database
-                del self.timezone_db[user_id]
-                self.save_timezone_data()
+                self.timezone_db.remove(user_id)
+                await timezone_repository.delete(user_id)
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(name="list-timezones", description="Browse all available timezones by region")
-    @app_commands.describe(region="Filter by region (optional)")
+    @app_commands.describe(region="Region to open the browser on (optional)")
     @app_commands.choices(region=[
         app_commands.Choice(name="🇺🇸 North America", value="north_america"),
         app_commands.Choice(name="🇲🇽 Central/South America", value="south_america"),
@@ -520,204 +766,16 @@ class TimeManagement(commands.Cog):
         app_commands.Choice(name="🇯🇵 Asia/Pacific", value="asia_pacific"),
         app_commands.Choice(name="🌍 Africa/Middle East", value="africa_middle_east"),
         app_commands.Choice(name="🌊 Oceania/Islands", value="oceania"),
-        app_commands.Choice(name="⏰ UTC/GMT", value="utc")
+        app_commands.Choice(name="⏰ UTC/GMT", value="utc"),
+        app_commands.Choice(name="🗺️ All zones (A-Z)", value=ALL_ZONES_REGION)
     ])
     async def list_timezones(self, interaction: discord.Interaction, region: str = None):
-        """Show comprehensive list of timezones by region"""
-        
-        all_timezones = {
-            "north_america": {
-                "title": "🇺🇸 North America",
-                "zones": [
-                    "America/New_York - Eastern Time (US & Canada)",
-                    "America/Chicago - Central Time (US & Canada)",
-                    "America/Denver - Mountain Time (US & Canada)", 
-                    "America/Phoenix - Arizona (No DST)",
-                    "America/Los_Angeles - Pacific Time (US & Canada)",
-                    "America/Anchorage - Alaska Time",
-                    "Pacific/Honolulu - Hawaii Time",
-                    "America/Toronto - Eastern Canada",
-                    "America/Vancouver - Pacific Canada",
-                    "America/Montreal - Eastern Canada",
-                    "America/Winnipeg - Central Canada",
-                    "America/Edmonton - Mountain Canada",
-                    "America/Halifax - Atlantic Canada",
-                    "America/St_Johns - Newfoundland"
-                ]
-            },
-            "south_america": {
-                "title": "🇲🇽 Central & South America",
-                "zones": [
-                    "America/Mexico_City - Mexico Central",
-                    "America/Tijuana - Mexico Pacific",
-                    "America/Cancun - Mexico Eastern",
-                    "America/Guatemala - Guatemala",
-                    "America/Costa_Rica - Costa Rica",
-                    "America/Panama - Panama",
-                    "America/Bogota - Colombia",
-                    "America/Caracas - Venezuela",
-                    "America/Lima - Peru",
-                    "America/La_Paz - Bolivia",
-                    "America/Santiago - Chile",
-                    "America/Argentina/Buenos_Aires - Argentina",
-                    "America/Sao_Paulo - Brazil (São Paulo)",
-                    "America/Brasilia - Brazil (Brasília)",
-                    "America/Manaus - Brazil (Amazonas)"
-                ]
-            },
-            "europe": {
-                "title": "🇬🇧 Europe & UK",
-                "zones": [
-                    "Europe/London - United Kingdom (GMT/BST)",
-                    "Europe/Dublin - Ireland",
-                    "Europe/Paris - France (CET)",
-                    "Europe/Berlin - Germany (CET)",
-                    "Europe/Amsterdam - Netherlands (CET)",
-                    "Europe/Brussels - Belgium (CET)",
-                    "Europe/Madrid - Spain (CET)",
-                    "Europe/Rome - Italy (CET)",
-                    "Europe/Vienna - Austria (CET)",
-                    "Europe/Zurich - Switzerland (CET)",
-                    "Europe/Stockholm - Sweden (CET)",
-                    "Europe/Oslo - Norway (CET)",
-                    "Europe/Copenhagen - Denmark (CET)",
-                    "Europe/Warsaw - Poland (CET)",
-                    "Europe/Prague - Czech Republic (CET)",
-                    "Europe/Budapest - Hungary (CET)",
-                    "Europe/Athens - Greece (EET)",
-                    "Europe/Helsinki - Finland (EET)",
-                    "Europe/Moscow - Russia (MSK)",
-                    "Europe/Kiev - Ukraine (EET)",
-                    "Europe/Istanbul - Turkey (TRT)"
-                ]
-            },
-            "asia_pacific": {
-                "title": "🇯🇵 Asia & Pacific",
-                "zones": [
-                    "Asia/Tokyo - Japan (JST)",
-                    "Asia/Seoul - South Korea (KST)",
-                    "Asia/Shanghai - China (CST)",
-                    "Asia/Hong_Kong - Hong Kong",
-                    "Asia/Taipei - Taiwan",
-                    "Asia/Singapore - Singapore",
-                    "Asia/Manila - Philippines",
-                    "Asia/Jakarta - Indonesia (Western)",
-                    "Asia/Bangkok - Thailand",
-                    "Asia/Ho_Chi_Minh - Vietnam",
-                    "Asia/Kuala_Lumpur - Malaysia",
-                    "Asia/Kolkata - India (IST)",
-                    "Asia/Karachi - Pakistan",
-                    "Asia/Dhaka - Bangladesh",
-                    "Asia/Kathmandu - Nepal",
-                    "Asia/Colombo - Sri Lanka",
-                    "Asia/Almaty - Kazakhstan",
-                    "Asia/Tashkent - Uzbekistan"
-                ]
-            },
-            "africa_middle_east": {
-                "title": "🌍 Africa & Middle East",
-                "zones": [
-                    "Africa/Cairo - Egypt",
-                    "Africa/Lagos - Nigeria (West Africa)",
-                    "Africa/Johannesburg - South Africa",
-                    "Africa/Nairobi - Kenya (East Africa)",
-                    "Africa/Casablanca - Morocco",
-                    "Africa/Tunis - Tunisia",
-                    "Africa/Algiers - Algeria",
-                    "Asia/Dubai - UAE",
-                    "Asia/Riyadh - Saudi Arabia",
-                    "Asia/Qatar - Qatar",
-                    "Asia/Kuwait - Kuwait",
-                    "Asia/Baghdad - Iraq",
-                    "Asia/Tehran - Iran",
-                    "Asia/Jerusalem - Israel",
-                    "Asia/Beirut - Lebanon",
-                    "Asia/Damascus - Syria"
-                ]
-            },
-            "oceania": {
-                "title": "🌊 Oceania & Islands",
-                "zones": [
-                    "Australia/Sydney - Australia Eastern",
-                    "Australia/Melbourne - Australia Eastern",
-                    "Australia/Brisbane - Australia Eastern (No DST)",
-                    "Australia/Adelaide - Australia Central",
-                    "Australia/Perth - Australia Western",
-                    "Australia/Darwin - Australia Central (No DST)",
-                    "Pacific/Auckland - New Zealand",
-                    "Pacific/Fiji - Fiji",
-                    "Pacific/Guam - Guam",
-                    "Pacific/Tahiti - French Polynesia",
-                    "Pacific/Marquesas - Marquesas Islands",
-                    "Pacific/Galapagos - Galapagos Islands",
-                    "Pacific/Easter - Easter Island"
-                ]
-            },
-            "utc": {
-                "title": "⏰ UTC & Standard Times", 
-                "zones": [
-                    "UTC - Coordinated Universal Time",
-                    "GMT - Greenwich Mean Time", 
-                    "EST - Eastern Standard Time",
-                    "CST - Central Standard Time",
-                    "MST - Mountain Standard Time",
-                    "PST - Pacific Standard Time",
-                    "CET - Central European Time",
-                    "EET - Eastern European Time",
-                    "JST - Japan Standard Time",
-                    "IST - India Standard Time",
-                    "AEST - Australian Eastern Standard Time"
-                ]
-            }
-        }
-        
-        if region and region in all_timezones:
-            # Show specific region
-            region_data = all_timezones[region]
-            embed = discord.Embed(
-                title=f"{region_data['title']} Timezones",
-                description="Copy and paste the timezone name (before the dash) into `/set-timezone`",
-                color=Config.COLORS['info']
-            )
-            
-            # Split zones into chunks of 10 for readability
-            zones = region_data['zones']
-            for i in range(0, len(zones), 10):
-                chunk = zones[i:i+10]
-                field_name = f"Timezones {i//10 + 1}" if len(zones) > 10 else "Available Timezones"
-                embed.add_field(
-                    name=field_name,
-                    value="\n".join([f"`{tz}`" for tz in chunk]),
-                    inline=False
-                )
-                
-        else:
-            # Show all regions overview
-            embed = discord.Embed(
-                title="🌍 All Timezone Regions",
-                description="Choose a region to see detailed timezone list, or use the command with a region filter.",
-                color=Config.COLORS['info']
-            )
-            
-            for region_key, region_data in all_timezones.items():
-                zone_count = len(region_data['zones'])
-                embed.add_field(
-                    name=region_data['title'],
-                    value=f"{zone_count} timezones available\nUse `/list-timezones region:{region_key}`",
-                    inline=True
-                )
+        """Interactive timezone browser: region menu plus paged zone lists with live offsets"""
         
-        embed.add_field(
-            name="💡 How to Use",
-            value="1. Find your timezone in the list\n"
-                  "2. Copy the name before the dash (e.g., `America/New_York`)\n"
-                  "3. Use `/set-timezone America/New_York`\n"
-                  "4. Then use `/mytimezone` to see your time!",
-            inline=False
-        )
-        
-        embed.set_footer(text="Need help? The timezone name is always the part before the ' - ' dash")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        if region not in zone_index():
+            region = None
+        view = TimezoneBrowser(interaction.user.id, region)
+        await interaction.response.send_message(embed=view.render(), view=view, ephemeral=True)
     
     # CLOCK IN/OUT SYSTEM
     @app_commands.command(name="clockin", description="Clock in to start a work session")
@@ -725,11 +783,12 @@ class TimeManagement(commands.Cog):
         """Clock in to start a work session"""
         
         user_id = interaction.user.id
+        guild_id = interaction.guild_id or 0
         
-        # Check if already clocked in
-        if user_id in self.active_sessions:
-            current_session = self.active_sessions[user_id]
-            start_time = datetime.fromtimestamp(current_session['start_time'])
+        # Check if already clocked in (in this server - sessions in other servers are separate)
+        current_session = self.active_sessions.get(guild_id, user_id)
+        if current_session:
+            start_time = datetime.fromtimestamp(current_session.start_time)
             
             await interaction.response.send_message(
                 embed=EmbedBuilder.warning_embed(
@@ -742,7 +801,7 @@ class TimeManagement(commands.Cog):
             return
         
         # Get user's timezone
-        user_tz_name = self.timezone_db.get(str(user_id))
+        user_tz_name = self.timezone_db.get(user_id)
         if user_tz_name:
             user_tz = pytz.timezone(user_tz_name)
             clock_time = datetime.now(user_tz)
@@ -751,22 +810,16 @@ class TimeManagement(commands.Cog):
             user_tz_name = "UTC"
         
         # Start session
-        session_data = {
-            'start_time': clock_time.timestamp(),
-            'user': interaction.user,
-            'channel': interaction.channel,
-            'timezone': user_tz_name,
-            'reminded': False
-        }
+        session = ClockSession(user_id, guild_id, interaction.channel_id, clock_time.timestamp(), user_tz_name)
         
-        self.active_sessions[user_id] = session_data
+        self.active_sessions.add(guild_id, user_id, session)
         
         # Create embed
         embed = EmbedBuilder.success_embed(
             "🕐 Clocked In",
             f"**Time:** {clock_time.strftime('%H:%M:%S %Z')}\n"
             f"**Date:** {clock_time.strftime('%Y-%m-%d')}\n\n"
-            f"You'll be reminded after 30 minutes if you're still clocked in."
+            f"You'll be reminded after {format_duration(config_service.guild(interaction.guild_id).clockin_timeout)} if you're still clocked in."
         )
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -776,9 +829,10 @@ class TimeManagement(commands.Cog):
         """Clock out to end work session"""
         
         user_id = interaction.user.id
+        guild_id = interaction.guild_id or 0
         
         # Check if clocked in
-        if user_id not in self.active_sessions:
+        if (guild_id, user_id) not in self.active_sessions:
             await interaction.response.send_message(
                 embed=EmbedBuilder.warning_embed(
                     "Not Clocked In",
@@ -789,13 +843,13 @@ class TimeManagement(commands.Cog):
             return
         
         # Get session data
-        session = self.active_sessions[user_id]
+        session = self.active_sessions.get(guild_id, user_id)
         
         # Get user's timezone
-        user_tz_name = session['timezone']
+        user_tz_name = session.timezone
         user_tz = pytz.timezone(user_tz_name)
         
-        start_time = datetime.fromtimestamp(session['start_time'], user_tz)
+        start_time = datetime.fromtimestamp(session.start_time, user_tz)
         end_time = datetime.now(user_tz)
         
         # Calculate duration
@@ -804,7 +858,7 @@ class TimeManagement(commands.Cog):
         minutes, seconds = divmod(remainder, 60)
         
         # Remove from active sessions
-        del self.active_sessions[user_id]
+        self.active_sessions.remove(guild_id, user_id)
         
         # Create embed
         embed = EmbedBuilder.success_embed(
@@ -822,18 +876,18 @@ class TimeManagement(commands.Cog):
         """Check current clock status"""
         
         user_id = interaction.user.id
+        session = self.active_sessions.get(interaction.guild_id or 0, user_id)
         
-        if user_id not in self.active_sessions:
+        if not session:
             embed = EmbedBuilder.info_embed(
                 "🕐 Clock Status",
                 "You are currently **not clocked in**.\n\nUse `/clockin` to start a work session."
             )
         else:
-            session = self.active_sessions[user_id]
             
             # Get timezone info
-            user_tz = pytz.timezone(session['timezone'])
-            start_time = datetime.fromtimestamp(session['start_time'], user_tz)
+            user_tz = pytz.timezone(session.timezone)
+            start_time = datetime.fromtimestamp(session.start_time, user_tz)
             current_time = datetime.now(user_tz)
             
             # Calculate duration
@@ -846,112 +900,156 @@ class TimeManagement(commands.Cog):
                 f"You are currently **clocked in**.\n\n"
                 f"**Started:** {start_time.strftime('%H:%M:%S')}\n"
                 f"**Duration:** {hours}h {minutes}m {seconds}s\n"
-                f"**Timezone:** {session['timezone']}"
+                f"**Timezone:** {session.timezone}"
             )
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
-    
+
+    @app_commands.command(name="on-shift", description="List members clocked in on this server")
+    async def on_shift(self, interaction: discord.Interaction):
+        """List this server's active clock-in sessions"""
+
+        if not interaction.guild or not PermissionChecker.has_admin_perms(interaction.user):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error_embed("Access Denied", "You need administrator permissions to use this command."),
+                ephemeral=True
+            )
+            return
+
+        sessions = self.active_sessions.in_guild(interaction.guild_id)
+        if not sessions:
+            embed = EmbedBuilder.info_embed("🕐 On Shift", "Nobody is clocked in on this server.")
+        else:
+            now = datetime.now().timestamp()
+            # Longest-running first
+            ordered = sorted(sessions.items(), key=lambda item: item[1].start_time)
+            lines = []
+            for user_id, session in ordered[:25]:
+                hours, remainder = divmod(int(now - session.start_time), 3600)
+                lines.append(f"<@{user_id}> - {hours}h {remainder // 60}m (since <t:{int(session.start_time)}:t>)")
+            embed = EmbedBuilder.info_embed("🕐 On Shift", "\n".join(lines))
+            if len(ordered) > 25:
+                embed.set_footer(text=f"... and {len(ordered) - 25} more")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @tasks.loop(minutes=1)
     async def check_clockin_timeout(self):
         """Check for users who need to be reminded about clocking out"""
         current_time = datetime.now().timestamp()
+        settings = config_service.current
         
-        for user_id, session in list(self.active_sessions.items()):
-            # Check if timeout period has passed and user hasn't been reminded
-            if (current_time - session['start_time'] >= Config.CLOCKIN_TIMEOUT and 
-                not session['reminded']):
-                
-                try:
-                    # Create reminder embed
-                    timeout_text = "5 seconds" if Config.CLOCKIN_TIMEOUT == 5 else "30 minutes"
-                    embed = EmbedBuilder.warning_embed(
-                        "⏰ Clock Out Reminder",
-                        f"You've been clocked in for {timeout_text}!\n\n"
-                        f"React with {Config.EMOJIS['tick']} to continue working\n"
-                        f"React with {Config.EMOJIS['cross']} to clock out now\n\n"
-                        f"If you don't respond, you'll be automatically clocked out."
-                    )
-                    
-                    # Send reminder
-                    user = session['user']
-                    message = await session['channel'].send(f"{user.mention}", embed=embed)
-                    
-                    # Add reactions
-                    await message.add_reaction(Config.EMOJIS['tick'])
-                    await message.add_reaction(Config.EMOJIS['cross'])
-                    
-                    # Mark as reminded
-                    session['reminded'] = True
-                    session['reminder_message'] = message
-                    
-                    # Wait for reaction or timeout
-                    self.bot.loop.create_task(
-                        self.handle_clockout_reminder(user_id, message)
-                    )
-                    
-                except Exception as e:
-                    logging.error(f"Error sending clock reminder: {e}")
+        # Guild by guild, so each guild's own timeout applies
+        for guild_id in self.active_sessions.guild_ids():
+            timeout = settings.guild(guild_id).clockin_timeout
+            for user_id, session in list(self.active_sessions.in_guild(guild_id).items()):
+                # Check if timeout period has passed and user hasn't been reminded
+                if current_time - session.start_time >= timeout and not session.reminded:
+                    await self.send_clockout_reminder(guild_id, user_id, session, timeout, settings.emojis)
+    
+    async def send_clockout_reminder(self, guild_id: int, user_id: int, session: ClockSession, timeout: int, emojis):
+        """Ask the user whether they're still working (emojis: the current reaction emojis)"""
+        try:
+            # Create reminder embed
+            embed = EmbedBuilder.warning_embed(
+                "⏰ Clock Out Reminder",
+                f"You've been clocked in for {format_duration(timeout)}!\n\n"
+                f"React with {emojis['tick']} to continue working\n"
+                f"React with {emojis['cross']} to clock out now\n\n"
+                f"If you don't respond, you'll be automatically clocked out."
+            )
+            
+            # Send reminder
+            message = await session.channel(self.bot).send(session.mention, embed=embed)
+            
+            # Add reactions
+            await message.add_reaction(emojis['tick'])
+            await message.add_reaction(emojis['cross'])
+            
+            # Mark as reminded
+            session.reminded = True
+            session.reminder_message_id = message.id
+            
+            # Wait for reaction or timeout
+            self.bot.loop.create_task(
+                self.handle_clockout_reminder(guild_id, user_id, message.id, emojis)
+            )
+            
+        except Exception as e:
+            logging.error(f"Error sending clock reminder: {e}")
+    
+    def reminded_session(self, guild_id: int, user_id: int, message_id: int) -> Optional[ClockSession]:
+        """The session a reminder was sent for, or None if it has ended (or been restarted) since"""
+        session = self.active_sessions.get(guild_id, user_id)
+        return session if session and session.reminder_message_id == message_id else None
     
-    async def handle_clockout_reminder(self, user_id: int, message: discord.Message):
-        """Handle the clock out reminder reaction"""
+    def end_session(self, guild_id: int, user_id: int, reminder_message_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Clock a user out; returns the session length as (hours, minutes), or None if not clocked in
+
+        With reminder_message_id, only the session that reminder was sent for is ended.
+        """
+        if reminder_message_id is not None and not self.reminded_session(guild_id, user_id, reminder_message_id):
+            return None
+        session = self.active_sessions.remove(guild_id, user_id)
+        if session is None:
+            return None
+        user_tz = pytz.timezone(session.timezone)
+        start_time = datetime.fromtimestamp(session.start_time, user_tz)
+        duration = datetime.now(user_tz) - start_time
+        hours, remainder = divmod(int(duration.total_seconds()), 3600)
+        return hours, remainder // 60
+    
+    async def handle_clockout_reminder(self, guild_id: int, user_id: int, message_id: int, emojis):
+        """Handle the clock out reminder reaction (emojis: the ones the reminder was sent with)"""
         try:
             # Wait for reaction
             def check(reaction, user):
                 return (user.id == user_id and 
-                       str(reaction.emoji) in [Config.EMOJIS['tick'], Config.EMOJIS['cross']] and
-                       reaction.message.id == message.id)
+                       str(reaction.emoji) in [emojis['tick'], emojis['cross']] and
+                       reaction.message.id == message_id)
             
             try:
                 reaction, user = await self.bot.wait_for('reaction_add', check=check, timeout=300)  # 5 minutes
+            except asyncio.TimeoutError:
+                reaction = None
+            
+            # The user may have clocked out (and in again) meanwhile - then this reminder is stale
+            session = self.reminded_session(guild_id, user_id, message_id)
+            if session is None:
+                return
+            message = session.channel(self.bot).get_partial_message(message_id)
+            
+            if reaction is not None and str(reaction.emoji) == emojis['tick']:
+                # Continue working - reset timer
+                session.start_time = datetime.now().timestamp()
+                session.reminded = False
+                session.reminder_message_id = None
                 
-                if str(reaction.emoji) == Config.EMOJIS['tick']:
-                    # Continue working - reset timer
-                    if user_id in self.active_sessions:
-                        self.active_sessions[user_id]['start_time'] = datetime.now().timestamp()
-                        self.active_sessions[user_id]['reminded'] = False
-                    
+                await message.edit(
+                    embed=EmbedBuilder.success_embed(
+                        "✅ Continuing Work",
+                        "Your work session continues. Timer has been reset."
+                    )
+                )
+                
+            elif reaction is not None:
+                # Clock out
+                ended = self.end_session(guild_id, user_id, message_id)
+                if ended:
+                    hours, minutes = ended
                     await message.edit(
                         embed=EmbedBuilder.success_embed(
-                            "✅ Continuing Work",
-                            "Your work session continues. Timer has been reset."
+                            "🕐 Clocked Out",
+                            f"You have been clocked out.\n"
+                            f"Total session: {hours}h {minutes}m"
                         )
                     )
-                    
-                elif str(reaction.emoji) == Config.EMOJIS['cross']:
-                    # Clock out
-                    if user_id in self.active_sessions:
-                        # Calculate final duration
-                        session = self.active_sessions[user_id]
-                        user_tz = pytz.timezone(session['timezone'])
-                        start_time = datetime.fromtimestamp(session['start_time'], user_tz)
-                        end_time = datetime.now(user_tz)
-                        duration = end_time - start_time
-                        hours, remainder = divmod(int(duration.total_seconds()), 3600)
-                        minutes, _ = divmod(remainder, 60)
-                        
-                        del self.active_sessions[user_id]
-                        
-                        await message.edit(
-                            embed=EmbedBuilder.success_embed(
-                                "🕐 Clocked Out",
-                                f"You have been clocked out.\n"
-                                f"Total session: {hours}h {minutes}m"
-                            )
-                        )
-                
-            except asyncio.TimeoutError:
+            
+            else:
                 # Auto clock out
-                if user_id in self.active_sessions:
-                    session = self.active_sessions[user_id]
-                    user_tz = pytz.timezone(session['timezone'])
-                    start_time = datetime.fromtimestamp(session['start_time'], user_tz)
-                    end_time = datetime.now(user_tz)
-                    duration = end_time - start_time
-                    hours, remainder = divmod(int(duration.total_seconds()), 3600)
-                    minutes, _ = divmod(remainder, 60)
-                    
-                    del self.active_sessions[user_id]
-                    
+                ended = self.end_session(guild_id, user_id, message_id)
+                if ended:
+                    hours, minutes = ended
                     await message.edit(
                         embed=EmbedBuilder.warning_embed(
                             "⏰ Auto Clocked Out",
@@ -967,5 +1065,53 @@ class TimeManagement(commands.Cog):
     async def before_check_clockin_timeout(self):
         await self.bot.wait_until_ready()
 
+class TimezoneBrowser(discord.ui.View):
+    """Paged /list-timezones browser; pages are rendered only when shown"""
+    
+    def __init__(self, user_id: int, region: str = None):
+        super().__init__(timeout=300)
+        self.user_id = user_id
+        self.region = region
+        self.page = 0
+        self.update_buttons()
+    
+    def render(self) -> discord.Embed:
+        if self.region is None:
+            return embed_templates.get("timezones:overview", build_timezone_overview)
+        return render_timezone_page(self.region, self.page)
+    
+    def update_buttons(self):
+        pages = page_count(self.region) if self.region else 1
+        self.previous_page.disabled = self.region is None or self.page == 0
+        self.next_page.disabled = self.region is None or self.page >= pages - 1
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.user_id
+    
+    async def show(self, interaction: discord.Interaction):
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+    
+    @discord.ui.select(
+        placeholder="Choose a region",
+        options=[
+            discord.SelectOption(label=data['title'], value=key) for key, data in TIMEZONE_REGIONS.items()
+        ] + [discord.SelectOption(label=ALL_ZONES_TITLE, value=ALL_ZONES_REGION)]
+    )
+    async def choose_region(self, interaction: discord.Interaction, select: discord.ui.Select):
+        self.region = select.values[0]
+        self.page = 0
+        await self.show(interaction)
+    
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(self.page - 1, 0)
+        await self.show(interaction)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.page + 1, page_count(self.region) - 1)
+        await self.show(interaction)
+
 async def setup(bot):
     await bot.add_cog(TimeManagement(bot))
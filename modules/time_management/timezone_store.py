@@ -0,0 +1,118 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress, islice
+from operator import itemgetter, lt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class _ZoneIds(dict):
+    """zone name: zone index, adding unseen zones to the store's table on lookup"""
+
+    def __init__(self, store: 'TimezoneStore'):
+        super().__init__()
+        self.store = store
+
+    def __missing__(self, timezone: str) -> int:
+        zone = self[timezone] = self.store._zone_id(timezone)
+        return zone
+
+class TimezoneStore:
+    """User timezone preferences, compact enough for millions of users
+
+    Zone names are interned into a small table and referred to by index. Users
+    are kept in two parallel arrays sorted by user ID - 8 bytes for the ID and
+    2 for the zone per user, instead of a dict entry with two strings - so a
+    lookup is a binary search and a change is an insert into the arrays
+    (rare next to lookups).
+    """
+
+    def __init__(self):
+        self._zones: List[str] = []  # zone index: zone name
+        self._zone_ids: Dict[str, int] = {}  # zone name: zone index
+        self._counts: List[int] = []  # zone index: users in that zone
+        self._users = array('q')  # sorted user IDs
+        self._user_zones = array('H')  # zone index of each user in _users
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str]], chunk_size: int = 65536) -> 'TimezoneStore':
+        """Bulk load (user_id, timezone) rows, fastest when already sorted by user ID"""
+        store = cls()
+        users, user_zones = store._users, store._user_zones
+        zone_ids = _ZoneIds(store)
+        rows = iter(rows)
+        # Chunk by chunk so the per-row work runs in C (map/itemgetter) without holding every row
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            users.extend(map(itemgetter(0), chunk))
+            user_zones.extend(map(zone_ids.__getitem__, map(itemgetter(1), chunk)))
+        if not all(map(lt, users, islice(users, 1, None))):
+            # Sort the pairs once; on a duplicate user ID the later row wins, as it would in a dict
+            latest = dict(zip(users, user_zones))
+            store._users = array('q', sorted(latest))
+            store._user_zones = array('H', map(latest.__getitem__, store._users))
+        store._counts = [0] * len(store._zones)
+        for zone, count in Counter(store._user_zones).items():
+            store._counts[zone] = count
+        return store
+
+    def _zone_id(self, timezone: str) -> int:
+        zone = self._zone_ids.get(timezone)
+        if zone is None:
+            zone = self._zone_ids[timezone] = len(self._zones)
+            self._zones.append(timezone)
+            self._counts.append(0)
+        return zone
+
+    def _index(self, user_id: int) -> Optional[int]:
+        i = bisect_left(self._users, user_id)
+        return i if i < len(self._users) and self._users[i] == user_id else None
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: int) -> bool:
+        return self._index(user_id) is not None
+
+    def get(self, user_id: int) -> Optional[str]:
+        i = self._index(user_id)
+        return None if i is None else self._zones[self._user_zones[i]]
+
+    def set(self, user_id: int, timezone: str):
+        zone = self._zone_id(timezone)
+        i = bisect_left(self._users, user_id)
+        if i < len(self._users) and self._users[i] == user_id:
+            self._counts[self._user_zones[i]] -= 1
+            self._user_zones[i] = zone
+        else:
+            self._users.insert(i, user_id)
+            self._user_zones.insert(i, zone)
+        self._counts[zone] += 1
+
+    def remove(self, user_id: int) -> bool:
+        i = self._index(user_id)
+        if i is None:
+            return False
+        self._counts[self._user_zones[i]] -= 1
+        del self._users[i]
+        del self._user_zones[i]
+        return True
+
+    def zone_counts(self) -> Dict[str, int]:
+        """{timezone: users}, for every zone in use"""
+        return {zone: count for zone, count in zip(self._zones, self._counts) if count}
+
+    def users_in(self, timezone: str) -> List[int]:
+        """User IDs with this timezone, in ID order"""
+        zone = self._zone_ids.get(timezone)
+        if zone is None or not self._counts[zone]:
+            return []
+        return list(compress(self._users, map(zone.__eq__, self._user_zones)))
+
+    def group_by_zone(self) -> Dict[str, List[int]]:
+        """{timezone: user IDs} in one pass"""
+        groups: List[List[int]] = [[] for _ in self._zones]
+        for user_id, zone in zip(self._users, self._user_zones):
+            groups[zone].append(user_id)
+        return {self._zones[zone]: users for zone, users in enumerate(groups) if users}
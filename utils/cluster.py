@@ -0,0 +1,316 @@
+# Cluster module
+from typing import Optional, Dict, List, Callable, Awaitable, Tuple
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import secrets
+import signal
+import time
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Split shard IDs into contiguous, evenly sized ranges - one per cluster"""
+    cluster_count = max(1, min(cluster_count, shard_count))
+    base, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        size = base + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+def hosted_guilds_sql(column: str, shard_ids: Optional[List[int]], shard_count: Optional[int]) -> Tuple[str, tuple]:
+    """SQL condition (with params) matching rows whose guild is on one of shard_ids
+
+    For tables shared by every cluster: each process only picks up its own
+    guilds' rows. Empty when this process runs every shard.
+    """
+    if shard_ids is None or not shard_count or len(set(shard_ids)) >= shard_count:
+        return '', ()
+    placeholders = ', '.join('?' * len(shard_ids))
+    return f" AND (({column} >> 22) % ?) IN ({placeholders})", (shard_count, *shard_ids)
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode('utf-8') + b'\n')
+    await writer.drain()
+
+class ClusterHub:
+    """Local IPC hub run by the launcher; relays requests from one cluster to all clusters
+
+    Protocol: newline-delimited JSON over a loopback TCP socket.
+      cluster -> hub   {"op": "hello", "cluster_id": n, "token": ...}
+      cluster -> hub   {"op": "request", "id": ..., "method": ..., "params": {...}, "timeout": seconds}
+      hub -> clusters  {"op": "call", "id": ..., "method": ..., "params": {...}}
+      cluster -> hub   {"op": "reply", "id": ..., "data": ...}
+      hub -> cluster   {"op": "response", "id": ..., "data": {cluster_id: data}}
+    """
+
+    def __init__(self, token: str, host: str = '127.0.0.1', port: int = 0, timeout: float = 1.5):
+        self.token = token
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._clusters: Dict[int, asyncio.StreamWriter] = {}
+        self._pending: Dict[str, dict] = {}  # call id: {'replies': {}, 'done': Event, 'expected': set}
+        self._ids = itertools.count(1)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for writer in list(self._clusters.values()):
+            writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cluster_id = None
+        try:
+            hello = json.loads(await reader.readline() or b'{}')
+            if hello.get('op') != 'hello' or not secrets.compare_digest(str(hello.get('token', '')), self.token):
+                writer.close()
+                return
+            cluster_id = int(hello['cluster_id'])
+            self._clusters[cluster_id] = writer
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get('op') == 'request':
+                    asyncio.create_task(self._relay(writer, message))
+                elif message.get('op') == 'reply':
+                    call = self._pending.get(message['id'])
+                    if call is not None:
+                        call['replies'][str(cluster_id)] = message.get('data')
+                        if set(call['replies']) >= call['expected']:
+                            call['done'].set()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logging.warning(f"Cluster {cluster_id} IPC connection error: {e}")
+        except asyncio.CancelledError:
+            pass  # Launcher shutting down
+        finally:
+            if cluster_id is not None and self._clusters.get(cluster_id) is writer:
+                del self._clusters[cluster_id]
+            writer.close()
+
+    async def _relay(self, requester: asyncio.StreamWriter, message: dict):
+        call_id = f"call-{next(self._ids)}"
+        targets = dict(self._clusters)
+        call = {'replies': {}, 'done': asyncio.Event(), 'expected': {str(cid) for cid in targets}}
+        self._pending[call_id] = call
+        try:
+            for cluster_id, writer in targets.items():
+                try:
+                    await _send(writer, {'op': 'call', 'id': call_id,
+                                         'method': message.get('method'), 'params': message.get('params', {})})
+                except ConnectionError:
+                    call['expected'].discard(str(cluster_id))
+            if call['expected']:
+                try:
+                    await asyncio.wait_for(call['done'].wait(), timeout=message.get('timeout') or self.timeout)
+                except asyncio.TimeoutError:
+                    logging.warning(f"IPC call {message.get('method')} timed out waiting for some clusters")
+            await _send(requester, {'op': 'response', 'id': message['id'], 'data': call['replies']})
+        finally:
+            self._pending.pop(call_id, None)
+
+class ClusterClient:
+    """IPC connection from a cluster process to the launcher's hub"""
+
+    def __init__(self, cluster_id: int, host: str, port: int, token: str, cluster_count: int = 1):
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self.host = host
+        self.port = port
+        self.token = token
+        self._handlers: Dict[str, Callable[..., Awaitable]] = {}
+        self._responses: Dict[str, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task = None
+
+    def register(self, method: str, handler: Callable[..., Awaitable]):
+        """Expose an async handler to the other clusters"""
+        self._handlers[method] = handler
+
+    async def connect(self):
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        await _send(self._writer, {'op': 'hello', 'cluster_id': self.cluster_id, 'token': self.token})
+        self._reader_task = asyncio.create_task(self._read(reader))
+
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    async def request(self, method: str, timeout: float = 10.0, **params) -> Dict[str, object]:
+        """Call a method on every cluster (including this one); returns {cluster_id: result}
+
+        The hub waits up to timeout for the clusters' replies; clusters that don't
+        reply in time (or aren't connected) are missing from the result.
+        """
+        request_id = f"{self.cluster_id}-{next(self._ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._responses[request_id] = future
+        try:
+            await _send(self._writer, {'op': 'request', 'id': request_id, 'method': method, 'params': params,
+                                       'timeout': timeout})
+            # A little longer than the hub waits, so its answer with the replies so far still arrives
+            return await asyncio.wait_for(future, timeout=timeout + 1.0)
+        finally:
+            self._responses.pop(request_id, None)
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                logging.warning(f"Cluster {self.cluster_id} lost its IPC connection")
+                return
+            message = json.loads(line)
+            if message.get('op') == 'response':
+                future = self._responses.get(message['id'])
+                if future is not None and not future.done():
+                    future.set_result(message.get('data', {}))
+            elif message.get('op') == 'call':
+                asyncio.create_task(self._answer(message))
+
+    async def _answer(self, message: dict):
+        handler = self._handlers.get(message.get('method'))
+        try:
+            data = await handler(**message.get('params', {})) if handler else None
+        except Exception as e:
+            logging.error(f"Error handling IPC call {message.get('method')}: {e}")
+            data = None
+        await _send(self._writer, {'op': 'reply', 'id': message['id'], 'data': data})
+
+def _cluster_process(cluster_id: int, shard_ids: List[int], shard_count: int, hub_port: int, token: str,
+                     cluster_count: int):
+    """Entry point of a cluster worker process; exits non-zero only if the bot crashed"""
+    import sys
+    from bot import run_bot
+    sys.exit(run_bot(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster={'cluster_id': cluster_id, 'cluster_count': cluster_count, 'host': '127.0.0.1', 'port': hub_port,
+                 'token': token}
+    ))
+
+async def fetch_recommended_shards(token: str) -> int:
+    """Ask the gateway how many shards Discord recommends for this bot"""
+    import discord
+    http = discord.http.HTTPClient(asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, _ = await http.get_bot_gateway()
+        return shards
+    finally:
+        await http.close()
+
+async def _launch(token: str, shard_count: Optional[int], cluster_count: int, restart_delay: float,
+                  startup_grace: float, shutdown_grace: float):
+    if not shard_count:
+        shard_count = await fetch_recommended_shards(token)
+    logging.info(f"Launching {shard_count} shards across {min(cluster_count, shard_count)} clusters")
+
+    ipc_token = secrets.token_hex(16)
+    hub = ClusterHub(ipc_token)
+    await hub.start()
+
+    context = multiprocessing.get_context('spawn')
+    ranges = shard_ranges(shard_count, cluster_count)
+    processes: Dict[int, multiprocessing.Process] = {}
+    started_at: Dict[int, float] = {}  # cluster_id: monotonic time of the last spawn
+
+    def spawn(cluster_id: int):
+        process = context.Process(
+            target=_cluster_process,
+            args=(cluster_id, ranges[cluster_id], shard_count, hub.port, ipc_token, len(ranges)),
+            name=f"alpha-cluster-{cluster_id}",
+            daemon=False
+        )
+        process.start()
+        processes[cluster_id] = process
+        started_at[cluster_id] = time.monotonic()
+        logging.info(f"Started cluster {cluster_id} (pid {process.pid}) with shards {ranges[cluster_id]}")
+
+    for cluster_id in range(len(ranges)):
+        spawn(cluster_id)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows
+
+    restart_at: Dict[int, float] = {}  # cluster_id: monotonic time of the pending restart
+    failed_at_startup = set()  # clusters whose last run crashed within startup_grace of starting
+    try:
+        while not stopping.is_set():
+            now = time.monotonic()
+            for cluster_id, process in list(processes.items()):
+                if process.is_alive():
+                    if now - started_at[cluster_id] >= startup_grace:
+                        failed_at_startup.discard(cluster_id)
+                    continue
+                if cluster_id in restart_at:
+                    if now >= restart_at[cluster_id]:
+                        del restart_at[cluster_id]
+                        spawn(cluster_id)
+                    continue
+                if process.exitcode == 0:
+                    # A clean exit (the bot was closed, or the token was rejected): don't restart it
+                    logging.info(f"Cluster {cluster_id} exited cleanly; stopping the launcher")
+                    stopping.set()
+                    break
+                if now - started_at[cluster_id] < startup_grace:
+                    failed_at_startup.add(cluster_id)
+                    if len(failed_at_startup) == len(processes):
+                        logging.error(f"Every cluster failed within {startup_grace:.0f}s of starting "
+                                      f"(last exit code {process.exitcode}); stopping the launcher")
+                        stopping.set()
+                        break
+                logging.error(f"Cluster {cluster_id} exited with code {process.exitcode}; "
+                              f"restarting in {restart_delay:.0f}s")
+                restart_at[cluster_id] = now + restart_delay
+            if stopping.is_set():
+                break
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        # SIGTERM lets each cluster close its bot (saving sessions and snapshots); kill what outlives the grace period
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + shutdown_grace
+        for process in processes.values():
+            await asyncio.to_thread(process.join, max(deadline - time.monotonic(), 0))
+        for cluster_id, process in processes.items():
+            if process.is_alive():
+                logging.error(f"Cluster {cluster_id} did not stop within {shutdown_grace:.0f}s; killing it")
+                process.kill()
+                process.join()
+        await hub.stop()
+
+def launch_clusters(bot_token: str, shard_count: Optional[int], cluster_count: int, restart_delay: float = 5.0,
+                    startup_grace: float = 60.0, shutdown_grace: float = 30.0):
+    """Run shard_count shards (Discord's recommendation if not given) across cluster_count worker processes
+
+    A cluster that crashes (non-zero exit) is restarted after restart_delay. The
+    launcher stops when a cluster exits cleanly, or when every cluster crashed
+    within startup_grace seconds of starting (a configuration problem that
+    restarting won't fix). On shutdown, clusters get shutdown_grace seconds to
+    close before they are killed.
+    """
+    asyncio.run(_launch(bot_token, shard_count, cluster_count, restart_delay, startup_grace, shutdown_grace))
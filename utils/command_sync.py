@@ -0,0 +1,82 @@
+# Command sync module
+import discord
+from discord import app_commands
+from typing import Optional, List
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+def command_schema(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> list:
+    """Serialize the commands registered for a scope into a canonical, order-independent structure"""
+    schema = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payload = command.to_dict(tree)
+        except TypeError:
+            # discord.py < 2.4 takes no tree argument
+            payload = command.to_dict()
+        schema.append(payload)
+    return sorted(schema, key=lambda payload: (payload.get('type', 1), payload['name']))
+
+def schema_hash(schema: list) -> str:
+    """Stable hash of a command schema"""
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _load_cache(path: str) -> dict:
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        logging.error(f"Error loading command sync cache: {e}")
+    return {}
+
+def _save_cache(path: str, cache: dict):
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except Exception as e:
+        logging.error(f"Error saving command sync cache: {e}")
+
+async def sync_command_tree(tree: app_commands.CommandTree, application_id: Optional[int], cache_path: str,
+                            guild_ids: Optional[List[int]] = None, force: bool = False) -> int:
+    """
+    Sync slash commands only when their schema changed since the last successful sync
+    With guild_ids set (dev builds), global commands are copied to and synced per guild instead.
+    Returns the number of scopes that were actually synced.
+    """
+    cache = await asyncio.to_thread(_load_cache, cache_path)
+    scopes = [discord.Object(id=guild_id) for guild_id in guild_ids] if guild_ids else [None]
+    synced_scopes = 0
+
+    for guild in scopes:
+        if guild is not None:
+            tree.copy_global_to(guild=guild)
+        scope_key = f"{application_id}:{guild.id if guild else 'global'}"
+        digest = schema_hash(command_schema(tree, guild=guild))
+        cached = cache.get(scope_key, {})
+
+        if not force and cached.get('hash') == digest:
+            logging.info(
+                f"Command tree unchanged for {scope_key}, skipping sync "
+                f"(saved ~{cached.get('duration', 0):.2f}s)"
+            )
+            continue
+
+        started = time.perf_counter()
+        synced = await tree.sync(guild=guild)
+        duration = time.perf_counter() - started
+        cache[scope_key] = {'hash': digest, 'duration': duration, 'synced_at': time.time()}
+        synced_scopes += 1
+        logging.info(f"Synced {len(synced)} slash commands for {scope_key} in {duration:.2f}s")
+
+    if synced_scopes:
+        await asyncio.to_thread(_save_cache, cache_path, cache)
+    return synced_scopes
@@ -0,0 +1,230 @@
+# Config service module
+"""
+Settings that can change while the bot runs (RUNTIME_CONFIG_PATH, JSON)
+
+The file is polled by modification time; a changed file is parsed and
+validated off the event loop and, if valid, replaces the current snapshot in
+one assignment. An invalid file is logged and the previous snapshot stays in
+effect. Snapshots are immutable, so a handler that reads one sees a
+consistent set of values even if the file changes meanwhile.
+
+Settings missing from the file fall back to config/config.py (environment).
+A "guilds" section overrides GUILD_KEYS for single guilds:
+
+    {
+      "clockin_timeout": 1800,
+      "colors": {"primary": "#5865f2"},
+      "guilds": {"123456789012345678": {"announcement_channel_id": 987654321098765432}}
+    }
+"""
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from config.config import Config
+import asyncio
+import json
+import logging
+import os
+
+class ConfigError(ValueError):
+    """The runtime config file is invalid"""
+
+def _positive_int(key: str, value) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ConfigError(f"{key} must be a positive integer")
+    return value
+
+def _channel_id(key: str, value) -> int:
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ConfigError(f"{key} must be a channel ID (0 = not set)")
+    return value
+
+def _color(key: str, value) -> int:
+    if isinstance(value, str) and value.startswith('#'):
+        try:
+            value = int(value[1:], 16)
+        except ValueError:
+            raise ConfigError(f"{key} must be a color like '#00ff00'")
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 0xffffff:
+        raise ConfigError(f"{key} must be a color like '#00ff00'")
+    return value
+
+def _emoji(key: str, value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ConfigError(f"{key} must be a non-empty string")
+    return value
+
+# Setting: validator of a single value
+SETTINGS: Dict[str, Callable[[str, object], object]] = {
+    'announcement_channel_id': _channel_id,
+    'clockin_timeout': _positive_int,
+    'bulk_role_concurrency': _positive_int,
+    'bulk_role_max_targets': _positive_int,
+    'log_setup_concurrency': _positive_int
+}
+# Settings holding a name -> value table, merged over the defaults
+TABLES: Dict[str, Callable[[str, object], object]] = {
+    'colors': _color,
+    'emojis': _emoji
+}
+# Settings that can be overridden per guild
+GUILD_KEYS = ('announcement_channel_id', 'clockin_timeout', 'bulk_role_max_targets')
+
+class ConfigSnapshot:
+    """Immutable set of runtime settings; guild(id) gives the view with that guild's overrides"""
+
+    __slots__ = (*SETTINGS, *TABLES, '_overrides', '_guilds')
+
+    def __init__(self, values: Mapping[str, object], overrides: Optional[Dict[int, dict]] = None):
+        for key in SETTINGS:
+            object.__setattr__(self, key, values[key])
+        for key in TABLES:
+            object.__setattr__(self, key, MappingProxyType(dict(values[key])))
+        object.__setattr__(self, '_overrides', overrides or {})
+        # Per-guild views, built on first use; part of this snapshot so a swap replaces them too
+        object.__setattr__(self, '_guilds', {})
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    @classmethod
+    def defaults(cls) -> 'ConfigSnapshot':
+        """Settings from config/config.py"""
+        return cls({
+            'announcement_channel_id': Config.ANNOUNCEMENT_CHANNEL_ID,
+            'clockin_timeout': Config.CLOCKIN_TIMEOUT,
+            'bulk_role_concurrency': Config.BULK_ROLE_CONCURRENCY,
+            'bulk_role_max_targets': Config.BULK_ROLE_MAX_TARGETS,
+            'log_setup_concurrency': Config.LOG_SETUP_CONCURRENCY,
+            'colors': Config.COLORS,
+            'emojis': Config.EMOJIS
+        })
+
+    def values(self) -> Dict[str, object]:
+        return {key: getattr(self, key) for key in (*SETTINGS, *TABLES)}
+
+    @classmethod
+    def parse(cls, data: object, base: 'ConfigSnapshot') -> 'ConfigSnapshot':
+        """Validate a decoded config file over base (normally the defaults); raises ConfigError"""
+        if not isinstance(data, dict):
+            raise ConfigError("the file must contain a JSON object")
+        values = base.values()
+        for key, value in data.items():
+            if key == 'guilds':
+                continue
+            if key in SETTINGS:
+                values[key] = SETTINGS[key](key, value)
+            elif key in TABLES:
+                if not isinstance(value, dict):
+                    raise ConfigError(f"{key} must be an object")
+                table = dict(values[key])
+                for name, item in value.items():
+                    if name not in table:
+                        raise ConfigError(f"unknown {key} entry: {name} (expected one of {', '.join(table)})")
+                    table[name] = TABLES[key](f"{key}.{name}", item)
+                values[key] = table
+            else:
+                raise ConfigError(f"unknown setting: {key}")
+
+        overrides = {}
+        guilds = data.get('guilds', {})
+        if not isinstance(guilds, dict):
+            raise ConfigError("guilds must be an object of guild ID: settings")
+        for guild_id, settings in guilds.items():
+            if not str(guild_id).isdigit() or not isinstance(settings, dict):
+                raise ConfigError(f"guilds.{guild_id} must be a guild ID with an object of settings")
+            validated = {}
+            for key, value in settings.items():
+                if key not in GUILD_KEYS:
+                    raise ConfigError(f"guilds.{guild_id}.{key} can't be set per guild (allowed: {', '.join(GUILD_KEYS)})")
+                validated[key] = SETTINGS[key](f"guilds.{guild_id}.{key}", value)
+            overrides[int(guild_id)] = validated
+        return cls(values, overrides)
+
+    def guild(self, guild_id: Optional[int]) -> 'ConfigSnapshot':
+        """This snapshot as seen by one guild (itself when the guild has no overrides)"""
+        overrides = self._overrides.get(guild_id)
+        if not overrides:
+            return self
+        view = self._guilds.get(guild_id)
+        if view is None:
+            view = self._guilds[guild_id] = ConfigSnapshot({**self.values(), **overrides})
+        return view
+
+class ConfigService:
+    """Holds the current ConfigSnapshot and reloads it when the file changes"""
+
+    def __init__(self, path: str, poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.current = ConfigSnapshot.defaults()
+        self._stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size) of the loaded file
+        self._listeners: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def guild(self, guild_id: Optional[int]) -> ConfigSnapshot:
+        return self.current.guild(guild_id)
+
+    def subscribe(self, listener: Callable[[], None]):
+        """Call listener() after each change (e.g. to drop caches built from the old settings)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> ConfigSnapshot:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ConfigError(f"invalid JSON: {e}")
+        return ConfigSnapshot.parse(data, ConfigSnapshot.defaults())
+
+    async def reload(self) -> bool:
+        """Load the file if it changed since the last check; returns whether the settings changed"""
+        stamp = await asyncio.to_thread(self._stat)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            snapshot = await asyncio.to_thread(self._read) if stamp else ConfigSnapshot.defaults()
+        except (OSError, ConfigError) as e:
+            logging.error(f"Error in {self.path}, keeping the previous settings: {e}")
+            return False
+        self.current = snapshot
+        logging.info(f"Loaded runtime settings from {self.path}" if stamp else "Runtime settings reset to defaults")
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                logging.error(f"Error in config change listener: {e}")
+        return True
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logging.error(f"Error checking {self.path}: {e}")
+
+    async def start(self):
+        """Load the file now and watch it for changes"""
+        await self.reload()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+# Shared runtime settings
+config_service = ConfigService(Config.RUNTIME_CONFIG_PATH, Config.RUNTIME_CONFIG_POLL_INTERVAL)
@@ -0,0 +1,71 @@
+# Embed templates module
+from typing import Callable, Dict, Hashable, Tuple
+import discord
+
+_EMBED_SLOTS = discord.Embed.__slots__
+
+class FrozenEmbed(discord.Embed):
+    """Embed whose serialized payload is computed once and reused for every send
+
+    Treat instances as read-only; use with_field() to get a patched copy.
+    """
+
+    _payload: dict
+
+    @classmethod
+    def freeze(cls, embed: discord.Embed) -> 'FrozenEmbed':
+        return cls._from_payload(embed.to_dict())
+
+    @classmethod
+    def _from_payload(cls, payload: dict) -> 'FrozenEmbed':
+        frozen = cls.from_dict(payload)
+        frozen._payload = payload
+        return frozen
+
+    def to_dict(self) -> dict:
+        # A fresh copy per call so a caller can't alter the cached payload; embed payloads
+        # are at most two levels deep (fields list, footer/author/image dicts)
+        return {
+            key: [dict(item) for item in value] if isinstance(value, list)
+            else dict(value) if isinstance(value, dict) else value
+            for key, value in self._payload.items()
+        }
+
+    def with_field(self, index: int, name: str, value: str, inline: bool = True) -> 'FrozenEmbed':
+        """Copy of this embed with a dynamic field inserted at index"""
+        fields = list(self._payload.get('fields', ()))
+        fields.insert(index, {'name': name, 'value': value, 'inline': inline})
+        # Shallow slot copy (much cheaper than copy.copy/from_dict); other attributes are shared read-only
+        patched = FrozenEmbed.__new__(FrozenEmbed)
+        for slot in _EMBED_SLOTS:
+            try:
+                setattr(patched, slot, getattr(self, slot))
+            except AttributeError:
+                pass
+        patched._fields = fields
+        patched._payload = {**self._payload, 'fields': fields}
+        return patched
+
+class EmbedTemplates:
+    """Cache of static embeds, built once per key (e.g. version and bot avatar)"""
+
+    def __init__(self):
+        self._cache: Dict[Tuple[str, Hashable], FrozenEmbed] = {}
+
+    def get(self, name: str, builder: Callable[[], discord.Embed], key: Hashable = None) -> FrozenEmbed:
+        """Return the cached template, building it when missing or when key changed"""
+        cache_key = (name, key)
+        template = self._cache.get(cache_key)
+        if template is None:
+            # Drop templates built for an older key
+            for stale in [k for k in self._cache if k[0] == name]:
+                del self._cache[stale]
+            template = self._cache[cache_key] = FrozenEmbed.freeze(builder())
+        return template
+
+    def clear(self):
+        """Forget every template (e.g. after a configuration change)"""
+        self._cache.clear()
+
+# Shared cache
+embed_templates = EmbedTemplates()
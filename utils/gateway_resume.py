@@ -0,0 +1,313 @@
+# Gateway resume module
+"""
+Resume gateway sessions across restarts instead of re-IDENTIFYing
+
+A freshly started process that RESUMEs gets no READY or GUILD_CREATE, so it
+would have an empty cache. While running, the state-bearing gateway payloads
+(READY, GUILD_CREATE and the guild/channel/role/member/thread/voice updates
+that follow) are kept in a journal, compacted per guild: a new GUILD_CREATE
+replaces everything recorded before it for that guild, and repeated updates of
+one member, role, channel or voice state keep only the latest. On graceful
+shutdown the shards stop reading, their session ID, sequence number and resume
+URL are written next to the journal, and the sockets close with a non-1000 code
+so Discord keeps the sessions open.
+
+On the next boot (if the file is recent enough and the shard count matches)
+each shard RESUMEs its session, the journal is replayed through discord.py's
+own parsers with event dispatch switched off (listeners saw those events before
+the restart) to rebuild the cache, and the events missed while the bot was down
+then arrive from Discord and are dispatched normally. If Discord rejects the
+session, discord.py re-IDENTIFYs and the rehydrated guilds of that shard are
+dropped when the new READY arrives.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+
+FILE_VERSION = 1
+
+# Journaled events and the payload field holding their guild ID
+GUILD_EVENTS = {
+    'GUILD_CREATE': 'id',
+    'GUILD_UPDATE': 'id',
+    'GUILD_DELETE': 'id',
+    'GUILD_ROLE_CREATE': 'guild_id',
+    'GUILD_ROLE_UPDATE': 'guild_id',
+    'GUILD_ROLE_DELETE': 'guild_id',
+    'GUILD_EMOJIS_UPDATE': 'guild_id',
+    'GUILD_STICKERS_UPDATE': 'guild_id',
+    'GUILD_MEMBER_ADD': 'guild_id',
+    'GUILD_MEMBER_UPDATE': 'guild_id',
+    'GUILD_MEMBER_REMOVE': 'guild_id',
+    'GUILD_MEMBERS_CHUNK': 'guild_id',
+    'CHANNEL_CREATE': 'guild_id',
+    'CHANNEL_UPDATE': 'guild_id',
+    'CHANNEL_DELETE': 'guild_id',
+    'THREAD_CREATE': 'guild_id',
+    'THREAD_UPDATE': 'guild_id',
+    'THREAD_DELETE': 'guild_id',
+    'THREAD_LIST_SYNC': 'guild_id',
+    'VOICE_STATE_UPDATE': 'guild_id'
+}
+
+# Events that describe one entity of a guild: event: (kind, add/update/remove, entity ID)
+ENTITY_EVENTS: Dict[str, Tuple[str, str, Callable[[dict], object]]] = {
+    'GUILD_UPDATE': ('guild', 'update', lambda data: None),
+    'GUILD_ROLE_CREATE': ('role', 'add', lambda data: data['role']['id']),
+    'GUILD_ROLE_UPDATE': ('role', 'update', lambda data: data['role']['id']),
+    'GUILD_ROLE_DELETE': ('role', 'remove', lambda data: data['role_id']),
+    'GUILD_EMOJIS_UPDATE': ('emojis', 'update', lambda data: None),
+    'GUILD_STICKERS_UPDATE': ('stickers', 'update', lambda data: None),
+    'GUILD_MEMBER_ADD': ('member', 'add', lambda data: data['user']['id']),
+    'GUILD_MEMBER_UPDATE': ('member', 'update', lambda data: data['user']['id']),
+    'GUILD_MEMBER_REMOVE': ('member', 'remove', lambda data: data['user']['id']),
+    'GUILD_MEMBERS_CHUNK': ('chunk', 'update', lambda data: data.get('chunk_index', 0)),
+    'CHANNEL_CREATE': ('channel', 'add', lambda data: data['id']),
+    'CHANNEL_UPDATE': ('channel', 'update', lambda data: data['id']),
+    'CHANNEL_DELETE': ('channel', 'remove', lambda data: data['id']),
+    'THREAD_CREATE': ('thread', 'add', lambda data: data['id']),
+    'THREAD_UPDATE': ('thread', 'update', lambda data: data['id']),
+    'THREAD_DELETE': ('thread', 'remove', lambda data: data['id']),
+    'VOICE_STATE_UPDATE': ('voice', 'update', lambda data: data['user_id'])
+}
+
+def shard_for(guild_id: int, shard_count: int) -> int:
+    return (guild_id >> 22) % shard_count
+
+class GatewayJournal:
+    """Serialized state payloads since each shard's READY, compacted per guild and per entity
+
+    Each guild's events are slots in insertion order. A GUILD_CREATE starts the
+    guild over. For an entity (member, role, channel, thread, voice state...)
+    only its creation since the GUILD_CREATE, its latest update and its removal
+    are kept: an update replaces the previous one and moves to the end, and a
+    removal drops the entity's slots (nothing is left if it was also created
+    since). So the journal grows with the state, not with the event rate.
+
+    If it still passes max_bytes, the journal is dropped and the shards it held
+    are not saved until each of them receives a new READY.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.ready: Dict[int, str] = {}  # shard_id: READY payload
+        self.guilds: Dict[int, Dict[tuple, Tuple[str, str]]] = {}  # guild_id: {slot: (event, payload)}
+        self.size = 0
+        self.shard_count: Optional[int] = None  # from the READY payloads
+        self.overflowed: Set[int] = set()  # shards not journaled since the journal overflowed
+        self._events = itertools.count()
+
+    def record(self, event: str, data: dict, payload: Optional[str] = None):
+        if event == 'READY':
+            shard_id, self.shard_count = data.get('shard', [0, 1])
+            # A new session: this shard's guilds all follow as GUILD_CREATE
+            self.overflowed.discard(shard_id)
+        guild_id = data.get(GUILD_EVENTS[event]) if event != 'READY' else None
+        if guild_id is not None:
+            guild_id = int(guild_id)
+        if self.overflowed and (guild_id is None or shard_for(guild_id, self.shard_count or 1) in self.overflowed):
+            return
+        payload = payload if payload is not None else json.dumps(data, separators=(',', ':'))
+        if event == 'READY':
+            self.size += len(payload) - len(self.ready.get(shard_id, ''))
+            self.ready[shard_id] = payload
+        elif guild_id is None:
+            return  # DM channels etc. - not part of the guild cache
+        elif event == 'GUILD_CREATE' or (event == 'GUILD_DELETE' and not data.get('unavailable')):
+            # A full guild payload (or removal) supersedes everything before it
+            self.size -= sum(len(entry[1]) for entry in self.guilds.pop(guild_id, {}).values())
+            if event == 'GUILD_CREATE':
+                self.guilds[guild_id] = {('guild', None, 'add'): (event, payload)}
+                self.size += len(payload)
+        else:
+            self._record_guild_event(self.guilds.setdefault(guild_id, {}), event, data, payload)
+
+        if self.size > self.max_bytes:
+            logging.warning(f"Gateway journal passed {self.max_bytes} bytes; the next restart will IDENTIFY")
+            self.overflowed.update(self.ready)
+            self.ready.clear()
+            self.guilds.clear()
+            self.size = 0
+
+    def _record_guild_event(self, slots: Dict[tuple, Tuple[str, str]], event: str, data: dict, payload: str):
+        entity = ENTITY_EVENTS.get(event)
+        if entity is not None:
+            kind, action, get_id = entity
+            try:
+                entity_id = get_id(data)
+            except (KeyError, TypeError):
+                entity = None
+        if entity is None:
+            # Not tied to one entity (THREAD_LIST_SYNC, unavailable guilds): kept in order
+            slots[('event', next(self._events), None)] = (event, payload)
+            self.size += len(payload)
+            return
+
+        key = (kind, entity_id)
+        dropped = [slots.pop(key + ('update',), None)]
+        if action == 'remove':
+            added = slots.pop(key + ('add',), None)
+            dropped += [added, slots.pop(key + ('remove',), None)]
+            if added is not None:
+                # Created since the guild's GUILD_CREATE: nothing to replay at all
+                self.size -= sum(len(entry[1]) for entry in dropped if entry)
+                return
+        elif action == 'add':
+            dropped.append(slots.pop(key + ('add',), None))
+        slots[key + (action,)] = (event, payload)
+        self.size += len(payload) - sum(len(entry[1]) for entry in dropped if entry)
+
+    def forget_shard(self, shard_id: int, shard_count: int):
+        for guild_id in [g for g in self.guilds if shard_for(g, shard_count) == shard_id]:
+            self.size -= sum(len(entry[1]) for entry in self.guilds.pop(guild_id).values())
+
+    def entries(self, shard_id: int, shard_count: int) -> Iterable[Tuple[str, str]]:
+        """Payloads to replay for one shard: its READY, then each guild's slots in order"""
+        yield 'READY', self.ready[shard_id]
+        for guild_id, slots in self.guilds.items():
+            if shard_for(guild_id, shard_count) == shard_id:
+                yield from slots.values()
+
+class GatewayResume:
+    """Saves shard sessions plus the journal on shutdown and restores them on boot"""
+
+    def __init__(self, path: str, max_age: float = 120, max_journal_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_age = max_age
+        self.journal = GatewayJournal(max_journal_bytes)
+        self.shard_count: Optional[int] = None  # of the saved sessions
+        self._saved: Dict[int, dict] = {}  # shard_id: {'session_id', 'sequence', 'resume_url', 'entries'}
+        self._state = None
+        self._parsers: Dict[str, Callable[[dict], None]] = {}
+        self._rehydrated = set()
+
+    # JOURNALING
+    def install(self, state):
+        """Record state payloads as discord.py parses them (wraps ConnectionState.parsers in place)"""
+        self._state = state
+        for event in ('READY', *GUILD_EVENTS):
+            parser = state.parsers.get(event)
+            if parser is not None:
+                self._parsers[event] = parser
+                state.parsers[event] = self._wrap(event, parser)
+
+    def _wrap(self, event: str, parser: Callable[[dict], None]) -> Callable[[dict], None]:
+        def parse(data: dict):
+            if event == 'READY':
+                shard_id = data.get('shard', [0])[0]
+                if shard_id in self._rehydrated:
+                    # The resume was rejected and the shard identified again
+                    self._forget_shard(shard_id)
+            self.journal.record(event, data)
+            parser(data)
+        return parse
+
+    def _forget_shard(self, shard_id: int):
+        self._rehydrated.discard(shard_id)
+        shard_count = self._state.shard_count
+        self.journal.forget_shard(shard_id, shard_count)
+        for guild in list(self._state._guilds.values()):
+            if shard_for(guild.id, shard_count) == shard_id:
+                self._state._remove_guild(guild)
+
+    # SHUTDOWN
+    async def save(self, shards: Dict[int, object], user_id: int, shard_count: int) -> int:
+        """Detach the shards (discord.py Shard objects) without ending their sessions and save them
+
+        Returns the number of shards saved.
+        """
+        sessions = {}
+        for shard_id, shard in shards.items():
+            ws = shard.ws
+            # Stop reading first so the sequence can't move past what the journal holds
+            shard._cancel_task()
+            if ws.open and ws.session_id and ws.sequence is not None and shard_id in self.journal.ready:
+                sessions[shard_id] = {'session_id': ws.session_id, 'sequence': ws.sequence,
+                                      'resume_url': str(ws.gateway)}
+            # Any close code other than 1000/1001 keeps the session resumable
+            await ws.close(code=4000)
+        if not sessions:
+            return 0
+        header = {'version': FILE_VERSION, 'saved_at': time.time(), 'user_id': user_id,
+                  'shard_count': shard_count, 'shards': sessions}
+        await asyncio.to_thread(self._write, header, shard_count)
+        return len(sessions)
+
+    def _write(self, header: dict, shard_count: int):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + '\n')
+            for shard_id in header['shards']:
+                for event, payload in self.journal.entries(shard_id, shard_count):
+                    # Payloads are already JSON; splice them in rather than re-encoding
+                    f.write(f'{{"shard":{shard_id},"t":"{event}","d":{payload}}}\n')
+        os.replace(temp_path, self.path)
+
+    # BOOT
+    async def load(self, user_id: int) -> int:
+        """Read (and remove) the saved sessions; returns how many shards can try to resume
+
+        The file is consumed even when unusable, so a crash later in this run can't
+        resume from state that is older still.
+        """
+        try:
+            header, saved = await asyncio.to_thread(self._read)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            logging.error(f"Error reading saved gateway sessions: {e}")
+            return 0
+        age = time.time() - header.get('saved_at', 0)
+        if header.get('version') != FILE_VERSION or header.get('user_id') != user_id or age > self.max_age:
+            logging.info(f"Saved gateway sessions are not resumable (age {age:.0f}s); identifying")
+            return 0
+        self.shard_count = header['shard_count']
+        self._saved = saved
+        return len(saved)
+
+    def _read(self) -> Tuple[dict, Dict[int, dict]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            os.remove(self.path)
+            header = json.loads(f.readline())
+            saved = {int(shard_id): dict(session, entries=[]) for shard_id, session in header.get('shards', {}).items()}
+            for line in f:
+                # {"shard":N,"t":"EVENT","d":payload} - keep the payload text for the new journal
+                prefix, payload = line.split(',"d":', 1)
+                entry = json.loads(prefix + '}')
+                if entry['shard'] in saved:
+                    payload = payload.rstrip()[:-1]
+                    saved[entry['shard']]['entries'].append((entry['t'], payload, json.loads(payload)))
+        return header, saved
+
+    def take(self, shard_id: int, shard_count: int) -> Optional[dict]:
+        """The saved session for a shard, if it can be resumed with this shard count (once)"""
+        session = self._saved.pop(shard_id, None)
+        if session is None or shard_count != self.shard_count:
+            return None
+        return session
+
+    def rehydrate(self, state, shard_id: int, entries: List[Tuple[str, str, dict]]) -> int:
+        """Rebuild a shard's cache from its journal before its resumed events arrive; returns events replayed"""
+        dispatch = state.dispatch
+        # State only: listeners already handled these events before the restart
+        state.dispatch = lambda *args, **kwargs: None
+        replayed = 0
+        try:
+            for event, payload, data in entries:
+                self.journal.record(event, data, payload)
+                try:
+                    self._parsers[event](data)
+                    replayed += 1
+                except Exception as e:
+                    logging.error(f"Error replaying {event} for shard {shard_id}: {e}")
+        finally:
+            state.dispatch = dispatch
+        self._rehydrated.add(shard_id)
+        return replayed
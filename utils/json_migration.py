@@ -0,0 +1,348 @@
+# JSON migration module
+"""
+Streaming import of the legacy data/*.json files into the SQLite store
+
+Each file is parsed incrementally (one top-level entry at a time, so memory stays
+bounded by the batch size, not the file size) and inserted in batches. The
+number of entries imported is committed together with every batch, so an
+interrupted import resumes where it stopped. Rows that already exist in the
+database are left alone (the database is newer), which makes re-running safe.
+After the import, row counts are verified against a second pass over the file
+and the file is renamed to *.json.migrated. The old standalone log outbox and
+announcement databases (data/log_outbox.db, data/announcements.db) are copied
+into the shared database the same way and renamed to *.db.migrated.
+
+Runs automatically on startup; to migrate ahead of a deploy:
+    python -m utils.json_migration [--data-dir data] [--batch-size 1000] [--keep-files]
+"""
+from typing import Callable, Dict, Iterator, List, Tuple
+from config.config import Config
+from utils.storage import Storage
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+
+CHUNK_SIZE = 64 * 1024
+DELIMITERS = ' \t\r\n,:]}'
+# Still read and written as files by the bot
+EXCLUDED_FILES = {os.path.basename(Config.COMMAND_SYNC_CACHE_PATH)}
+
+def iter_json_entries(f, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, object]]:
+    """Yield (key, value) for each entry of a top-level JSON object (or (index, item) for an array)
+
+    Only the current chunk and the entry being decoded are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+
+    def more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+        return not eof
+
+    def skip_whitespace() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or not more():
+                return buffer[pos] if pos < len(buffer) else ''
+
+    def decode():
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number is only complete once a delimiter follows ("1" of "1e-07" split across chunks)
+                complete = end < len(buffer) and (buffer[end] in DELIMITERS or buffer[pos] in '"{[tfn')
+                if complete or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            more()
+
+    def expect(char: str):
+        nonlocal pos
+        if skip_whitespace() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", buffer, pos)
+        pos += 1
+
+    opening = skip_whitespace()
+    if opening not in '{[' or not opening:
+        raise json.JSONDecodeError("Expecting an object or array", buffer, pos)
+    pos += 1
+    closing = '}' if opening == '{' else ']'
+    index = 0
+    if skip_whitespace() == closing:
+        return
+    while True:
+        if opening == '{':
+            if skip_whitespace() != '"':
+                raise json.JSONDecodeError("Expecting property name", buffer, pos)
+            key = decode()
+            expect(':')
+        else:
+            key = str(index)
+        skip_whitespace()
+        yield key, decode()
+        index += 1
+        separator = skip_whitespace()
+        pos += 1
+        if separator == closing:
+            return
+        if separator != ',':
+            raise json.JSONDecodeError(f"Expecting ',' or '{closing}'", buffer, pos - 1)
+
+def take(entries: Iterator, count: int) -> list:
+    return list(itertools.islice(entries, count))
+
+# FILE HANDLERS: entry -> rows, and how rows are inserted and counted
+class LegacyFile:
+    """Import rules for one kind of legacy file"""
+
+    insert_sql = "INSERT OR IGNORE INTO legacy_documents (source, key, value) VALUES (?, ?, ?)"
+    count_sql = "SELECT COUNT(*) FROM legacy_documents WHERE source = ? AND key IN ({})"
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def rows(self, key: str, value) -> List[tuple]:
+        return [(self.source, key, json.dumps(value))]
+
+    def count_query(self, rows: List[tuple]) -> Tuple[str, tuple, int]:
+        """(query, params, distinct keys) counting how many of rows' keys exist in the database"""
+        keys = sorted({row[1] for row in rows})
+        return self.count_sql.format(','.join('?' * len(keys))), (self.source, *keys), len(keys)
+
+class TimezonesFile(LegacyFile):
+    """data/timezones.json: {"user_id": "Zone/Name"}"""
+
+    insert_sql = "INSERT OR IGNORE INTO user_timezones (user_id, timezone) VALUES (?, ?)"
+
+    def rows(self, key: str, value) -> List[tuple]:
+        if not key.isdigit() or not isinstance(value, str):
+            return []
+        return [(int(key), value)]
+
+    def count_query(self, rows: List[tuple]) -> Tuple[str, tuple, int]:
+        user_ids = sorted({row[0] for row in rows})
+        sql = f"SELECT COUNT(*) FROM user_timezones WHERE user_id IN ({','.join('?' * len(user_ids))})"
+        return sql, tuple(user_ids), len(user_ids)
+
+class LogConfigFile(LegacyFile):
+    """data/log_config.json: {"guild_id": {"log_type": channel_id}}"""
+
+    insert_sql = "INSERT OR IGNORE INTO log_channels (guild_id, log_type, channel_id) VALUES (?, ?, ?)"
+
+    def rows(self, key: str, value) -> List[tuple]:
+        if not key.isdigit() or not isinstance(value, dict):
+            return []
+        return [(int(key), log_type, int(channel_id)) for log_type, channel_id in value.items()
+                if isinstance(channel_id, int) or str(channel_id).isdigit()]
+
+    def count_query(self, rows: List[tuple]) -> Tuple[str, tuple, int]:
+        pairs = sorted({(row[0], row[1]) for row in rows})
+        values = ','.join(['(?, ?)'] * len(pairs))
+        sql = f"SELECT COUNT(*) FROM log_channels WHERE (guild_id, log_type) IN (VALUES {values})"
+        return sql, tuple(p for pair in pairs for p in pair), len(pairs)
+
+LEGACY_FILES: Dict[str, Callable[[str], LegacyFile]] = {
+    'timezones.json': TimezonesFile,
+    'log_config.json': LogConfigFile
+}
+
+# Standalone SQLite files that now live in the shared database: file name: (table, {column: old column})
+LEGACY_DATABASES: Dict[str, Tuple[str, Dict[str, str]]] = {
+    'log_outbox.db': ('log_outbox', {
+        column: column for column in
+        ('event_id', 'guild_id', 'log_type', 'payload', 'created_at', 'attempts', 'next_attempt')
+    }),
+    'announcements.db': ('scheduled_announcements', {
+        **{column: column for column in
+           ('id', 'guild_id', 'author_id', 'payload', 'targets', 'send_at', 'status', 'result')},
+        # Old jobs are a single row sent by the cluster hosting the guild they were scheduled from
+        'job_id': 'id',
+        'target_guild_id': 'guild_id'
+    })
+}
+
+def find_legacy_files(data_dir: str) -> List[str]:
+    """Top-level *.json files in data_dir that still need importing"""
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(
+        os.path.join(data_dir, name) for name in os.listdir(data_dir)
+        if name.endswith('.json') and name not in EXCLUDED_FILES and os.path.isfile(os.path.join(data_dir, name))
+    )
+
+# MIGRATION
+async def migrate_file(storage: Storage, path: str, batch_size: int = 1000, keep_file: bool = False) -> dict:
+    """Import one legacy file; returns a summary with the entry, row and verification counts"""
+    source = os.path.basename(path)
+    handler = LEGACY_FILES.get(source, LegacyFile)(source)
+    stat = os.stat(path)
+    result = {'source': source, 'entries': 0, 'rows': 0, 'skipped': 0, 'resumed_at': 0, 'status': 'done'}
+
+    progress = await storage.fetchone("SELECT size, mtime, items, status FROM legacy_imports WHERE source = ?", (source,))
+    resume_at = 0
+    if progress and progress[0] == stat.st_size and progress[1] == stat.st_mtime:
+        if progress[3] == 'done':
+            result['status'] = 'already migrated'
+            return await _finish(path, result, keep_file)
+        resume_at = progress[2]
+    result['resumed_at'] = resume_at
+
+    def save_batch(rows: List[tuple], items: int):
+        def write(conn: sqlite3.Connection):
+            if rows:
+                conn.executemany(handler.insert_sql, rows)
+            conn.execute(
+                "INSERT INTO legacy_imports (source, size, mtime, items, status, updated_at) VALUES (?, ?, ?, ?, 'running', ?) "
+                "ON CONFLICT(source) DO UPDATE SET size = excluded.size, mtime = excluded.mtime, "
+                "items = excluded.items, status = 'running', updated_at = excluded.updated_at",
+                (source, stat.st_size, stat.st_mtime, items, time.time())
+            )
+        return storage.write(write)
+
+    # Import: entries are parsed on a worker thread, one batch at a time
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = iter_json_entries(f)
+        while True:
+            chunk = await asyncio.to_thread(take, entries, batch_size)
+            rows: List[tuple] = []
+            for key, value in chunk:
+                result['entries'] += 1
+                if result['entries'] <= resume_at:
+                    continue
+                entry_rows = handler.rows(key, value)
+                result['skipped'] += not entry_rows
+                rows.extend(entry_rows)
+            if rows or not chunk:
+                await save_batch(rows, result['entries'])
+                result['rows'] += len(rows)
+            if not chunk:
+                break
+
+    # Verify: every row the file produces must now exist
+    expected = found = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = iter_json_entries(f)
+        batch: List[tuple] = []
+        while True:
+            chunk = await asyncio.to_thread(take, entries, batch_size)
+            for key, value in chunk:
+                batch.extend(handler.rows(key, value))
+            if batch and (len(batch) >= batch_size or not chunk):
+                sql, params, distinct = handler.count_query(batch)
+                expected += distinct
+                found += (await storage.fetchone(sql, params))[0]
+                batch = []
+            if not chunk:
+                break
+    result['expected_rows'] = expected
+    result['found_rows'] = found
+    status = 'done' if found == expected else 'verify_failed'
+    result['status'] = status
+    await storage.execute("UPDATE legacy_imports SET status = ?, updated_at = ? WHERE source = ?",
+                          (status, time.time(), source))
+    if status != 'done':
+        logging.error(f"Legacy import of {source} verified {found} of {expected} rows; keeping the file")
+        return result
+    return await _finish(path, result, keep_file)
+
+async def _finish(path: str, result: dict, keep_file: bool) -> dict:
+    if not keep_file:
+        try:
+            await asyncio.to_thread(os.replace, path, path + '.migrated')
+        except FileNotFoundError:
+            pass  # another cluster finished first
+    return result
+
+async def migrate_legacy_files(storage: Storage, data_dir: str = 'data', batch_size: int = 1000,
+                               keep_files: bool = False) -> List[dict]:
+    """Import every legacy JSON file found in data_dir; failures are logged per file"""
+    results = []
+    for path in await asyncio.to_thread(find_legacy_files, data_dir):
+        started = time.perf_counter()
+        try:
+            result = await migrate_file(storage, path, batch_size, keep_files)
+        except Exception as e:
+            logging.error(f"Error migrating {path}: {e}")
+            results.append({'source': os.path.basename(path), 'status': 'error', 'error': str(e)})
+            continue
+        result['seconds'] = round(time.perf_counter() - started, 3)
+        if result['status'] != 'already migrated':
+            logging.info(f"Migrated {result['source']}: {result['rows']} rows from {result['entries']} entries "
+                         f"({result['status']}, {result['seconds']}s)")
+        results.append(result)
+    return results
+
+async def migrate_legacy_databases(storage: Storage, data_dir: str = 'data', keep_files: bool = False) -> List[dict]:
+    """Copy the rows of the old standalone outbox/announcement databases into the shared one"""
+    results = []
+    for name, (table, columns) in LEGACY_DATABASES.items():
+        path = os.path.join(data_dir, name)
+        if not os.path.isfile(path):
+            continue
+
+        def read_rows() -> List[tuple]:
+            conn = sqlite3.connect(path)
+            try:
+                return conn.execute(f"SELECT {', '.join(columns.values())} FROM {table}").fetchall()
+            except sqlite3.OperationalError:
+                return []  # created but never written to
+            finally:
+                conn.close()
+
+        try:
+            rows = await asyncio.to_thread(read_rows)
+            placeholders = ', '.join('?' * len(columns))
+            inserted = await storage.executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            ) if rows else 0
+        except Exception as e:
+            logging.error(f"Error migrating {path}: {e}")
+            results.append({'source': name, 'status': 'error', 'error': str(e)})
+            continue
+        result = await _finish(path, {'source': name, 'rows': inserted, 'status': 'done'}, keep_files)
+        logging.info(f"Migrated {name}: {inserted} of {len(rows)} rows into {table}")
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy data/*.json files into the SQLite store")
+    parser.add_argument('--data-dir', default=os.path.dirname(Config.DATABASE_PATH) or '.')
+    parser.add_argument('--database', default=Config.DATABASE_PATH)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--keep-files', action='store_true', help="don't rename imported files to *.migrated")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    async def run() -> List[dict]:
+        storage = Storage(args.database)
+        try:
+            results = await migrate_legacy_files(storage, args.data_dir, args.batch_size, args.keep_files)
+            return results + await migrate_legacy_databases(storage, args.data_dir, args.keep_files)
+        finally:
+            await storage.close()
+
+    results = asyncio.run(run())
+    if not results:
+        print(f"No legacy files in {args.data_dir}")
+    for result in results:
+        print(json.dumps(result))
+    raise SystemExit(1 if any(result['status'] not in ('done', 'already migrated') for result in results) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Logging setup module
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotating file handler that gzips rotated segments"""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+def setup_logging(level: str = 'INFO', log_file: str = None, json_output: bool = False,
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  console: bool = True) -> logging.handlers.QueueListener:
+    """
+    Route all process logging through a QueueHandler so callers on the event loop
+    never touch the disk; a QueueListener thread does formatting, file I/O and rotation.
+    Returns the started listener - call stop() on shutdown to flush pending records.
+    """
+    formatter = JsonFormatter() if json_output else logging.Formatter(LOG_FORMAT)
+
+    handlers = []
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = CompressingRotatingFileHandler(log_file, max_bytes, backup_count)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    listener.start()
+    return listener
@@ -0,0 +1,73 @@
+# Member cache module
+import discord
+from config.config import Config
+import asyncio
+import logging
+import time
+
+class MemberCache:
+    """Lazy, per-guild member chunking with idle eviction
+
+    Guilds are not chunked at startup; features that need the full member list
+    call ensure_chunked() first. Guilds that have not needed their member list
+    for a while have their cached members dropped again.
+    """
+
+    def __init__(self, idle_ttl: float = 30 * 60, evict_min_members: int = 1000):
+        self.idle_ttl = idle_ttl
+        self.evict_min_members = evict_min_members
+        self._locks = {}  # guild_id: asyncio.Lock
+        self._last_used = {}  # guild_id: monotonic timestamp
+
+    async def ensure_chunked(self, guild: discord.Guild) -> discord.Guild:
+        """Make sure the guild's member list is cached, requesting it from the gateway if needed"""
+        self._last_used[guild.id] = time.monotonic()
+        if guild.chunked:
+            return guild
+
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if not guild.chunked:
+                started = time.perf_counter()
+                try:
+                    await guild.chunk(cache=True)
+                    logging.info(
+                        f"Chunked {guild.member_count} members for {guild} "
+                        f"in {time.perf_counter() - started:.2f}s"
+                    )
+                except Exception as e:
+                    # Fall back to whatever is cached (e.g. members intent disabled)
+                    logging.error(f"Error chunking members for {guild}: {e}")
+        return guild
+
+    def evict_idle(self, guilds) -> int:
+        """Drop cached members of large guilds whose member list has been idle past the TTL"""
+        now = time.monotonic()
+        evicted = 0
+        for guild in guilds:
+            last_used = self._last_used.get(guild.id)
+            if last_used is None or now - last_used < self.idle_ttl:
+                continue
+            if (guild.member_count or 0) < self.evict_min_members:
+                continue
+
+            keep = {guild.me.id} if guild.me else set()
+            for voice_state_member_id in getattr(guild, '_voice_states', {}):
+                keep.add(voice_state_member_id)
+            # Guild._remove_member is private: discord.py has no public way to drop cached
+            # members. Deliberate, and the reason requirements.txt pins discord.py
+            for member in list(guild.members):
+                if member.id not in keep:
+                    guild._remove_member(member)
+                    evicted += 1
+            del self._last_used[guild.id]
+
+        if evicted:
+            logging.info(f"Evicted {evicted} cached members from idle guilds")
+        return evicted
+
+# Shared instance used by lookups and commands that need full member lists
+member_cache = MemberCache(
+    idle_ttl=Config.MEMBER_CACHE_IDLE_TTL,
+    evict_min_members=Config.MEMBER_CACHE_EVICT_MIN_MEMBERS
+)
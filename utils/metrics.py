@@ -0,0 +1,188 @@
+# Metrics module
+from typing import Dict, List, Optional, Tuple
+from discord.ext import tasks
+from bisect import bisect_left
+from functools import wraps
+import asyncio
+import logging
+import time
+
+# Latency histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative only when rendered)"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count', 'errors')
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile (0-100) as the upper bound of the bucket it falls in"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+class Metrics:
+    """In-process registry of per-command, per-event and per-task latency histograms"""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}  # (kind, name): Histogram
+        self.loop_lag = Histogram()
+        self._lag_task: Optional[asyncio.Task] = None
+
+    def histogram(self, kind: str, name: str) -> Histogram:
+        key = (kind, name)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def timed(self, kind: str, name: str, func):
+        """Wrap a coroutine function so each call records its latency and errors"""
+        if getattr(func, '__metrics_wrapped__', False):
+            return func
+        histogram = self.histogram(kind, name)
+        perf_counter = time.perf_counter
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                histogram.errors += 1
+                raise
+            finally:
+                histogram.observe(perf_counter() - started)
+
+        wrapper.__metrics_wrapped__ = True
+        return wrapper
+
+    async def call(self, kind: str, name: str, func, *args, **kwargs):
+        """Await func(*args, **kwargs), recording its latency and errors"""
+        histogram = self.histograms.get((kind, name)) or self.histogram(kind, name)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            histogram.errors += 1
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    def instrument_cog(self, cog):
+        """Time every app command callback and background task loop of a cog"""
+        for command in cog.walk_app_commands():
+            callback = getattr(command, '_callback', None)
+            if callback is not None:
+                command._callback = self.timed('command', command.qualified_name, callback)
+
+        for name in dir(type(cog)):
+            if isinstance(getattr(type(cog), name, None), tasks.Loop):
+                loop = getattr(cog, name)
+                loop.coro = self.timed('task', f"{cog.qualified_name}.{name}", loop.coro)
+
+    # EVENT LOOP LAG
+    def start_lag_sampler(self, interval: float = 0.5):
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.create_task(self._sample_lag(interval))
+
+    def stop_lag_sampler(self):
+        if self._lag_task:
+            self._lag_task.cancel()
+
+    async def _sample_lag(self, interval: float):
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            self.loop_lag.observe(max(time.perf_counter() - expected, 0.0))
+
+    # EXPORT
+    def summary(self, kind: Optional[str] = None, limit: int = 10) -> List[dict]:
+        """Busiest entries first: name, count, errors, mean/p50/p99 in milliseconds"""
+        rows = []
+        for (entry_kind, name), histogram in self.histograms.items():
+            if (kind and entry_kind != kind) or not histogram.count:
+                continue
+            rows.append({
+                'kind': entry_kind,
+                'name': name,
+                'count': histogram.count,
+                'errors': histogram.errors,
+                'mean_ms': histogram.total / histogram.count * 1000,
+                'p50_ms': histogram.percentile(50) * 1000,
+                'p99_ms': histogram.percentile(99) * 1000
+            })
+        rows.sort(key=lambda row: row['count'], reverse=True)
+        return rows[:limit]
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            '# HELP alphabot_handler_seconds Latency of app commands, event listeners and task loops',
+            '# TYPE alphabot_handler_seconds histogram'
+        ]
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            labels = f'kind="{kind}",name="{name}"'
+            lines.extend(self._render_histogram('alphabot_handler_seconds', labels, histogram))
+        lines += [
+            '# HELP alphabot_handler_errors_total Handler calls that raised',
+            '# TYPE alphabot_handler_errors_total counter'
+        ]
+        for (kind, name), histogram in sorted(self.histograms.items()):
+            lines.append(f'alphabot_handler_errors_total{{kind="{kind}",name="{name}"}} {histogram.errors}')
+        lines += [
+            '# HELP alphabot_event_loop_lag_seconds Event loop scheduling delay',
+            '# TYPE alphabot_event_loop_lag_seconds histogram'
+        ]
+        lines.extend(self._render_histogram('alphabot_event_loop_lag_seconds', '', self.loop_lag))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(metric: str, labels: str, histogram: Histogram) -> List[str]:
+        prefix = f"{labels}," if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+            cumulative += bucket_count
+            lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels}}}" if labels else ''
+        lines.append(f'{metric}_sum{suffix} {histogram.total}')
+        lines.append(f'{metric}_count{suffix} {histogram.count}')
+        return lines
+
+    async def serve(self, host: str, port: int):
+        """Expose /metrics over HTTP on a local port; returns the aiohttp runner"""
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(text=self.render_prometheus(), content_type='text/plain')
+
+        app = web.Application()
+        app.router.add_get('/metrics', handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logging.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+        return runner
+
+# Shared registry
+metrics = Metrics()
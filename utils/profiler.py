@@ -0,0 +1,213 @@
+# Profiler module
+from typing import Dict, List, Tuple
+from config.config import Config
+from datetime import datetime
+import asyncio
+import hmac
+import io
+import logging
+import os
+import sys
+import threading
+
+PROFILE_MODES = ('sample', 'cprofile', 'memory')
+
+class ProfilerBusy(Exception):
+    """Raised when a profiling session is already running"""
+
+class Profiler:
+    """Time-bounded CPU and memory profiling of the live event loop
+
+    sample   - a background thread samples the event loop thread's stack and
+               writes collapsed stacks (flamegraph.pl / speedscope compatible)
+    cprofile - deterministic cProfile of the event loop thread (.prof + text report)
+    memory   - tracemalloc top allocators accumulated over the session
+    """
+
+    def __init__(self, output_dir: str = 'data/profiles', max_duration: float = 120,
+                 sample_interval: float = 0.005):
+        self.output_dir = output_dir
+        self.max_duration = max_duration
+        self.sample_interval = sample_interval
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def run(self, mode: str, duration: float) -> Tuple[str, str]:
+        """Profile for duration seconds; returns (output file path, short text summary)"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'")
+        if self._lock.locked():
+            raise ProfilerBusy("A profiling session is already running")
+
+        duration = max(1.0, min(float(duration), self.max_duration))
+        async with self._lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stem = os.path.join(self.output_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{mode}")
+            logging.info(f"Starting {duration:.0f}s {mode} profiling session")
+
+            if mode == 'sample':
+                return await self._sample(stem, duration)
+            if mode == 'cprofile':
+                return await self._cprofile(stem, duration)
+            return await self._memory(stem, duration)
+
+    # CPU
+    async def _sample(self, stem: str, duration: float) -> Tuple[str, str]:
+        loop_thread_id = threading.get_ident()
+        stacks: Dict[str, int] = {}
+        stop = threading.Event()
+
+        def sampler():
+            while not stop.wait(self.sample_interval):
+                frame = sys._current_frames().get(loop_thread_id)
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                    frame = frame.f_back
+                key = ';'.join(reversed(names))
+                stacks[key] = stacks.get(key, 0) + 1
+
+        # The sampler needs the GIL to read the stack; a short switch interval stops samples from
+        # only landing where the loop releases the GIL itself (select)
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, self.sample_interval / 50))
+        thread = threading.Thread(target=sampler, name='profiler-sampler', daemon=True)
+        thread.start()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            stop.set()
+            await asyncio.to_thread(thread.join)
+            sys.setswitchinterval(switch_interval)
+
+        path = f"{stem}.folded"
+        await asyncio.to_thread(self._write_lines, path, [f"{stack} {count}" for stack, count in stacks.items()])
+
+        # Summary: leaf functions with the most samples
+        total = sum(stacks.values()) or 1
+        leaves: Dict[str, int] = {}
+        for stack, count in stacks.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        top = sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:10]
+        summary = '\n'.join(f"{count / total:6.1%}  {leaf}" for leaf, count in top)
+        return path, f"{total} samples\n{summary}"
+
+    async def _cprofile(self, stem: str, duration: float) -> Tuple[str, str]:
+        # Imported on use - pstats alone costs ~30 ms of every bot start
+        import cProfile
+        import pstats
+        # Enabled from the event loop thread, so it sees every callback the loop runs
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profile.disable()
+
+        path = f"{stem}.prof"
+
+        def write() -> str:
+            profile.dump_stats(path)
+            report = io.StringIO()
+            pstats.Stats(profile, stream=report).sort_stats('cumulative').print_stats(30)
+            self._write_lines(f"{stem}.txt", [report.getvalue()])
+            summary = io.StringIO()
+            pstats.Stats(profile, stream=summary).sort_stats('tottime').print_stats(8)
+            return summary.getvalue()
+
+        summary = await asyncio.to_thread(write)
+        lines = [line for line in summary.splitlines() if line.strip()]
+        return path, '\n'.join(lines[-9:])
+
+    # MEMORY
+    async def _memory(self, stem: str, duration: float, limit: int = 25) -> Tuple[str, str]:
+        import tracemalloc
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(10)
+        try:
+            baseline = tracemalloc.take_snapshot()
+            await asyncio.sleep(duration)
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+        def write() -> List[str]:
+            top = snapshot.statistics('lineno')[:limit]
+            growth = snapshot.compare_to(baseline, 'lineno')[:limit]
+            lines = [f"Traced: {current / 1024 / 1024:.1f} MiB (peak {peak / 1024 / 1024:.1f} MiB)", "", "Top allocators:"]
+            lines += [str(stat) for stat in top]
+            lines += ["", f"Growth over {duration:.0f}s:"]
+            lines += [str(stat) for stat in growth]
+            self._write_lines(f"{stem}.txt", lines)
+            return [str(stat) for stat in top[:8]]
+
+        top = await asyncio.to_thread(write)
+        return f"{stem}.txt", f"Traced: {current / 1024 / 1024:.1f} MiB\n" + '\n'.join(top)
+
+    @staticmethod
+    def _write_lines(path: str, lines: List[str]):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+class ControlServer:
+    """Loopback control socket for starting profiling sessions without Discord
+
+    One command per connection, prefixed with the shared token, e.g.
+    `echo "$PROFILER_CONTROL_TOKEN sample 30" | nc 127.0.0.1 <port>`; replies
+    with the output file path and summary. Refuses to start without a token.
+    """
+
+    def __init__(self, profiler: Profiler, token: str, host: str = '127.0.0.1', port: int = 0):
+        if not token:
+            raise ValueError("PROFILER_CONTROL_TOKEN must be set to enable the profiler control socket")
+        self.profiler = profiler
+        self.token = token
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Profiler control socket listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            parts = (await reader.readline()).decode('utf-8', 'replace').split()
+            if not parts or not hmac.compare_digest(parts[0].encode('utf-8'), self.token.encode('utf-8')):
+                logging.warning("Rejected profiler control command with a missing or wrong token")
+                reply = "error: invalid token"
+            elif len(parts) < 2 or parts[1] not in PROFILE_MODES:
+                reply = f"usage: <token> <{'|'.join(PROFILE_MODES)}> [seconds]"
+            else:
+                duration = float(parts[2]) if len(parts) > 2 else 30
+                path, summary = await self.profiler.run(parts[1], duration)
+                reply = f"{path}\n{summary}"
+        except (ProfilerBusy, ValueError) as e:
+            reply = f"error: {e}"
+        except Exception as e:
+            logging.error(f"Error handling profiler control command: {e}")
+            reply = f"error: {e}"
+        try:
+            writer.write(reply.encode('utf-8') + b'\n')
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+# Shared profiler used by the /profile command and the control socket
+profiler = Profiler(Config.PROFILE_OUTPUT_DIR, Config.PROFILE_MAX_SECONDS)
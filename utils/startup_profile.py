@@ -0,0 +1,128 @@
+# Startup profile module
+"""
+Where a bot start spends its time (python main.py --profile-startup)
+
+Phases (importing the bot, cog imports and setup, the setup_hook steps) are
+always recorded - it's a perf_counter call each - and the start-to-ready time
+is logged. With --profile-startup an import hook also times every module
+imported after it is installed, and the full breakdown is printed once the
+bot is ready.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+import importlib.abc
+import logging
+import sys
+import time
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Times module execution (self and cumulative) - a programmatic -X importtime"""
+
+    def __init__(self):
+        self.times: Dict[str, List[float]] = {}  # module: [self seconds, cumulative seconds]
+        self._stack: List[float] = []  # time spent in nested imports, per module being executed
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Builtin and frozen modules use class-level loaders shared by every module; they're cheap anyway
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+        loader.exec_module = self._timed(fullname, loader.exec_module)
+        return spec
+
+    def _timed(self, name: str, exec_module):
+        def timed_exec_module(module):
+            self._stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                self.times[name] = [elapsed - nested, elapsed]
+        return timed_exec_module
+
+    def by_package(self) -> List[Tuple[str, float, int]]:
+        """(top-level package, seconds, modules) sorted by time"""
+        packages: Dict[str, List[float]] = {}
+        for name, (own, _) in self.times.items():
+            entry = packages.setdefault(name.split('.', 1)[0], [0.0, 0])
+            entry[0] += own
+            entry[1] += 1
+        return sorted(((name, s, int(n)) for name, (s, n) in packages.items()), key=lambda item: item[1], reverse=True)
+
+class StartupProfile:
+    """Named startup phases, in the order they finished (nested phases before their parent)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, int]] = []  # (name, seconds, nesting depth)
+        # Per task, so phases running concurrently (cogs loading in parallel) nest correctly
+        self._depth: ContextVar[int] = ContextVar('startup_phase_depth', default=0)
+        self.import_timer: Optional[ImportTimer] = None
+        self.reported = False
+
+    def enable_import_timing(self):
+        self.import_timer = ImportTimer()
+        self.import_timer.install()
+
+    @contextmanager
+    def phase(self, name: str):
+        depth = self._depth.get()
+        token = self._depth.set(depth + 1)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth.reset(token)
+            self.phases.append((name, time.perf_counter() - started, depth))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def ready(self):
+        """Log (and with --profile-startup print) the breakdown, once per process"""
+        if self.reported:
+            return
+        self.reported = True
+        if self.import_timer:
+            self.import_timer.uninstall()
+            print(self.report(), flush=True)
+        logging.info(f"Ready {self.elapsed():.2f}s after start")
+
+    def report(self, top: int = 15) -> str:
+        total = self.elapsed()
+        lines = [f"Startup profile - ready after {total * 1000:.0f} ms", "", "Phases:"]
+        lines += [f"  {seconds * 1000:9.1f} ms  {'  ' * depth}{name}" for name, seconds, depth in self.phases]
+        outside = total - sum(seconds for _, seconds, depth in self.phases if depth == 0)
+        lines.append(f"  {outside * 1000:9.1f} ms  other (login, gateway connect and READY)")
+        if self.import_timer and self.import_timer.times:
+            timer = self.import_timer
+            imported = sum(own for own, _ in timer.times.values())
+            lines += ["", f"Imports: {len(timer.times)} modules, {imported * 1000:.1f} ms", "", "By package (self time):"]
+            lines += [f"  {seconds * 1000:9.1f} ms  {name} ({count} modules)" for name, seconds, count in timer.by_package()[:top]]
+            lines += ["", "Slowest modules (self / cumulative):"]
+            slowest = sorted(timer.times.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            lines += [f"  {own * 1000:9.1f} / {cumulative * 1000:7.1f} ms  {name}" for name, (own, cumulative) in slowest]
+        return '\n'.join(lines)
+
+# Shared startup profile; its clock starts when this module is first imported
+startup_profile = StartupProfile()
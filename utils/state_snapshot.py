@@ -0,0 +1,318 @@
+# State snapshot module
+"""
+Warm-start snapshot of the guild state commands rely on
+
+After an IDENTIFY the guilds in READY are empty placeholders until their
+GUILD_CREATE arrives, and member lists stay empty until chunking finishes, so
+lookups, log channels and role checks fail during the first seconds (or
+minutes, for large bots) after a boot. The bot periodically writes the minimal
+state it needs - per guild: channels, roles, and member ID/name pairs with
+their role IDs - to a compact binary file. On startup the file is mmapped
+(nothing is decoded until a guild is needed):
+
+- guilds that are still unavailable when their shard connects get their
+  channels and roles from the snapshot, so get_channel(), guild.roles and
+  Member.top_role work right away
+- name lookups in guilds that aren't chunked yet resolve the name to a member
+  ID from the snapshot and fetch just that member (the live member must still
+  match the name, otherwise the normal chunking path is used)
+
+Reconciliation: when a guild's GUILD_CREATE has been applied, its roles are
+replaced by discord.py and any snapshot channel that the live payload didn't
+include is removed. Member hints are only used until the guild is chunked.
+
+File layout (little-endian):
+    header   magic 'ASNP', version u16, reserved u16, created_at f64, guild count u32
+    index    guild count x (guild_id u64, offset u64, length u32), sorted by guild_id
+    records  channel count u32, role count u32, member count u32, members offset u32, name str
+             channels: id u64, type u8, position i32, parent_id u64 (0 = none), name str
+             roles:    id u64, position i32, permissions u64, color u32, name str
+             members:  id u64, role count u16, role ids u64..., name str, display name str
+    str      length u16, UTF-8 bytes
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import discord
+import asyncio
+import bisect
+import logging
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b'ASNP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHdI')
+INDEX_ENTRY = struct.Struct('<QQI')
+RECORD_HEADER = struct.Struct('<IIII')
+CHANNEL = struct.Struct('<QBiQ')
+ROLE = struct.Struct('<QiQI')
+MEMBER = struct.Struct('<QH')
+STR_LENGTH = struct.Struct('<H')
+
+Channel = Tuple[int, int, int, int, str]  # id, type, position, parent_id, name
+Role = Tuple[int, int, int, int, str]  # id, position, permissions, color, name
+Member = Tuple[int, str, str, Tuple[int, ...]]  # id, name, display name, role ids
+
+# ENCODING
+def _pack_str(parts: list, text: str):
+    data = (text or '').encode('utf-8')[:0xFFFF]
+    parts.append(STR_LENGTH.pack(len(data)))
+    parts.append(data)
+
+def encode_guild(name: str, channels: List[Channel], roles: List[Role], members: List[Member]) -> bytes:
+    parts = []
+    _pack_str(parts, name)
+    for channel_id, channel_type, position, parent_id, channel_name in channels:
+        parts.append(CHANNEL.pack(channel_id, channel_type, position, parent_id))
+        _pack_str(parts, channel_name)
+    for role_id, position, permissions, color, role_name in roles:
+        parts.append(ROLE.pack(role_id, position, permissions, color))
+        _pack_str(parts, role_name)
+    head = b''.join(parts)
+    parts = []
+    for member_id, member_name, display_name, role_ids in members:
+        role_ids = role_ids[:0xFFFF]
+        parts.append(MEMBER.pack(member_id, len(role_ids)))
+        parts.append(struct.pack(f'<{len(role_ids)}Q', *role_ids))
+        _pack_str(parts, member_name)
+        _pack_str(parts, display_name)
+    members_offset = RECORD_HEADER.size + len(head)
+    return RECORD_HEADER.pack(len(channels), len(roles), len(members), members_offset) + head + b''.join(parts)
+
+def extract_guild(guild: discord.Guild) -> Tuple[str, List[Channel], List[Role], List[Member]]:
+    """The snapshot fields of a live guild, as plain tuples (cheap to hand to a worker thread)"""
+    channels = [(c.id, c.type.value, c.position, c.category_id or 0, c.name) for c in guild.channels]
+    roles = [(r.id, r.position, r.permissions.value, r.color.value, r.name) for r in guild.roles]
+    members = [(m.id, m.name, m.display_name, tuple(m._roles)) for m in guild.members]
+    return guild.name or '', channels, roles, members
+
+def write_snapshot(path: str, records: Dict[int, bytes]):
+    """Write a snapshot file (callers write to a temporary path and rename it into place)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    guild_ids = sorted(records)
+    offset = HEADER.size + INDEX_ENTRY.size * len(guild_ids)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, time.time(), len(guild_ids)))
+        for guild_id in guild_ids:
+            f.write(INDEX_ENTRY.pack(guild_id, offset, len(records[guild_id])))
+            offset += len(records[guild_id])
+        for guild_id in guild_ids:
+            f.write(records[guild_id])
+
+# DECODING
+class GuildRecord:
+    """One guild's entry in a mapped snapshot, decoded on access"""
+
+    def __init__(self, buffer, offset: int, length: int):
+        self._buffer = buffer
+        self._offset = offset
+        self.length = length
+        self.channel_count, self.role_count, self.member_count, self._members_offset = \
+            RECORD_HEADER.unpack_from(buffer, offset)
+
+    def _str(self, pos: int) -> Tuple[str, int]:
+        (length,) = STR_LENGTH.unpack_from(self._buffer, pos)
+        pos += STR_LENGTH.size
+        return bytes(self._buffer[pos:pos + length]).decode('utf-8', 'replace'), pos + length
+
+    def raw(self) -> bytes:
+        return bytes(self._buffer[self._offset:self._offset + self.length])
+
+    def header(self) -> Tuple[str, List[Channel], List[Role]]:
+        """Guild name, channels and roles (members are decoded separately)"""
+        name, pos = self._str(self._offset + RECORD_HEADER.size)
+        channels = []
+        for _ in range(self.channel_count):
+            channel_id, channel_type, position, parent_id = CHANNEL.unpack_from(self._buffer, pos)
+            channel_name, pos = self._str(pos + CHANNEL.size)
+            channels.append((channel_id, channel_type, position, parent_id, channel_name))
+        roles = []
+        for _ in range(self.role_count):
+            role_id, position, permissions, color = ROLE.unpack_from(self._buffer, pos)
+            role_name, pos = self._str(pos + ROLE.size)
+            roles.append((role_id, position, permissions, color, role_name))
+        return name, channels, roles
+
+    def members(self) -> Iterable[Member]:
+        pos = self._offset + self._members_offset
+        for _ in range(self.member_count):
+            member_id, role_count = MEMBER.unpack_from(self._buffer, pos)
+            pos += MEMBER.size
+            role_ids = struct.unpack_from(f'<{role_count}Q', self._buffer, pos)
+            member_name, pos = self._str(pos + 8 * role_count)
+            display_name, pos = self._str(pos)
+            yield member_id, member_name, display_name, role_ids
+
+class SnapshotReader:
+    """Memory-mapped snapshot file; guilds are found by binary search over the index"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.created_at, self.guild_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} state snapshot")
+        # Just the index's guild IDs, for bisect; records stay on disk until used
+        self._ids = [INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)[0]
+                     for i in range(self.guild_count)]
+
+    def guild_ids(self) -> List[int]:
+        return list(self._ids)
+
+    def get(self, guild_id: int) -> Optional[GuildRecord]:
+        i = bisect.bisect_left(self._ids, guild_id)
+        if i == len(self._ids) or self._ids[i] != guild_id:
+            return None
+        _, offset, length = INDEX_ENTRY.unpack_from(self._map, HEADER.size + i * INDEX_ENTRY.size)
+        return GuildRecord(self._map, offset, length)
+
+    def close(self):
+        self._map.close()
+
+# LIVE STATE
+class StateSnapshot:
+    """Serves snapshot state until the live gateway state has arrived"""
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.reader: Optional[SnapshotReader] = None
+        self._hydrated: Dict[int, Dict[int, object]] = {}  # guild_id: {channel_id: hydrated channel}
+        self._names: Dict[int, Dict[str, List[int]]] = {}  # guild_id: lowered name -> member IDs
+        self._save_lock: Optional[asyncio.Lock] = None
+
+    def open(self, path: str) -> int:
+        """Map the snapshot at path, if any; returns the number of guilds in it"""
+        self.path = path
+        try:
+            self.reader = SnapshotReader(path)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, struct.error) as e:
+            logging.error(f"Error opening state snapshot {path}: {e}")
+            return 0
+        return self.reader.guild_count
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+        self._names.clear()
+
+    # Channels and roles
+    def hydrate(self, guild: discord.Guild) -> bool:
+        """Fill a guild that is still waiting for its GUILD_CREATE with the snapshot's channels and roles"""
+        record = self.reader.get(guild.id) if self.reader else None
+        if record is None or not guild.unavailable or guild.id in self._hydrated:
+            return False
+        name, channels, roles = record.header()
+        state = guild._state
+        if guild.name is None:
+            guild.name = name
+        for role_id, position, permissions, color, role_name in roles:
+            guild._add_role(discord.Role(guild=guild, state=state, data={
+                'id': role_id, 'name': role_name, 'position': position, 'permissions': str(permissions),
+                'color': color, 'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0
+            }))
+        hydrated = {}
+        for channel_id, channel_type, position, parent_id, channel_name in channels:
+            factory, _ = discord.channel._guild_channel_factory(channel_type)
+            if factory is None:
+                continue
+            try:
+                channel = factory(guild=guild, state=state, data={
+                    'id': channel_id, 'type': channel_type, 'name': channel_name, 'position': position,
+                    'parent_id': parent_id or None, 'permission_overwrites': [], 'nsfw': False
+                })
+            except Exception as e:
+                logging.error(f"Error restoring channel {channel_id} from state snapshot: {e}")
+                continue
+            guild._add_channel(channel)
+            hydrated[channel_id] = channel
+        self._hydrated[guild.id] = hydrated
+        return True
+
+    def hydrate_shard(self, client: discord.Client, shard_id: int) -> int:
+        count = 0
+        for guild in client.guilds:
+            if guild.shard_id == shard_id and self.hydrate(guild):
+                count += 1
+        return count
+
+    def reconcile(self, guild: discord.Guild):
+        """The live GUILD_CREATE has been applied: drop snapshot channels it didn't include"""
+        hydrated = self._hydrated.pop(guild.id, None)
+        if not hydrated:
+            return
+        for channel_id, channel in hydrated.items():
+            # Channels in the live payload were replaced by new objects
+            if guild._channels.get(channel_id) is channel:
+                guild._remove_channel(channel)
+
+    # Members
+    def member_ids(self, guild: discord.Guild, identifier: str) -> List[int]:
+        """IDs of snapshot members whose display name or username is identifier (case-insensitive)
+
+        Only answers for guilds that aren't chunked yet; callers must verify against the live member.
+        """
+        if self.reader is None or guild.chunked:
+            self._names.pop(guild.id, None)
+            return []
+        names = self._names.get(guild.id)
+        if names is None:
+            record = self.reader.get(guild.id)
+            if record is None:
+                return []
+            names = {}
+            for member_id, member_name, display_name, _ in record.members():
+                for key in {display_name.lower(), member_name.lower()}:
+                    names.setdefault(key, []).append(member_id)
+            self._names[guild.id] = names
+        return names.get(identifier.lower(), [])
+
+    # Saving
+    async def save(self, guilds: Iterable[discord.Guild]) -> int:
+        """Write the current state of the given guilds; returns the number of guilds saved
+
+        Guilds still waiting for their GUILD_CREATE keep their previous record. For guilds
+        that aren't chunked, cached members are merged into the previous member list.
+        """
+        if self.path is None:
+            return 0
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            live, kept = {}, []
+            for guild in guilds:
+                if guild.unavailable or guild.id in self._hydrated:
+                    kept.append(guild.id)
+                else:
+                    live[guild.id] = (extract_guild(guild), guild.chunked)
+                await asyncio.sleep(0)
+            temp_path = self.path + '.tmp'
+            await asyncio.to_thread(self._write, temp_path, live, kept)
+            # Swap on the loop thread so no lookup reads the old map while it closes
+            self.close()
+            os.replace(temp_path, self.path)
+            self.open(self.path)
+            return len(live) + len(kept)
+
+    def _write(self, temp_path: str, live: dict, kept: List[int]):
+        records = {}
+        for guild_id in kept:
+            record = self.reader.get(guild_id) if self.reader else None
+            if record is not None:
+                records[guild_id] = record.raw()
+        for guild_id, ((name, channels, roles, members), chunked) in live.items():
+            record = self.reader.get(guild_id) if self.reader else None
+            if not chunked and record is not None:
+                cached = {member[0] for member in members}
+                members = members + [member for member in record.members() if member[0] not in cached]
+            records[guild_id] = encode_guild(name, channels, roles, members)
+        write_snapshot(temp_path, records)
+
+# Shared instance used by lookups and startup
+state_snapshot = StateSnapshot()
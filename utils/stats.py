@@ -0,0 +1,85 @@
+# Stats module
+from typing import Dict, Iterable
+from collections import deque
+from datetime import datetime, timezone
+import time
+
+class BotStats:
+    """Bot statistics kept up to date incrementally instead of recomputed per command
+
+    Guild and user totals are counted once when the bot becomes ready and then
+    adjusted from guild/member join and leave events. The command count is
+    taken when cogs are loaded.
+    """
+
+    def __init__(self, latency_samples: int = 120):
+        self.started_at = datetime.now(timezone.utc)
+        self._started_monotonic = time.monotonic()
+        self.guild_count = 0
+        self.user_count = 0
+        self.command_count = 0
+        self._latencies = deque(maxlen=latency_samples)  # heartbeat latency samples, seconds
+
+    # UPTIME
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self._started_monotonic
+
+    def uptime_text(self) -> str:
+        minutes, seconds = divmod(int(self.uptime), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        if days:
+            return f"{days}d {hours}h {minutes}m"
+        if hours:
+            return f"{hours}h {minutes}m"
+        return f"{minutes}m {seconds}s"
+
+    # COUNTS
+    def refresh(self, guilds: Iterable) -> None:
+        """Full recount - only on ready/resume, not per command"""
+        guilds = list(guilds)
+        self.guild_count = len(guilds)
+        self.user_count = sum(guild.member_count or 0 for guild in guilds)
+
+    def count_commands(self, tree) -> None:
+        self.command_count = sum(1 for _ in tree.walk_commands())
+
+    def guild_joined(self, guild) -> None:
+        self.guild_count += 1
+        self.user_count += guild.member_count or 0
+
+    def guild_left(self, guild) -> None:
+        self.guild_count = max(self.guild_count - 1, 0)
+        self.user_count = max(self.user_count - (guild.member_count or 0), 0)
+
+    def member_joined(self) -> None:
+        self.user_count += 1
+
+    def member_left(self) -> None:
+        self.user_count = max(self.user_count - 1, 0)
+
+    # LATENCY
+    def record_latency(self, seconds: float) -> None:
+        if seconds == seconds and seconds != float('inf'):  # skip NaN/inf before the first heartbeat
+            self._latencies.append(seconds)
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        """p50/p95/p99 heartbeat latency in milliseconds over the recent samples"""
+        if not self._latencies:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        ordered = sorted(self._latencies)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] * 1000
+        return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99)}
+
+    def snapshot(self) -> dict:
+        return {
+            'guilds': self.guild_count,
+            'users': self.user_count,
+            'commands': self.command_count,
+            'uptime': self.uptime,
+            'latency': self.latency_percentiles()
+        }
+
+# Shared instance
+bot_stats = BotStats()
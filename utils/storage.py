@@ -0,0 +1,506 @@
+# Storage module
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from config.config import Config
+from utils.cluster import hosted_guilds_sql
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import time
+
+# Schema migrations, applied in order inside one transaction each; PRAGMA user_version
+# records how many have been applied. Never edit an entry once released - append a new one.
+MIGRATIONS: List[Tuple[str, ...]] = [
+    # 1: user timezones and log channel configuration (previously data/*.json)
+    (
+        "CREATE TABLE user_timezones ("
+        " user_id INTEGER PRIMARY KEY,"
+        " timezone TEXT NOT NULL)",
+        "CREATE TABLE log_channels ("
+        " guild_id INTEGER NOT NULL,"
+        " log_type TEXT NOT NULL,"
+        " channel_id INTEGER NOT NULL,"
+        " PRIMARY KEY (guild_id, log_type))"
+    ),
+    # 2: legacy JSON import progress, and other data/*.json files kept as key/value documents
+    (
+        "CREATE TABLE legacy_imports ("
+        " source TEXT PRIMARY KEY,"
+        " size INTEGER NOT NULL,"
+        " mtime REAL NOT NULL,"
+        " items INTEGER NOT NULL DEFAULT 0,"
+        " status TEXT NOT NULL DEFAULT 'running',"
+        " updated_at REAL NOT NULL)",
+        "CREATE TABLE legacy_documents ("
+        " source TEXT NOT NULL,"
+        " key TEXT NOT NULL,"
+        " value TEXT NOT NULL,"
+        " PRIMARY KEY (source, key))"
+    ),
+    # 3: log outbox and scheduled announcements (previously data/log_outbox.db and data/announcements.db)
+    (
+        "CREATE TABLE log_outbox ("
+        " event_id TEXT PRIMARY KEY,"
+        " guild_id INTEGER NOT NULL,"
+        " log_type TEXT NOT NULL,"
+        " payload TEXT NOT NULL,"
+        " created_at REAL NOT NULL,"
+        " attempts INTEGER NOT NULL DEFAULT 0,"
+        " next_attempt REAL NOT NULL)",
+        "CREATE INDEX idx_log_outbox_due ON log_outbox (next_attempt)",
+        "CREATE TABLE scheduled_announcements ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " guild_id INTEGER NOT NULL,"
+        " author_id INTEGER NOT NULL,"
+        " payload TEXT NOT NULL,"
+        " targets TEXT NOT NULL,"
+        " send_at REAL NOT NULL,"
+        " status TEXT NOT NULL DEFAULT 'pending',"
+        " result TEXT)",
+        "CREATE INDEX idx_scheduled_announcements_due ON scheduled_announcements (status, send_at)"
+    ),
+    # 4: one scheduled announcement row per target guild, sharing the job_id of the first row
+    (
+        "ALTER TABLE scheduled_announcements ADD COLUMN job_id INTEGER",
+        "ALTER TABLE scheduled_announcements ADD COLUMN target_guild_id INTEGER",
+        "UPDATE scheduled_announcements SET job_id = id, target_guild_id = guild_id",
+        "CREATE INDEX idx_scheduled_announcements_job ON scheduled_announcements (job_id)"
+    )
+]
+
+class Storage:
+    """Shared SQLite database behind the cogs' repositories
+
+    Reads run on a small pool of WAL connections in worker threads, so they never
+    block the event loop and don't wait for writers. Writes go to a single writer
+    connection: everything queued while one commit is in flight is committed together
+    in the next transaction (each write in its own savepoint, so one failing write
+    doesn't undo the others). SQL is passed as constant strings so sqlite3's
+    per-connection statement cache reuses the prepared statements.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 500):
+        self.path = path
+        self.pool_size = max(1, pool_size)
+        self.batch_size = batch_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._readers: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._pending: List[Tuple[Callable[[sqlite3.Connection], Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    # CONNECTIONS (worker threads)
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: transactions are managed explicitly by the writer
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> int:
+        """Apply pending migrations; safe when several processes start at once"""
+        applied = 0
+        for number, statements in enumerate(MIGRATIONS, start=1):
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= number:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock: another cluster may have just migrated
+                if conn.execute("PRAGMA user_version").fetchone()[0] < number:
+                    for statement in statements:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {number}")
+                    applied += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return applied
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        writer = self._connect()
+        applied = self._migrate(writer)
+        if applied:
+            logging.info(f"Applied {applied} database migration(s) to {self.path}")
+        for _ in range(self.pool_size):
+            self._readers.put(self._connect())
+        return writer
+
+    def _read(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self._readers.get()
+        try:
+            return func(conn)
+        finally:
+            self._readers.put(conn)
+
+    def _commit(self, operations: List[Callable[[sqlite3.Connection], Any]]) -> List[Tuple[bool, Any]]:
+        """Run queued writes in one transaction; returns (ok, result or exception) per write"""
+        conn = self._writer
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for operation in operations:
+                conn.execute("SAVEPOINT write")
+                try:
+                    result = operation(conn)
+                    # Cursors must not reach the event loop thread (they share the writer's statements)
+                    if isinstance(result, sqlite3.Cursor):
+                        result = result.rowcount
+                    results.append((True, result))
+                    conn.execute("RELEASE write")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    conn.execute("RELEASE write")
+                    results.append((False, e))
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return results
+
+    # ASYNC API
+    async def open(self):
+        """Open the pool and migrate the schema (idempotent)"""
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size + 1, thread_name_prefix='storage')
+            self._writer = await asyncio.get_running_loop().run_in_executor(self._executor, self._open)
+
+    async def read(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(connection) on a pooled reader connection in a worker thread"""
+        await self.open()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._read, func)
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await self.read(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        return await self.read(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def write(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Queue func(connection) for the next batched commit and wait until it is committed"""
+        await self.open()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((func, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def execute(self, sql: str, params: tuple = ()) -> int:
+        """Batched single-statement write; returns the affected row count"""
+        return await self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, rows: Iterable[tuple]) -> int:
+        return await self.write(lambda conn: conn.executemany(sql, rows).rowcount)
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            try:
+                results = await loop.run_in_executor(self._executor, self._commit, [func for func, _ in batch])
+            except Exception as e:
+                logging.error(f"Error committing {len(batch)} database write(s): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), (ok, result) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(result)
+                else:
+                    future.set_exception(result)
+
+    async def close(self):
+        """Finish queued writes and close every connection"""
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._writer is None:
+            return
+
+        def close_all():
+            self._writer.close()
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, close_all)
+        self._executor.shutdown(wait=False)
+        self._writer = None
+        self._executor = None
+
+# REPOSITORIES
+class TimezoneRepository:
+    """User timezone preferences"""
+
+    SELECT_ALL = "SELECT user_id, timezone FROM user_timezones"
+    # user_id is the rowid, so this order costs nothing
+    SELECT_ALL_ORDERED = "SELECT user_id, timezone FROM user_timezones ORDER BY user_id"
+    SELECT_ONE = "SELECT timezone FROM user_timezones WHERE user_id = ?"
+    UPSERT = ("INSERT INTO user_timezones (user_id, timezone) VALUES (?, ?) "
+              "ON CONFLICT(user_id) DO UPDATE SET timezone = excluded.timezone")
+    DELETE = "DELETE FROM user_timezones WHERE user_id = ?"
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    async def all(self) -> Dict[int, str]:
+        return dict(await self.storage.fetchall(self.SELECT_ALL))
+
+    async def load(self, build: Callable[[Iterable[Tuple[int, str]]], Any]) -> Any:
+        """build(rows) over every (user_id, timezone) row in user ID order, run in a reader thread
+
+        The rows are streamed from the cursor, so a bulk load never holds them all in a list.
+        """
+        return await self.storage.read(lambda conn: build(conn.execute(self.SELECT_ALL_ORDERED)))
+
+    async def get(self, user_id: int) -> Optional[str]:
+        row = await self.storage.fetchone(self.SELECT_ONE, (user_id,))
+        return row[0] if row else None
+
+    async def set(self, user_id: int, timezone: str):
+        await self.storage.execute(self.UPSERT, (user_id, timezone))
+
+    async def set_many(self, items: Iterable[Tuple[int, str]]) -> int:
+        return await self.storage.executemany(self.UPSERT, list(items))
+
+    async def delete(self, user_id: int) -> bool:
+        return await self.storage.execute(self.DELETE, (user_id,)) > 0
+
+class LogChannelRepository:
+    """Per-guild log channel IDs by log type"""
+
+    SELECT_ALL = "SELECT guild_id, log_type, channel_id FROM log_channels"
+    DELETE_GUILD = "DELETE FROM log_channels WHERE guild_id = ?"
+    INSERT = "INSERT OR REPLACE INTO log_channels (guild_id, log_type, channel_id) VALUES (?, ?, ?)"
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    async def all(self) -> Dict[int, Dict[str, int]]:
+        config: Dict[int, Dict[str, int]] = {}
+        for guild_id, log_type, channel_id in await self.storage.fetchall(self.SELECT_ALL):
+            config.setdefault(guild_id, {})[log_type] = channel_id
+        return config
+
+    async def set_guilds(self, config: Dict[int, Dict[str, int]]):
+        """Replace the stored channels of the given guilds in one write"""
+        delete = [(guild_id,) for guild_id in config]
+        rows = [(guild_id, log_type, channel_id)
+                for guild_id, channels in config.items() for log_type, channel_id in channels.items()]
+
+        def replace(conn: sqlite3.Connection):
+            conn.executemany(self.DELETE_GUILD, delete)
+            conn.executemany(self.INSERT, rows)
+
+        await self.storage.write(replace)
+
+    async def set_guild(self, guild_id: int, channels: Dict[str, int]):
+        await self.set_guilds({guild_id: channels})
+
+class LogOutboxRepository:
+    """Log embeds that could not be delivered, retried with exponential backoff
+
+    With several clusters every process shares the table; pass the process's
+    shards to due() so each cluster only retries (and acks) its own guilds' events.
+    """
+
+    INSERT = ("INSERT OR IGNORE INTO log_outbox "
+              "(event_id, guild_id, log_type, payload, created_at, attempts, next_attempt) "
+              "VALUES (?, ?, ?, ?, ?, 0, ?)")
+    SELECT_DUE = ("SELECT event_id, guild_id, log_type, payload, created_at, attempts "
+                  "FROM log_outbox WHERE next_attempt <= ?")
+    DELETE = "DELETE FROM log_outbox WHERE event_id = ?"
+    RETRY = "UPDATE log_outbox SET attempts = ?, next_attempt = ? WHERE event_id = ?"
+    EXPIRE = "DELETE FROM log_outbox WHERE created_at < ?"
+    STATS = "SELECT COUNT(*), MIN(created_at) FROM log_outbox"
+
+    def __init__(self, storage: Storage, base_delay: float = 5.0, max_delay: float = 3600.0,
+                 max_age: float = 7 * 24 * 3600):
+        self.storage = storage
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_age = max_age
+
+    @staticmethod
+    def make_event_id(guild_id: int, log_type: str, payload: dict) -> str:
+        """Derive a stable event ID so the same embed is never spooled twice"""
+        raw = json.dumps([guild_id, log_type, payload], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def backoff(self, attempts: int) -> float:
+        """Exponential retry delay for the given number of failed attempts"""
+        return min(self.base_delay * (2 ** attempts), self.max_delay)
+
+    async def enqueue(self, guild_id: int, log_type: str, payload: dict) -> bool:
+        """Spool an undelivered embed payload; returns False if it was already queued"""
+        now = time.time()
+        event_id = self.make_event_id(guild_id, log_type, payload)
+        params = (event_id, guild_id, log_type, json.dumps(payload), now, now + self.backoff(0))
+        return await self.storage.execute(self.INSERT, params) > 0
+
+    async def due(self, limit: int = 50, shard_ids: Optional[List[int]] = None,
+                  shard_count: Optional[int] = None) -> List[dict]:
+        """Entries whose backoff has elapsed, oldest first (only guilds on shard_ids when given)"""
+        hosted, hosted_params = hosted_guilds_sql('guild_id', shard_ids, shard_count)
+        sql = self.SELECT_DUE + hosted + " ORDER BY created_at LIMIT ?"
+        params = (time.time(), *hosted_params, limit)
+
+        def fetch(conn: sqlite3.Connection) -> List[dict]:
+            return [
+                {
+                    'event_id': row[0],
+                    'guild_id': row[1],
+                    'log_type': row[2],
+                    'payload': json.loads(row[3]),
+                    'created_at': row[4],
+                    'attempts': row[5]
+                }
+                for row in conn.execute(sql, params)
+            ]
+
+        return await self.storage.read(fetch)
+
+    async def ack(self, event_ids: List[str]):
+        """Remove delivered entries"""
+        if event_ids:
+            await self.storage.executemany(self.DELETE, [(event_id,) for event_id in event_ids])
+
+    async def retry_later(self, event_id: str, attempts: int):
+        """Record a failed delivery and push the next attempt back"""
+        await self.storage.execute(self.RETRY, (attempts, time.time() + self.backoff(attempts), event_id))
+
+    async def expire(self) -> int:
+        """Drop entries older than the configured maximum age"""
+        return await self.storage.execute(self.EXPIRE, (time.time() - self.max_age,))
+
+    async def stats(self) -> dict:
+        """Number of spooled entries and the age of the oldest one"""
+        count, oldest = await self.storage.fetchone(self.STATS)
+        return {
+            'size': count,
+            'oldest_age': (time.time() - oldest) if oldest else 0.0
+        }
+
+class AnnouncementRepository:
+    """Scheduled announcement jobs: pending -> sending -> sent/failed, or cancelled
+
+    A job is stored as one row per target guild (sharing the job_id of its
+    first row), so with several clusters each part is sent by the cluster
+    hosting its target guild: pass the process's shards to due()/next_deadline().
+    A row is claimed ('sending') before anything is sent, so a crash mid-send
+    leaves it 'sending' instead of sending it to every target again.
+    """
+
+    COLUMNS = "id, job_id, guild_id, target_guild_id, author_id, payload, targets, send_at"
+    INSERT = ("INSERT INTO scheduled_announcements "
+              "(job_id, guild_id, target_guild_id, author_id, payload, targets, send_at) "
+              "VALUES (?, ?, ?, ?, ?, ?, ?)")
+    SET_JOB_ID = "UPDATE scheduled_announcements SET job_id = id WHERE id = ?"
+    NEXT_DEADLINE = "SELECT MIN(send_at) FROM scheduled_announcements WHERE status = 'pending'"
+    SELECT_DUE = f"SELECT {COLUMNS} FROM scheduled_announcements WHERE status = 'pending' AND send_at <= ?"
+    SELECT_PENDING = (f"SELECT {COLUMNS} FROM scheduled_announcements "
+                      "WHERE status = 'pending' AND guild_id = ? ORDER BY send_at, job_id, id")
+    CLAIM = "UPDATE scheduled_announcements SET status = 'sending' WHERE id = ? AND status = 'pending'"
+    FINISH = "UPDATE scheduled_announcements SET status = ?, result = ? WHERE id = ? AND status = 'sending'"
+    CANCEL = ("UPDATE scheduled_announcements SET status = 'cancelled' "
+              "WHERE job_id = ? AND guild_id = ? AND status = 'pending'")
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    @staticmethod
+    def _row_to_job(row) -> dict:
+        return {
+            'id': row[0],
+            'job_id': row[1],
+            'guild_id': row[2],
+            'target_guild_id': row[3],
+            'author_id': row[4],
+            'payload': json.loads(row[5]),
+            'targets': json.loads(row[6]),
+            'send_at': row[7]
+        }
+
+    async def add(self, guild_id: int, author_id: int, payload: dict, targets: Dict[int, List[int]],
+                  send_at: float) -> int:
+        """Persist a new job ({target guild ID: channel IDs}) and return its job ID"""
+        payload = json.dumps(payload)
+
+        def insert(conn: sqlite3.Connection) -> int:
+            job_id = None
+            for target_guild_id, channel_ids in targets.items():
+                row_id = conn.execute(self.INSERT, (job_id, guild_id, target_guild_id, author_id, payload,
+                                                    json.dumps(channel_ids), send_at)).lastrowid
+                if job_id is None:
+                    job_id = row_id
+                    conn.execute(self.SET_JOB_ID, (row_id,))
+            return job_id
+
+        return await self.storage.write(insert)
+
+    async def next_deadline(self, shard_ids: Optional[List[int]] = None,
+                            shard_count: Optional[int] = None) -> Optional[float]:
+        """The earliest pending send time for the target guilds on shard_ids, if any"""
+        hosted, hosted_params = hosted_guilds_sql('target_guild_id', shard_ids, shard_count)
+        return (await self.storage.fetchone(self.NEXT_DEADLINE + hosted, hosted_params))[0]
+
+    async def due(self, now: float, shard_ids: Optional[List[int]] = None,
+                  shard_count: Optional[int] = None) -> List[dict]:
+        """Pending rows whose send time has passed, for the target guilds on shard_ids"""
+        hosted, hosted_params = hosted_guilds_sql('target_guild_id', shard_ids, shard_count)
+        rows = await self.storage.fetchall(self.SELECT_DUE + hosted + " ORDER BY send_at", (now, *hosted_params))
+        return [self._row_to_job(row) for row in rows]
+
+    async def pending(self, guild_id: int) -> List[dict]:
+        """Pending jobs created in a guild, each with the channels of all its pending rows"""
+        jobs: Dict[int, dict] = {}
+        for row in await self.storage.fetchall(self.SELECT_PENDING, (guild_id,)):
+            job = self._row_to_job(row)
+            if job['job_id'] in jobs:
+                jobs[job['job_id']]['targets'].extend(job['targets'])
+            else:
+                jobs[job['job_id']] = job
+        return list(jobs.values())
+
+    async def claim(self, row_id: int) -> bool:
+        """Mark a pending row as sending; returns False if it was cancelled or claimed meanwhile"""
+        return await self.storage.execute(self.CLAIM, (row_id,)) > 0
+
+    async def finish(self, row_id: int, status: str, result: dict):
+        """Mark a sending row as sent or failed along with its per-channel result"""
+        await self.storage.execute(self.FINISH, (status, json.dumps(result), row_id))
+
+    async def cancel(self, job_id: int, guild_id: int) -> bool:
+        """Cancel every pending row of a job; returns False if no such pending job exists"""
+        return await self.storage.execute(self.CANCEL, (job_id, guild_id)) > 0
+
+# Shared database and repositories
+storage = Storage(Config.DATABASE_PATH, Config.DATABASE_POOL_SIZE)
+timezone_repository = TimezoneRepository(storage)
+log_channel_repository = LogChannelRepository(storage)
+log_outbox_repository = LogOutboxRepository(
+    storage,
+    base_delay=Config.LOG_OUTBOX_BASE_DELAY,
+    max_delay=Config.LOG_OUTBOX_MAX_DELAY,
+    max_age=Config.LOG_OUTBOX_MAX_AGE
+)
+announcement_repository = AnnouncementRepository(storage)
@@ -0,0 +1,153 @@
+# Time parser module
+from typing import Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+import re
+import pytz
+
+# Dispatch tables
+RELATIVE_UNITS = {
+    's': 1, 'sec': 1, 'secs': 1, 'second': 1, 'seconds': 1,
+    'm': 60, 'min': 60, 'mins': 60, 'minute': 60, 'minutes': 60,
+    'h': 3600, 'hr': 3600, 'hrs': 3600, 'hour': 3600, 'hours': 3600,
+    'd': 86400, 'day': 86400, 'days': 86400,
+    'w': 604800, 'wk': 604800, 'week': 604800, 'weeks': 604800
+}
+DAY_OFFSETS = {'today': 0, 'tomorrow': 1, 'tmrw': 1, 'tmr': 1, 'yesterday': -1}
+WEEKDAYS = {
+    'mon': 0, 'monday': 0,
+    'tue': 1, 'tues': 1, 'tuesday': 1,
+    'wed': 2, 'weds': 2, 'wednesday': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3,
+    'fri': 4, 'friday': 4,
+    'sat': 5, 'saturday': 5,
+    'sun': 6, 'sunday': 6
+}
+NAMED_TIMES = {'noon': time(12), 'midday': time(12), 'midnight': time(0)}
+MERIDIEM_OFFSET = {'am': 0, 'a.m.': 0, 'pm': 12, 'p.m.': 12}
+
+# Compiled patterns (inputs are lowercased and whitespace-collapsed first)
+_CLOCK = (r'(?:(?P<hour>\d{1,2})(?::(?P<minute>\d{1,2})(?::(?P<second>\d{1,2})(?:\.(?P<fraction>\d{1,6}))?)?)?'
+          r' ?(?P<meridiem>am|pm|a\.m\.|p\.m\.)?|(?P<named>noon|midday|midnight))')
+_DAY = r'(?P<day>(?P<next>next )?[a-z]+)'
+_DATE = r'(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<mday>\d{1,2})'
+
+RELATIVE_PATTERN = re.compile(r'in (?P<parts>(?:\d+ ?[a-z]+ ?)+)')
+RELATIVE_PART_PATTERN = re.compile(r'(\d+) ?([a-z]+)')
+DATE_PATTERN = re.compile(_DATE + r'(?:(?:t| )' + _CLOCK + r')? ?(?P<offset>z|[+-]\d{2}(?::?\d{2})?)?')
+CLOCK_PATTERN = re.compile(_CLOCK)
+DAY_CLOCK_PATTERN = re.compile(_DAY + r'(?: (?:at )?' + _CLOCK + r')?')
+CLOCK_DAY_PATTERN = re.compile(_CLOCK + r' (?:on )?' + _DAY)
+
+# Parsed specs (independent of the current time, so they can be cached):
+#   ('now',)                       ('relative', seconds)
+#   ('clock', date or None, time)  ('instant', aware datetime)
+#   ('day', day offset, time)      ('weekday', weekday, next?, time)
+Spec = Tuple
+
+def _clock(match: re.Match) -> time:
+    """time() from the clock groups of a match; bare hours need am/pm ("9am", not "9")"""
+    named = match.group('named')
+    if named:
+        return NAMED_TIMES[named]
+    hour, minute, meridiem = match.group('hour'), match.group('minute'), match.group('meridiem')
+    if hour is None:
+        return time(0)
+    if minute is None and meridiem is None:
+        raise ValueError("Hour without minutes or am/pm")
+    hour = int(hour)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError("12-hour times use hours 1-12")
+        hour = hour % 12 + MERIDIEM_OFFSET[meridiem]
+    fraction = match.group('fraction')
+    return time(hour, int(minute or 0), int(match.group('second') or 0),
+                int(fraction.ljust(6, '0')) if fraction else 0)
+
+def _parse_relative(match: re.Match) -> Spec:
+    seconds = 0
+    for amount, unit in RELATIVE_PART_PATTERN.findall(match.group('parts')):
+        if unit not in RELATIVE_UNITS:
+            raise ValueError(f"Unknown time unit '{unit}'")
+        seconds += int(amount) * RELATIVE_UNITS[unit]
+    return ('relative', seconds)
+
+def _parse_date(match: re.Match) -> Spec:
+    day = date(int(match.group('year')), int(match.group('month')), int(match.group('mday')))
+    clock = _clock(match)
+    offset = match.group('offset')
+    if offset is None:
+        return ('clock', day, clock)
+    if offset == 'z':
+        tzinfo = timezone.utc
+    else:
+        digits = offset[1:].replace(':', '')
+        delta = timedelta(hours=int(digits[:2]), minutes=int(digits[2:] or 0))
+        tzinfo = timezone(-delta if offset[0] == '-' else delta)
+    return ('instant', datetime.combine(day, clock, tzinfo))
+
+def _parse_clock(match: re.Match) -> Spec:
+    return ('clock', None, _clock(match))
+
+def _parse_day(match: re.Match) -> Spec:
+    word = match.group('day')
+    clock = _clock(match)
+    if word in DAY_OFFSETS:
+        return ('day', DAY_OFFSETS[word], clock)
+    force_next = match.group('next') is not None
+    weekday = WEEKDAYS.get(word[5:] if force_next else word)
+    if weekday is None:
+        raise ValueError(f"Unknown day '{word}'")
+    return ('weekday', weekday, force_next, clock)
+
+# Tried in order; the first full match decides the format
+PATTERN_DISPATCH = (
+    (RELATIVE_PATTERN, _parse_relative),
+    (DATE_PATTERN, _parse_date),
+    (CLOCK_PATTERN, _parse_clock),
+    (DAY_CLOCK_PATTERN, _parse_day),
+    (CLOCK_DAY_PATTERN, _parse_day)
+)
+
+@lru_cache(maxsize=2048)
+def parse_spec(text: str) -> Spec:
+    """Parse a time expression into a spec; raises ValueError for unrecognised input"""
+    text = ' '.join(text.lower().split())
+    if text == 'now':
+        return ('now',)
+    for pattern, handler in PATTERN_DISPATCH:
+        match = pattern.fullmatch(text)
+        if match:
+            return handler(match)
+    raise ValueError(f"Unrecognised time '{text}'")
+
+def resolve_spec(spec: Spec, tz: pytz.BaseTzInfo, now: Optional[datetime] = None) -> datetime:
+    """Turn a parsed spec into an aware datetime in tz; dates default to the user's today"""
+    now = datetime.now(timezone.utc) if now is None else now
+    kind = spec[0]
+    if kind == 'now':
+        return now.astimezone(tz)
+    if kind == 'relative':
+        return (now + timedelta(seconds=spec[1])).astimezone(tz)
+    if kind == 'instant':
+        return spec[1].astimezone(tz)
+
+    today = now.astimezone(tz).date()
+    if kind == 'clock':
+        day, clock = spec[1] or today, spec[2]
+    elif kind == 'day':
+        day, clock = today + timedelta(days=spec[1]), spec[2]
+    else:
+        _, weekday, force_next, clock = spec
+        ahead = (weekday - today.weekday()) % 7
+        if ahead == 0 and (force_next or clock <= now.astimezone(tz).time()):
+            ahead = 7
+        day = today + timedelta(days=ahead)
+    return tz.localize(datetime.combine(day, clock))
+
+def parse_time(text: str, tz: pytz.BaseTzInfo = pytz.utc, now: Optional[datetime] = None) -> datetime:
+    """Parse "14:30", "2:30pm", "2024-12-25 14:30", ISO 8601, "in 2h", "tomorrow 9am", "next friday noon"
+
+    Times without a date use today's date in tz. Raises ValueError for invalid input.
+    """
+    return resolve_spec(parse_spec(text), tz, now)
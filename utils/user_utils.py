@@ -1,8 +1,11 @@
 import discord
-from typing import Optional, Union
+from typing import Optional, Union, Tuple
+import asyncio
 import re
-from fuzzywuzzy import fuzz
 import logging
+from utils.config_service import config_service
+from utils.member_cache import member_cache
+from utils.state_snapshot import state_snapshot
 
 class UserLookup:
     """Utility class for finding Discord members by various identifiers"""
@@ -20,7 +23,7 @@ class UserLookup:
         
         # Try to find by ID first (most accurate)
         if identifier.isdigit():
-            member = guild.get_member(int(identifier))
+            member = await UserLookup.get_member_by_id(guild, int(identifier))
             if member:
                 return member
         
@@ -28,10 +31,18 @@ class UserLookup:
         mention_match = re.match(r'<@!?(\d+)>', identifier)
         if mention_match:
             member_id = int(mention_match.group(1))
-            member = guild.get_member(member_id)
+            member = await UserLookup.get_member_by_id(guild, member_id)
             if member:
                 return member
         
+        # Before the guild is chunked, the warm-start snapshot may know the name
+        member = await UserLookup.find_member_from_snapshot(guild, identifier)
+        if member:
+            return member
+        
+        # Name lookups need the full member list
+        await member_cache.ensure_chunked(guild)
+        
         # Try exact matches first
         for member in guild.members:
             # Exact display name match
@@ -41,7 +52,8 @@ class UserLookup:
             if member.name.lower() == identifier.lower():
                 return member
         
-        # If no exact match, try fuzzy matching
+        # If no exact match, try fuzzy matching (fuzzywuzzy is imported on first use, not at startup)
+        from fuzzywuzzy import fuzz
         best_match = None
         best_score = 70  # Minimum similarity score
         
@@ -60,12 +72,36 @@ class UserLookup:
         
         return best_match
     
+    @staticmethod
+    async def get_member_by_id(guild: discord.Guild, member_id: int) -> Optional[discord.Member]:
+        """Get a member from cache, asking the gateway for just that member if the guild isn't chunked"""
+        member = guild.get_member(member_id)
+        if member or guild.chunked:
+            return member
+        try:
+            members = await guild.query_members(user_ids=[member_id], cache=True)
+            return members[0] if members else None
+        except Exception as e:
+            logging.error(f"Error querying member {member_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def find_member_from_snapshot(guild: discord.Guild, identifier: str) -> Optional[discord.Member]:
+        """Exact name match from the state snapshot, fetched by ID and checked against the live member"""
+        lowered = identifier.lower()
+        for member_id in state_snapshot.member_ids(guild, identifier)[:5]:
+            member = await UserLookup.get_member_by_id(guild, member_id)
+            if member and lowered in (member.display_name.lower(), member.name.lower()):
+                return member
+        return None
+    
     @staticmethod
     async def find_members_by_role(guild: discord.Guild, role_name: str) -> list[discord.Member]:
         """Find all members with a specific role"""
         role = discord.utils.get(guild.roles, name=role_name)
         if not role:
             return []
+        await member_cache.ensure_chunked(guild)
         return role.members
     
     @staticmethod
@@ -73,13 +109,84 @@ class UserLookup:
         """Format member information for display"""
         return f"{member.display_name} ({member.name}#{member.discriminator})"
 
+class MemberIndex:
+    """Indexed view of a guild's members for resolving many identifiers in one pass"""
+    
+    FUZZY_THRESHOLD = 70
+    
+    def __init__(self, guild: discord.Guild):
+        self.guild = guild
+        self.by_display_name = {}
+        self.by_name = {}
+        for member in guild.members:
+            # First member wins, matching the iteration order of find_member
+            self.by_display_name.setdefault(member.display_name.lower(), member)
+            self.by_name.setdefault(member.name.lower(), member)
+    
+    def resolve_exact(self, identifier: str) -> Optional[discord.Member]:
+        """Resolve an identifier by ID, mention, display name or username without fuzzy matching"""
+        identifier = identifier.strip()
+        if not identifier:
+            return None
+        
+        mention_match = re.match(r'<@!?(\d+)>$', identifier)
+        member_id = int(mention_match.group(1)) if mention_match else (int(identifier) if identifier.isdigit() else None)
+        if member_id is not None:
+            member = self.guild.get_member(member_id)
+            if member:
+                return member
+        
+        lowered = identifier.lower()
+        return self.by_display_name.get(lowered) or self.by_name.get(lowered)
+    
+    def _resolve_fuzzy(self, identifiers: list, candidates: list) -> dict:
+        """Fuzzy-match identifiers against precomputed (display, name, member) tuples"""
+        from fuzzywuzzy import fuzz
+        matches = {}
+        for identifier in identifiers:
+            lowered = identifier.lower()
+            best_match = None
+            best_score = self.FUZZY_THRESHOLD
+            for display_name, name, member in candidates:
+                score = max(fuzz.ratio(display_name, lowered), fuzz.ratio(name, lowered))
+                if score > best_score:
+                    best_score = score
+                    best_match = member
+            if best_match:
+                matches[identifier] = best_match
+        return matches
+    
+    async def resolve_many(self, identifiers: list, fuzzy: bool = True) -> Tuple[dict, list]:
+        """
+        Resolve identifiers to members
+        Returns ({identifier: member}, [unresolved identifiers]); fuzzy matching runs off the event loop
+        """
+        resolved = {}
+        pending = []
+        for identifier in identifiers:
+            member = self.resolve_exact(identifier)
+            if member:
+                resolved[identifier] = member
+            elif identifier.strip():
+                pending.append(identifier.strip())
+        
+        if fuzzy and pending:
+            candidates = [(m.display_name.lower(), m.name.lower(), m) for m in self.guild.members]
+            fuzzy_matches = await asyncio.to_thread(self._resolve_fuzzy, pending, candidates)
+            resolved.update(fuzzy_matches)
+            pending = [identifier for identifier in pending if identifier not in fuzzy_matches]
+        
+        return resolved, pending
+
 class EmbedBuilder:
     """Utility class for creating consistent embeds"""
     
     @staticmethod
-    def create_embed(title: str, description: str = "", color: int = 0x7289da, 
+    def create_embed(title: str, description: str = "", color: Optional[int] = None, 
                     thumbnail: str = None, footer: str = None) -> discord.Embed:
-        """Create a standardized embed"""
+        """Create a standardized embed (primary color unless given)"""
+        if color is None:
+            color = config_service.current.colors['primary']
         embed = discord.Embed(title=title, description=description, color=color)
         
         if thumbnail:
@@ -95,22 +202,22 @@ class EmbedBuilder:
     @staticmethod
     def success_embed(title: str, description: str = "") -> discord.Embed:
         """Create a success embed"""
-        return EmbedBuilder.create_embed(title, description, 0x00ff00)
+        return EmbedBuilder.create_embed(title, description, config_service.current.colors['success'])
     
     @staticmethod
     def error_embed(title: str, description: str = "") -> discord.Embed:
         """Create an error embed"""
-        return EmbedBuilder.create_embed(title, description, 0xff0000)
+        return EmbedBuilder.create_embed(title, description, config_service.current.colors['error'])
     
     @staticmethod
     def info_embed(title: str, description: str = "") -> discord.Embed:
         """Create an info embed"""
-        return EmbedBuilder.create_embed(title, description, 0x0099ff)
+        return EmbedBuilder.create_embed(title, description, config_service.current.colors['info'])
     
     @staticmethod
     def warning_embed(title: str, description: str = "") -> discord.Embed:
         """Create a warning embed"""
-        return EmbedBuilder.create_embed(title, description, 0xffff00)
+        return EmbedBuilder.create_embed(title, description, config_service.current.colors['warning'])
 
 class PermissionChecker:
     """Utility class for checking user permissions"""